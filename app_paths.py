@@ -0,0 +1,22 @@
+import os
+import sys
+from pathlib import Path
+
+
+def get_app_dir():
+    # Installed builds write next to the user's profile, source runs use the working directory.
+    # SRT_MAKER_HOME points everything (cache, queue, history) somewhere else, e.g. for benchmarks
+    if os.environ.get('SRT_MAKER_HOME'):
+        app_dir = Path(os.environ['SRT_MAKER_HOME'])
+    elif getattr(sys, 'frozen', False):
+        app_dir = Path(os.path.expanduser('~')) / 'AppData' / 'Local' / 'SRT_Maker'
+    else:
+        app_dir = Path('.')
+    app_dir.mkdir(parents=True, exist_ok=True)
+    return app_dir
+
+
+def get_cache_dir():
+    cache_dir = get_app_dir() / 'cache'
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
@@ -0,0 +1,102 @@
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+PREVIEW_SAMPLES = 3  # changed lines shown per file in a dry run
+
+
+class ReplaceResult:
+    __slots__ = ('path', 'count', 'samples', 'error')
+
+    def __init__(self, path, count=0, samples=None, error=None):
+        self.path = path
+        self.count = count
+        self.samples = samples or []  # (line number, old line, new line)
+        self.error = error
+
+
+def compile_pattern(find_text, case_sensitive=False, regex=False):
+    # Raises re.error for an invalid regular expression
+    flags = 0 if case_sensitive else re.IGNORECASE
+    return re.compile(find_text if regex else re.escape(find_text), flags)
+
+
+def make_replacement(replace_text, regex=False):
+    # Literal mode must not expand backslashes or group references in the replacement
+    return replace_text if regex else (lambda match: replace_text)
+
+
+def atomic_write(path, content):
+    """Write content next to path and rename it over the original in one step."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def _preview(pattern, replacement, content):
+    # Count every match but only render the first few changed lines
+    count = 0
+    samples = []
+    line = 1
+    position = 0
+    for match in pattern.finditer(content):
+        count += 1
+        if len(samples) >= PREVIEW_SAMPLES:
+            continue
+        line += content.count('\n', position, match.start())
+        position = match.start()
+        line_start = content.rfind('\n', 0, match.start()) + 1
+        line_end = content.find('\n', match.end())
+        old_line = content[line_start:line_end if line_end != -1 else len(content)]
+        new_line = pattern.sub(replacement, old_line)
+        if not samples or samples[-1][0] != line:
+            samples.append((line, old_line.strip(), new_line.strip()))
+    return count, samples
+
+
+def replace_in_file(path, pattern, replacement, dry_run=False):
+    try:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            content = f.read()
+        if dry_run:
+            count, samples = _preview(pattern, replacement, content)
+            return ReplaceResult(path, count, samples)
+        new_content, count = pattern.subn(replacement, content)
+        if count:
+            atomic_write(path, new_content)
+        return ReplaceResult(path, count)
+    except Exception as e:
+        return ReplaceResult(path, error=str(e))
+
+
+def replace_files(paths, pattern, replacement, dry_run=False, max_workers=None, should_stop=None):
+    """Yield a ReplaceResult per file as the pool finishes them.
+
+    should_stop is polled before each file starts, so a cancelled run leaves
+    files either untouched or fully replaced.
+    """
+    max_workers = max_workers or min(8, (os.cpu_count() or 1) + 2)
+
+    def task(path):
+        if should_stop and should_stop():
+            return None
+        return replace_in_file(path, pattern, replacement, dry_run)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(task, path) for path in paths]
+        for future in as_completed(futures):
+            result = future.result()
+            if result is not None:
+                yield result
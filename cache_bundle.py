@@ -0,0 +1,322 @@
+"""Export and import translation caches, e.g. to warm up a new machine.
+
+A bundle is gzip-compressed JSON lines: a header, then one line per cached
+translation. Lines known to the translation memory carry their source text
+and its similarity index, so importing them is a plain bulk insert; cache
+entries whose source was never stored carry only the cache key. TMX files
+(plain or .gz) can be written and read for exchange with other tools, but
+only hold lines with a source text. Examples:
+
+    python cache_bundle.py export cache.jsonl.gz -l es,de
+    python cache_bundle.py import cache.jsonl.gz --on-conflict replace
+    python cache_bundle.py export studio.tmx --source-lang en
+
+On import, a line that is already cached keeps its local translation unless
+the conflict rule is 'replace'.
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
+
+from app_paths import get_app_dir
+from cache_store import cache_key, default_store
+from events import EVENTS
+from translation_core import LANGUAGES
+from translation_memory import BANDS, INDEX_VERSION, TranslationMemory
+
+BUNDLE_FORMAT = 'srt_maker_cache'
+BUNDLE_VERSION = 1
+CONFLICT_RULES = ('keep', 'replace')
+MEMORY_CHUNK = 50000  # memory lines written per transaction on import
+
+_XML_LANG = '{http://www.w3.org/XML/1998/namespace}lang'
+
+
+def bundle_format(path):
+    name = str(path).lower()
+    if name.endswith('.gz'):
+        name = name[:-3]
+    return 'tmx' if name.endswith('.tmx') else 'jsonl'
+
+
+def _open(path, mode, compressed):
+    if 'b' in mode:
+        return gzip.open(path, mode) if compressed else open(path, mode)
+    if compressed:
+        # Level 6 is several times faster than the default 9 for nearly the same size
+        return gzip.open(path, mode + 't', encoding='utf-8', compresslevel=6)
+    return open(path, mode, encoding='utf-8')
+
+
+def _is_compressed(path):
+    return str(path).lower().endswith('.gz')
+
+
+def default_memory_path():
+    path = get_app_dir() / 'translation_memory.db'
+    return path if path.exists() else None
+
+
+def _app_language(code):
+    # TMX tools write region variants (es-ES); the services mostly want the bare code
+    codes = {value.lower(): value for value in LANGUAGES.values()}
+    return codes.get(code.lower()) or codes.get(code.split('-')[0].lower()) or code
+
+
+def _same_language(a, b):
+    return a.split('-')[0].lower() == b.split('-')[0].lower()
+
+
+# Export
+
+def iter_entries(languages=None, memory_path=None):
+    """Yield every cached translation as a record dict, memory lines first."""
+    store = default_store()
+    languages = languages or store.languages()
+    caches = {lang: store.load(lang) for lang in languages}
+    if memory_path:
+        memory = TranslationMemory(memory_path)
+        try:
+            for lang, source, translation, count, keys in memory.export(set(languages)):
+                # The exact cache holds the newest translation of precisely this line
+                translation = caches[lang].pop(cache_key(source), translation)
+                yield {'lang': lang, 'source': source, 'translation': translation, 'index': [count, *keys]}
+        finally:
+            memory.close()
+    for lang, cache in caches.items():
+        for key, translation in cache.items():
+            yield {'lang': lang, 'key': key, 'translation': translation}
+
+
+def _write_jsonl(f, records, languages):
+    header = {'format': BUNDLE_FORMAT, 'version': BUNDLE_VERSION, 'created': round(time.time()),
+              'languages': languages, 'index': INDEX_VERSION}
+    f.write(json.dumps(header) + '\n')
+    written = 0
+    for record in records:
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        written += 1
+    return written, 0
+
+
+def _write_tmx(f, records, source_lang):
+    f.write('<?xml version="1.0" encoding="UTF-8"?>\n<tmx version="1.4">\n'
+            f'<header creationtool="SRT Maker" creationtoolversion="{BUNDLE_VERSION}" segtype="sentence" '
+            f'o-tmf="{BUNDLE_FORMAT}" adminlang="en" srclang={quoteattr(source_lang)} datatype="plaintext"/>\n'
+            '<body>\n')
+    written = skipped = 0
+    for record in records:
+        if 'source' not in record:
+            skipped += 1
+            continue
+        f.write(f'<tu><tuv xml:lang={quoteattr(source_lang)}><seg>{escape(record["source"])}</seg></tuv>'
+                f'<tuv xml:lang={quoteattr(record["lang"])}><seg>{escape(record["translation"])}</seg></tuv></tu>\n')
+        written += 1
+    f.write('</body>\n</tmx>\n')
+    return written, skipped
+
+
+def export_bundle(path, languages=None, source_lang='en', memory_path=None):
+    """Write the caches of the given languages (default: all) to path.
+
+    Returns (written, skipped); TMX skips cache entries without a source text.
+    """
+    path = Path(path)
+    languages = sorted(languages or default_store().languages())
+    records = iter_entries(languages, memory_path or default_memory_path())
+    # Not mkstemp: the bundle is meant to be shared, so it gets the usual file permissions
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with _open(tmp_path, 'w', _is_compressed(path)) as f:
+            if bundle_format(path) == 'tmx':
+                result = _write_tmx(f, records, source_lang)
+            else:
+                result = _write_jsonl(f, records, languages)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    EVENTS.info('cache', "Exported %d cached translations to %s", result[0], path)
+    return result
+
+
+# Import
+
+def _read_jsonl(f):
+    try:
+        header = json.loads(f.readline())
+    except ValueError:
+        header = None
+    if not isinstance(header, dict) or header.get('format') != BUNDLE_FORMAT:
+        raise ValueError("Not an SRT Maker cache bundle")
+    if header.get('version', 0) > BUNDLE_VERSION:
+        raise ValueError(f"Cache bundle version {header['version']} is newer than this build supports")
+    # An index hashed differently would silently break similarity lookups; rebuild it instead
+    reuse_index = header.get('index') == INDEX_VERSION
+    for line in f:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if not reuse_index:
+            record.pop('index', None)
+        yield record
+
+
+def _read_tmx(f, source_lang):
+    header_lang = None
+    body = None
+    for event, element in ET.iterparse(f, events=('start', 'end')):
+        if event == 'start':
+            if element.tag == 'header':
+                header_lang = element.get('srclang')
+            elif element.tag == 'body':
+                body = element
+            continue
+        if element.tag != 'tu':
+            continue
+        tu_lang = element.get('srclang') or header_lang
+        if not tu_lang or tu_lang == '*all*':
+            tu_lang = source_lang
+        segments = []
+        for tuv in element.iter('tuv'):
+            seg = tuv.find('seg')
+            lang = tuv.get(_XML_LANG) or tuv.get('lang')
+            if seg is not None and lang:
+                segments.append((lang, ''.join(seg.itertext())))
+        source = next((text for lang, text in segments if _same_language(lang, tu_lang)), None)
+        if source:
+            for lang, text in segments:
+                if not _same_language(lang, tu_lang):
+                    yield {'lang': _app_language(lang), 'source': source, 'translation': text}
+        # Drop finished units so memory stays flat however large the file is
+        if body is not None:
+            body.remove(element)
+
+
+def merge_records(records, on_conflict='keep', languages=None, memory_path=None, use_memory=True):
+    """Merge record dicts into the local caches and translation memory.
+
+    on_conflict decides between a local translation and a different one in
+    the records: 'keep' the local one or 'replace' it. Returns counts of
+    added, replaced, kept, unchanged and skipped lines.
+    """
+    if on_conflict not in CONFLICT_RULES:
+        raise ValueError(f"Unknown conflict rule: {on_conflict}")
+    replace = on_conflict == 'replace'
+    counts = {'added': 0, 'replaced': 0, 'kept': 0, 'unchanged': 0, 'skipped': 0}
+    store = default_store()
+    caches = {}
+    changed = defaultdict(dict)  # lang -> entries to write
+    indexed = defaultdict(list)  # lang -> memory rows with their index
+    plain = defaultdict(list)  # lang -> (source, translation) still to be hashed
+    memory = TranslationMemory(memory_path or get_app_dir() / 'translation_memory.db') if use_memory else None
+
+    def flush_memory(lang):
+        if indexed[lang]:
+            memory.add_indexed(lang, indexed.pop(lang), replace)
+        if plain[lang]:
+            memory.add_many(lang, plain.pop(lang), replace)
+
+    try:
+        for record in records:
+            lang = record.get('lang')
+            translation = record.get('translation')
+            source = record.get('source')
+            key = cache_key(source) if source else record.get('key')
+            if not lang or not key or not translation or not isinstance(translation, str):
+                counts['skipped'] += 1
+                continue
+            if languages and lang not in languages:
+                continue
+            if lang not in caches:
+                caches[lang] = store.load(lang)
+            current = caches[lang].get(key)
+            if current is None:
+                caches[lang][key] = changed[lang][key] = translation
+                counts['added'] += 1
+            elif current == translation:
+                counts['unchanged'] += 1
+            elif replace:
+                caches[lang][key] = changed[lang][key] = translation
+                counts['replaced'] += 1
+            else:
+                counts['kept'] += 1
+            if memory is None or not source:
+                continue
+            index = record.get('index')
+            if isinstance(index, list) and len(index) == BANDS + 1:
+                indexed[lang].append((source, translation, index[0], index[1:]))
+            else:
+                plain[lang].append((source, translation))
+            if len(indexed[lang]) + len(plain[lang]) >= MEMORY_CHUNK:
+                flush_memory(lang)
+        if memory is not None:
+            for lang in set(indexed) | set(plain):
+                flush_memory(lang)
+        for lang, entries in changed.items():
+            store.put(lang, entries.items())
+    finally:
+        if memory is not None:
+            memory.close()
+    return counts
+
+
+def import_bundle(path, on_conflict='keep', languages=None, source_lang='en', memory_path=None, use_memory=True):
+    """Merge a bundle or TMX file into the local caches; see merge_records."""
+    # TMX is parsed from bytes so its XML declaration decides the encoding
+    tmx = bundle_format(path) == 'tmx'
+    with _open(path, 'rb' if tmx else 'r', _is_compressed(path)) as f:
+        records = _read_tmx(f, source_lang) if tmx else _read_jsonl(f)
+        counts = merge_records(records, on_conflict, languages, memory_path, use_memory)
+    EVENTS.info('cache', "Imported %s: %d added, %d replaced, %d kept, %d unchanged, %d skipped", path,
+                counts['added'], counts['replaced'], counts['kept'], counts['unchanged'], counts['skipped'])
+    return counts
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Export or import translation cache bundles")
+    commands = parser.add_subparsers(dest='command', required=True)
+    export_parser = commands.add_parser('export', help="write the caches to a bundle")
+    export_parser.add_argument('bundle', help="output file: .jsonl.gz (default), .jsonl, .tmx or .tmx.gz")
+    import_parser = commands.add_parser('import', help="merge a bundle into the caches")
+    import_parser.add_argument('bundle', help="bundle or TMX file")
+    import_parser.add_argument('--on-conflict', choices=CONFLICT_RULES, default='keep',
+                               help="which translation wins when a line is cached with a different one")
+    import_parser.add_argument('--no-memory', action='store_true', help="only fill the exact caches")
+    for sub in (export_parser, import_parser):
+        sub.add_argument('-l', '--languages', help="comma separated language codes (default: all)")
+        sub.add_argument('--source-lang', default='en', help="source language written to and assumed in TMX files")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    languages = [code.strip() for code in args.languages.split(',')] if args.languages else None
+    start_time = time.perf_counter()
+    try:
+        if args.command == 'export':
+            written, skipped = export_bundle(args.bundle, languages, args.source_lang)
+            print(f"💾 Exported {written} translations to {args.bundle}"
+                  + (f" ({skipped} without source text skipped)" if skipped else ""))
+        else:
+            counts = import_bundle(args.bundle, args.on_conflict, languages, args.source_lang,
+                                   use_memory=not args.no_memory)
+            print(f"📥 {counts['added']} added, {counts['replaced']} replaced, {counts['kept']} kept, "
+                  f"{counts['unchanged']} unchanged, {counts['skipped']} skipped")
+    except (OSError, ValueError, ET.ParseError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    print(f"Done in {time.perf_counter() - start_time:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""Rebuild the translation cache from translated subtitles already on disk.
+
+Walks folders for subtitle sources and finds their outputs where the
+translator writes them: a folder named after the source, or
+translated_subtitles/. The output name, read with the naming template,
+gives the language. Each output is paired with its source cue by cue, by
+index when both have the same number of cues and by start time otherwise.
+A pair only counts when start and end times agree, so an output that was
+re-timed or edited into another shape only contributes the cues that still
+line up. Example:
+
+    python cache_rebuild.py movies/ -r --naming "{filename}_{language}"
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+import pysrt
+import ass
+
+from cache_bundle import CONFLICT_RULES, merge_records
+from cue_parser import align_cues, detect_format
+from events import EVENTS
+from translation_core import LANGUAGES, collect_files, strip_speaker
+
+TOLERANCE_MS = 100
+
+_FIELDS = {'{date}': r'\d{8}', '{time}': r'\d{6}', '{language}': r'(?P<language>.+)'}
+
+
+class _Timings:
+    # The part of a CueFile that align_cues needs
+    timed = True
+
+    def __init__(self, cues):
+        self.starts = [start for start, _, _ in cues]
+
+    def __len__(self):
+        return len(self.starts)
+
+
+def naming_pattern(stem, template):
+    """Regex matching the output names the template produces for a source stem."""
+    if '{language}' not in template:
+        raise ValueError("The naming template has no {language}, so outputs cannot be told apart")
+    parts = re.split(r'(\{\w+\})', template)
+    regex = ''.join(re.escape(stem) if part == '{filename}' else _FIELDS.get(part) or re.escape(part)
+                    for part in parts)
+    return re.compile(regex + r'\.srt', re.IGNORECASE)
+
+
+def language_codes():
+    # Outputs are named after the language ("Spanish"); a code in the name works as well
+    codes = {code.lower(): code for code in LANGUAGES.values()}
+    codes.update((name.lower(), code) for name, code in LANGUAGES.items())
+    return codes
+
+
+def find_outputs(source, template, codes):
+    """(output path, language code) for every translated output of source."""
+    path = Path(source)
+    pattern = naming_pattern(path.stem, template)
+    outputs = []
+    for folder in (path.parent / path.stem, path.parent / 'translated_subtitles'):
+        if not folder.is_dir():
+            continue
+        for candidate in sorted(folder.glob('*.srt')):
+            match = pattern.fullmatch(candidate.name)
+            code = codes.get(match.group('language').lower()) if match else None
+            if code and candidate != path:
+                outputs.append((candidate, code))
+    return outputs
+
+
+def read_cues(path, encoding=None):
+    """(start ms, end ms, text) per cue, with the texts translate_batch is given; None for plain text."""
+    fmt = detect_format(path)
+    if fmt == 'srt':
+        subs = pysrt.open(str(path), encoding=encoding) if encoding else pysrt.open(str(path))
+        return [(sub.start.ordinal, sub.end.ordinal, sub.text) for sub in subs]
+    if fmt == 'ass':
+        with open(path, "r", encoding="utf-8-sig") as f:
+            doc = ass.parse(f)
+        return [(round(event.start.total_seconds() * 1000), round(event.end.total_seconds() * 1000), event.text)
+                for event in doc.events]
+    return None
+
+
+def aligned_pairs(source_cues, translated_cues, tolerance=TOLERANCE_MS):
+    """(source text, translated text) for each cue whose timings agree in both files."""
+    if len(source_cues) == len(translated_cues):
+        rows = ((i, i) for i in range(len(source_cues)))
+    else:
+        rows = align_cues(_Timings(source_cues), _Timings(translated_cues), tolerance)
+    for i, j in rows:
+        if i is None or j is None:
+            continue
+        source_start, source_end, source_text = source_cues[i]
+        start, end, text = translated_cues[j]
+        if abs(source_start - start) <= tolerance and abs(source_end - end) <= tolerance:
+            yield source_text, text
+
+
+def iter_records(inputs, recursive=False, naming='{filename}_{language}', encoding='utf-8',
+                 tolerance=TOLERANCE_MS, stats=None):
+    """Yield a record for every aligned cue, as cache_bundle.merge_records expects.
+
+    stats, if given, is filled with counts of sources, outputs, paired and
+    unaligned cues and unreadable files.
+    """
+    stats = stats if stats is not None else {}
+    for key in ('sources', 'outputs', 'paired', 'unaligned', 'unreadable'):
+        stats.setdefault(key, 0)
+    codes = language_codes()
+    for source in collect_files(inputs, recursive):
+        outputs = find_outputs(source, naming, codes)
+        if not outputs:
+            continue
+        try:
+            source_cues = read_cues(source)
+        except Exception as e:
+            EVENTS.warning('cache', "Skipping %s: %s", source, e)
+            stats['unreadable'] += 1
+            continue
+        if source_cues is None:
+            # A plain text file was translated in one piece; there are no cues to pair
+            continue
+        stats['sources'] += 1
+        for output, lang in outputs:
+            try:
+                translated_cues = read_cues(output, encoding)
+            except Exception as e:
+                EVENTS.warning('cache', "Skipping %s: %s", output, e)
+                stats['unreadable'] += 1
+                continue
+            stats['outputs'] += 1
+            paired = 0
+            for source_text, text in aligned_pairs(source_cues, translated_cues, tolerance):
+                source_text = strip_speaker(source_text)
+                text = text.strip()
+                if source_text.strip() and text:
+                    paired += 1
+                    yield {'lang': lang, 'source': source_text, 'translation': text}
+            stats['paired'] += paired
+            stats['unaligned'] += max(len(source_cues), len(translated_cues)) - paired
+            EVENTS.debug('cache', "%s: %d of %d cues paired", output, paired, len(source_cues))
+
+
+def rebuild_cache(inputs, recursive=False, naming='{filename}_{language}', encoding='utf-8',
+                  tolerance=TOLERANCE_MS, on_conflict='keep', languages=None, use_memory=True, memory_path=None):
+    """Add the aligned cues of every output under inputs to the caches; returns (scan stats, merge counts)."""
+    stats = {}
+    records = iter_records(inputs, recursive, naming, encoding, tolerance, stats)
+    counts = merge_records(records, on_conflict, languages, memory_path, use_memory)
+    EVENTS.info('cache', "Rebuilt cache from %d outputs of %d sources: %d cues paired, %d unaligned; "
+                "%d added, %d replaced, %d kept", stats['outputs'], stats['sources'], stats['paired'],
+                stats['unaligned'], counts['added'], counts['replaced'], counts['kept'])
+    return stats, counts
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Seed the translation cache from existing translated outputs")
+    parser.add_argument('inputs', nargs='+', help="subtitle files or folders")
+    parser.add_argument('-r', '--recursive', action='store_true', help="descend into sub-folders")
+    parser.add_argument('-l', '--languages', help="comma separated language codes (default: all found)")
+    parser.add_argument('--naming', default='{filename}_{language}', help="naming template the outputs were written with")
+    parser.add_argument('--encoding', default='utf-8', help="encoding of the outputs")
+    parser.add_argument('--tolerance', type=int, default=TOLERANCE_MS,
+                        help="largest timing difference in ms for a cue to count as aligned")
+    parser.add_argument('--on-conflict', choices=CONFLICT_RULES, default='keep',
+                        help="which translation wins when a line is cached with a different one")
+    parser.add_argument('--no-memory', action='store_true', help="only fill the exact caches")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    languages = [code.strip() for code in args.languages.split(',')] if args.languages else None
+    start_time = time.perf_counter()
+    try:
+        stats, counts = rebuild_cache(args.inputs, args.recursive, args.naming, args.encoding, args.tolerance,
+                                      args.on_conflict, languages, use_memory=not args.no_memory)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    print(f"🔗 {stats['paired']} cues paired from {stats['outputs']} outputs of {stats['sources']} sources "
+          f"({stats['unaligned']} unaligned, {stats['unreadable']} unreadable files)")
+    print(f"📥 {counts['added']} added, {counts['replaced']} replaced, {counts['kept']} kept, "
+          f"{counts['unchanged']} unchanged")
+    print(f"Done in {time.perf_counter() - start_time:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
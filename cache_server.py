@@ -0,0 +1,301 @@
+"""Translation cache shared by several workstations over the local network.
+
+One machine runs the server; the others set its URL in Settings -> Cache
+Settings (or pass --cache-server to cli.py). Before sending lines to a
+translation service, a translator looks up the lines its local cache
+misses in one request, and the answers become part of the local cache,
+which thereby serves as the client's L1. New translations are sent back
+when the translator saves its cache, so a line is paid for once per
+office instead of once per workstation. When the server cannot be
+reached the client carries on with the local cache alone and tries again
+after RETRY_INTERVAL seconds. Example:
+
+    python cache_server.py --host 0.0.0.0 --port 8765 --token secret
+
+Endpoints, all JSON: GET /health, POST /lookup {"lang", "keys"} ->
+{"translations": {key: translation}}, POST /store {"lang",
+"translations"} -> {"stored": n}. Keys are the MD5 cache keys.
+"""
+import argparse
+import hmac
+import json
+import re
+import sqlite3
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app_paths import get_app_dir
+from cache_store import CacheEvictor, CacheStore
+from events import EVENTS
+
+DEFAULT_PORT = 8765
+MAX_KEYS = 5000  # keys or translations in one request
+MAX_BODY = 16 * 1024 * 1024
+MAX_PENDING = 50000  # translations a client holds back while the server is down
+TIMEOUT = 3
+RETRY_INTERVAL = 30
+
+_KEY = re.compile(r'[0-9a-f]{32}')
+
+
+def default_db_path():
+    # Not the cache folder: a CacheStore there would take in this machine's own older JSON caches
+    folder = get_app_dir() / 'shared_cache'
+    folder.mkdir(parents=True, exist_ok=True)
+    return folder / 'translations.db'
+
+
+def _language(request):
+    lang = request.get('lang')
+    if not isinstance(lang, str) or not lang or len(lang) > 16:
+        raise ValueError("lang must be a language code")
+    return lang
+
+
+def _keys(values):
+    if not isinstance(values, (list, dict)) or len(values) > MAX_KEYS:
+        raise ValueError(f"expected up to {MAX_KEYS} keys")
+    if not all(isinstance(key, str) and _KEY.fullmatch(key) for key in values):
+        raise ValueError("keys must be MD5 hex digests")
+    return list(values)
+
+
+class _CacheHandler(BaseHTTPRequestHandler):
+    store = None
+    token = None
+
+    def _authorized(self):
+        if not self.token:
+            return True
+        header = self.headers.get('Authorization', '')
+        if hmac.compare_digest(header.encode(), f"Bearer {self.token}".encode()):
+            return True
+        self.send_error(401)
+        return False
+
+    def _send_json(self, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/health':
+            self.send_error(404)
+            return
+        if not self._authorized():
+            return
+        usage = self.store.usage()
+        self._send_json({'status': 'ok', 'languages': len(usage),
+                         'entries': sum(count for count, _ in usage.values())})
+
+    def do_POST(self):
+        routes = {'/lookup': self._lookup, '/store': self._store}
+        route = routes.get(self.path.split('?', 1)[0])
+        if route is None:
+            self.send_error(404)
+            return
+        if not self._authorized():
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            if not 0 < length <= MAX_BODY:
+                raise ValueError("missing or oversized body")
+            request = json.loads(self.rfile.read(length))
+            if not isinstance(request, dict):
+                raise ValueError("expected a JSON object")
+            response = route(request)
+        except ValueError as e:
+            self.send_error(400, str(e))
+            return
+        except sqlite3.Error as e:
+            EVENTS.error('cache', "Shared cache request failed: %s", e)
+            self.send_error(503)
+            return
+        self._send_json(response)
+
+    def _lookup(self, request):
+        return {'translations': self.store.lookup(_language(request), _keys(request.get('keys')))}
+
+    def _store(self, request):
+        lang = _language(request)
+        translations = request.get('translations')
+        keys = _keys(translations)
+        if not all(isinstance(translations[key], str) and translations[key] for key in keys):
+            raise ValueError("translations must be non-empty strings")
+        # The first translation stored stays, so every workstation gets the same answer for a line
+        self.store.put(lang, translations.items(), replace=False)
+        return {'stored': len(keys)}
+
+    def log_message(self, format, *args):
+        # Every batch of every workstation is a request; failures are reported through EVENTS instead
+        pass
+
+
+class CacheServer:
+    """Serves a CacheStore from a daemon thread; nothing runs until start() is called."""
+
+    def __init__(self, port=DEFAULT_PORT, host='127.0.0.1', store=None, token=None):
+        self.host = host
+        self.port = port
+        self.store = store
+        self.token = token
+        self.httpd = None
+        self.thread = None
+
+    def start(self):
+        self.store = self.store or CacheStore(default_db_path())
+        handler = type('CacheHandler', (_CacheHandler,), {'store': self.store, 'token': self.token})
+        self.httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='cache-server', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+            self.thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+
+class CacheClient:
+    """Batched lookups and writes against a CacheServer, shared by every translator of a run.
+
+    Network errors never reach the caller: lookups then find nothing, and
+    translations to store are held back (up to MAX_PENDING) until the
+    server answers again.
+    """
+
+    def __init__(self, url, token=None, timeout=TIMEOUT):
+        self.url = url.rstrip('/')
+        self.token = token
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.pending = {}  # lang -> {key: translation} not sent yet
+        self.retry_at = 0.0  # monotonic time before which the server is not tried again
+        self.offline = False
+
+    def _request(self, path, payload=None):
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8') if payload is not None else None
+        headers = {'Content-Type': 'application/json'}
+        if self.token:
+            headers['Authorization'] = f"Bearer {self.token}"
+        request = urllib.request.Request(self.url + path, data, headers)
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read())
+
+    def _call(self, path, payload=None):
+        """The server's answer, or None while it is unreachable."""
+        if time.monotonic() < self.retry_at:
+            return None
+        try:
+            # URLError, HTTPError and timeouts are all OSErrors; a garbled answer is a ValueError
+            result = self._request(path, payload)
+        except (OSError, ValueError) as e:
+            self.retry_at = time.monotonic() + RETRY_INTERVAL
+            if not self.offline:
+                self.offline = True
+                EVENTS.warning('cache', "Shared cache %s unavailable, using the local cache only: %s", self.url, e)
+            return None
+        if self.offline:
+            self.offline = False
+            EVENTS.info('cache', "Shared cache %s is reachable again", self.url)
+        return result
+
+    def health(self):
+        return self._call('/health')
+
+    def lookup(self, lang, keys):
+        """{key: translation} for the keys the server has."""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        for start in range(0, len(keys), MAX_KEYS):
+            result = self._call('/lookup', {'lang': lang, 'keys': keys[start:start + MAX_KEYS]})
+            if result is None:
+                break
+            found.update(result.get('translations', {}))
+        return found
+
+    def store(self, lang, translations):
+        """Queue translations for the server; flush() sends them."""
+        with self.lock:
+            pending = self.pending.setdefault(lang, {})
+            for key, translation in translations.items():
+                if len(pending) >= MAX_PENDING:
+                    break
+                pending[key] = translation
+
+    def flush(self):
+        """Send the queued translations; returns how many the server took."""
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        sent = 0
+        for lang, translations in pending.items():
+            items = list(translations.items())
+            for start in range(0, len(items), MAX_KEYS):
+                chunk = dict(items[start:start + MAX_KEYS])
+                result = self._call('/store', {'lang': lang, 'translations': chunk})
+                if result is None:
+                    # Kept for the next flush; translations queued meanwhile are newer
+                    with self.lock:
+                        queued = self.pending.setdefault(lang, {})
+                        for key, translation in items[start:start + MAX_PENDING - len(queued)]:
+                            queued.setdefault(key, translation)
+                    break
+                sent += result.get('stored', 0)
+        return sent
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a translation cache to several workstations")
+    parser.add_argument('--host', default='0.0.0.0', help="address to listen on (default: all interfaces)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--db', help="cache database (default: shared_cache/translations.db)")
+    parser.add_argument('--token', help="shared secret clients must send")
+    parser.add_argument('--max-mb', type=int, default=0, help="size limit of the cache in MB (default: none)")
+    parser.add_argument('--policy', choices=('lru', 'lfu'), default='lru', help="what goes first over the limit")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        store = CacheStore(args.db or default_db_path())
+        server = CacheServer(args.port, args.host, store, args.token).start()
+    except (OSError, sqlite3.Error) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    evictor = None
+    if args.max_mb:
+        evictor = CacheEvictor(store, max_bytes=args.max_mb * 1024 * 1024, policy=args.policy)
+        evictor.start()
+    usage = store.usage()
+    print(f"📡 Shared cache on {server.url} ({sum(count for count, _ in usage.values())} translations "
+          f"in {len(usage)} languages)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if evictor:
+            evictor.stop()
+        server.stop()
+        store.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
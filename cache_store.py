@@ -0,0 +1,307 @@
+"""Translation cache: MD5 of a source line -> translation, per language.
+
+Entries live in one SQLite database in the cache folder. Translators load
+a language into memory once (LanguageCache) and write back only what
+changed: new translations and the hits on existing ones. Every entry keeps
+its hit count and last use, so a CacheEvictor thread can hold the cache to
+a size budget per language and overall. It removes the least recently
+(LRU) or least frequently (LFU) used entries a small batch at a time
+instead of deleting whole languages. Caches of older versions (one
+cache_<lang>.json per language) are moved in the first time the store is
+opened.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from app_paths import get_cache_dir
+from events import EVENTS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    lang TEXT NOT NULL,
+    key TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (lang, key)
+) WITHOUT ROWID;
+"""
+
+# Eviction order per policy, first rows go first
+POLICIES = {'lru': 'last_used', 'lfu': 'hits, last_used'}
+ENTRY_OVERHEAD = 48  # bytes an entry takes beyond its key and translation, roughly
+EVICT_BATCH = 500
+QUERY_CHUNK = 500  # keys bound in one IN (...) list
+EVICT_INTERVAL = 60
+LOW_WATER = 0.9  # evict down to this share of a limit so the next saves do not trigger it again
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def cache_key(text):
+    return hashlib.md5(text.encode()).hexdigest()
+
+
+def entry_size(key, translation):
+    return len(key) + len(translation.encode('utf-8')) + ENTRY_OVERHEAD
+
+
+def default_store():
+    """The store in the app's cache folder, opened on first use."""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = CacheStore()
+        return _default_store
+
+
+def reset_default_store():
+    """Close the default store; the next default_store() opens the one under the current app folder."""
+    global _default_store
+    with _default_lock:
+        if _default_store is not None:
+            _default_store.close()
+        _default_store = None
+
+
+class CacheStore:
+    def __init__(self, db_path=None):
+        self.db_path = str(db_path or get_cache_dir() / 'translations.db')
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+        self._migrate_json(Path(self.db_path).parent)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def _migrate_json(self, directory):
+        for path in sorted(directory.glob('cache_*.json')):
+            lang = path.stem[len('cache_'):]
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if not isinstance(data, dict):
+                    raise ValueError("not a JSON object")
+            except (OSError, ValueError) as e:
+                EVENTS.warning('cache', "Could not move %s into the cache database: %s", path, e)
+                continue
+            # Older files have no usage data; their age is the best guess at the last use
+            self.put(lang, data.items(), now=int(path.stat().st_mtime), replace=False)
+            path.unlink()
+            EVENTS.info('cache', "Moved %d cached translations from %s into %s", len(data), path.name,
+                        Path(self.db_path).name)
+
+    def load(self, lang):
+        with self.lock:
+            return dict(self.conn.execute("SELECT key, translation FROM entries WHERE lang = ?", (lang,)))
+
+    def lookup(self, lang, keys, now=None):
+        """{key: translation} for the keys of lang that are stored, counting a hit on each."""
+        now = int(now or time.time())
+        found = {}
+        with self.lock, self.conn:
+            for start in range(0, len(keys), QUERY_CHUNK):
+                chunk = keys[start:start + QUERY_CHUNK]
+                found.update(self.conn.execute(
+                    f"UPDATE entries SET hits = hits + 1, last_used = ? "
+                    f"WHERE lang = ? AND key IN ({','.join('?' * len(chunk))}) RETURNING key, translation",
+                    (now, lang, *chunk)))
+        return found
+
+    def put(self, lang, items, hits=None, now=None, replace=True):
+        """Write (key, translation) items and add hits {key: count} to their counts.
+
+        With replace=False an entry already stored keeps its translation.
+        """
+        now = int(now or time.time())
+        hits = hits or {}
+        # Key order turns a bulk write into appends to the primary key instead of random inserts
+        rows = sorted((lang, key, translation, entry_size(key, translation), hits.get(key, 0), now)
+                      for key, translation in items)
+        if not rows:
+            return
+        update = ("translation = excluded.translation, size = excluded.size, " if replace else "")
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO entries (lang, key, translation, size, hits, last_used) VALUES (?, ?, ?, ?, ?, ?) "
+                f"ON CONFLICT (lang, key) DO UPDATE SET {update}hits = hits + excluded.hits, "
+                "last_used = MAX(last_used, excluded.last_used)",
+                rows)
+
+    def usage(self):
+        """{lang: (entries, bytes)} for every cached language."""
+        with self.lock:
+            rows = self.conn.execute("SELECT lang, COUNT(*), SUM(size) FROM entries GROUP BY lang").fetchall()
+        return {lang: (count, size) for lang, count, size in rows}
+
+    def languages(self):
+        return sorted(self.usage())
+
+    def total_bytes(self):
+        with self.lock:
+            return self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def clear(self, lang=None):
+        with self.lock, self.conn:
+            if lang is None:
+                return self.conn.execute("DELETE FROM entries").rowcount
+            return self.conn.execute("DELETE FROM entries WHERE lang = ?", (lang,)).rowcount
+
+    def victims(self, lang, policy='lru', limit=EVICT_BATCH):
+        """Keys of the first limit entries of lang to evict under policy."""
+        # No index on the usage columns: it would slow every write, and this runs only when over a limit
+        order = POLICIES.get(policy, POLICIES['lru'])
+        with self.lock:
+            return [key for key, in self.conn.execute(
+                f"SELECT key FROM entries WHERE lang = ? ORDER BY {order} LIMIT ?", (lang, limit))]
+
+    def delete(self, lang, keys):
+        """Delete keys of lang; returns (entries, bytes) removed."""
+        with self.lock, self.conn:
+            sizes = self.conn.execute(
+                f"DELETE FROM entries WHERE lang = ? AND key IN ({','.join('?' * len(keys))}) RETURNING size",
+                (lang, *keys)).fetchall()
+        return len(sizes), sum(size for size, in sizes)
+
+    def iter_entries(self, languages=None):
+        """Yield (lang, key, translation) through a separate connection, e.g. for exports."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            for lang in languages or self.languages():
+                yield from conn.execute("SELECT lang, key, translation FROM entries WHERE lang = ?", (lang,))
+        finally:
+            conn.close()
+
+
+class LanguageCache:
+    """One language's entries in memory, shared by every translator of that language.
+
+    get() counts hits and update() records new translations; flush() writes
+    both to the store.
+    """
+
+    def __init__(self, lang, store=None):
+        self.lang = lang
+        self.store = store
+        self.entries = store.load(lang) if store is not None else {}
+        self.lock = threading.Lock()
+        self.changed = {}  # key -> translation not written yet
+        self.hits = {}  # key -> hits since the last flush
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        translation = self.entries.get(key)
+        if translation is not None:
+            with self.lock:
+                self.hits[key] = self.hits.get(key, 0) + 1
+        return translation
+
+    def update(self, items):
+        with self.lock:
+            self.entries.update(items)
+            self.changed.update(items)
+
+    def flush(self):
+        with self.lock:
+            changed, self.changed = self.changed, {}
+            hits, self.hits = self.hits, {}
+        if self.store is None or not (changed or hits):
+            return
+        # Hit entries are written with their translation too, so one evicted since loading comes back
+        items = dict(changed)
+        for key in hits:
+            if key not in items:
+                items[key] = self.entries[key]
+        self.store.put(self.lang, items.items(), hits)
+
+
+class CacheEvictor(threading.Thread):
+    """Background thread that keeps the store within its size limits.
+
+    Checks every interval seconds. A language over max_language_bytes, or
+    every language in proportion to its size when the total is over
+    max_bytes, loses entries in batches until it is back under LOW_WATER of
+    its limit. A limit of 0 means none.
+    """
+
+    def __init__(self, store=None, max_bytes=0, max_language_bytes=0, policy='lru', interval=EVICT_INTERVAL):
+        super().__init__(daemon=True)
+        self.store = store
+        self.max_bytes = max_bytes
+        self.max_language_bytes = max_language_bytes
+        self.policy = policy
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.evicted = 0
+
+    def configure(self, max_bytes, max_language_bytes, policy):
+        self.max_bytes = max_bytes
+        self.max_language_bytes = max_language_bytes
+        self.policy = policy
+
+    def run(self):
+        # Opening the default store may move old JSON caches in; keep that off the caller's thread
+        self.store = self.store or default_store()
+        while not self.stopped.is_set():
+            try:
+                self.evict_once()
+            except sqlite3.Error as e:
+                EVENTS.warning('cache', "Cache eviction failed: %s", e)
+            self.stopped.wait(self.interval)
+
+    def stop(self, timeout=5):
+        self.stopped.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def targets(self, usage):
+        """{lang: bytes to shrink to} for the languages over a limit."""
+        sizes = {lang: size for lang, (_, size) in usage.items()}
+        targets = {}
+        if self.max_language_bytes:
+            for lang, size in sizes.items():
+                if size > self.max_language_bytes:
+                    targets[lang] = int(self.max_language_bytes * LOW_WATER)
+        total = sum(targets.get(lang, size) for lang, size in sizes.items())
+        if self.max_bytes and total > self.max_bytes:
+            scale = self.max_bytes * LOW_WATER / total
+            for lang, size in sizes.items():
+                targets[lang] = int(targets.get(lang, size) * scale)
+        return targets
+
+    def evict_once(self):
+        usage = self.store.usage()
+        removed = 0
+        for lang, target in self.targets(usage).items():
+            count, size = usage[lang]
+            while size > target and count and not self.stopped.is_set():
+                # Enough entries of average size to get under the target, picked in one pass
+                keys = self.store.victims(lang, self.policy, -(-(size - target) * count // size))
+                if not keys:
+                    break
+                for start in range(0, len(keys), EVICT_BATCH):
+                    deleted, freed = self.store.delete(lang, keys[start:start + EVICT_BATCH])
+                    count -= deleted
+                    size -= freed
+                    removed += deleted
+                    # Short transactions with gaps, so translators saving meanwhile are not held up
+                    if self.stopped.wait(0.01) or size <= target:
+                        break
+        if removed:
+            self.evicted += removed
+            EVENTS.info('cache', "Evicted %d least %s used cached translations", removed,
+                        'frequently' if self.policy == 'lfu' else 'recently')
+        return removed
@@ -0,0 +1,189 @@
+"""Headless batch translation without Qt.
+
+Translates files and folders with the same pipeline as the GUI and prints
+one JSON object per line on stdout as work progresses; diagnostics go to
+stderr. Example:
+
+    python cli.py movies/ extra.srt -l es,de --service google --concurrency 4
+
+Exit codes: 0 when every file and language succeeded, 1 when any failed,
+2 for usage errors and 130 when interrupted.
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import events
+
+# Progress lines own stdout; diagnostics must not interleave with them
+events.CONSOLE.stream = sys.stderr
+
+import translation_core  # noqa: E402  (after the console sink is redirected)
+from profiling import PROFILER  # noqa: E402
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+
+class ProgressWriter:
+    """Thread-safe JSON lines on a stream."""
+
+    def __init__(self, stream=None, enabled=True):
+        self.stream = stream or sys.stdout
+        self.enabled = enabled
+        self.lock = threading.Lock()
+
+    def write(self, event, **fields):
+        # Errors and the summary are printed even when progress lines are off
+        if not self.enabled and event not in ('error', 'summary'):
+            return
+        line = json.dumps({'event': event, 'time': round(time.time(), 3), **fields}, ensure_ascii=False)
+        with self.lock:
+            self.stream.write(line + '\n')
+            self.stream.flush()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Translate subtitle files without the GUI")
+    parser.add_argument('inputs', nargs='+', help="subtitle files or folders")
+    parser.add_argument('-l', '--languages', required=True, help="comma separated language codes or names")
+    parser.add_argument('-s', '--service', default='google', help="translation service key")
+    parser.add_argument('-j', '--concurrency', type=int, default=4, help="files translated in parallel")
+    parser.add_argument('-r', '--recursive', action='store_true', help="descend into sub-folders")
+    parser.add_argument('--flat', action='store_true', help="write into translated_subtitles/ instead of per-file folders")
+    parser.add_argument('--naming', default='{filename}_{language}', help="output naming template")
+    parser.add_argument('--encoding', default='utf-8', help="output encoding")
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--max-chars', type=int, default=0,
+                        help="largest request in characters (default: the service's limit)")
+    parser.add_argument('--overwrite', action='store_true', help="re-translate existing outputs")
+    parser.add_argument('--memory-threshold', type=float, default=0.9,
+                        help="minimum similarity (0-1) for reusing a near-identical line's translation")
+    parser.add_argument('--no-memory', action='store_true', help="do not use the translation memory")
+    parser.add_argument('--cache-server', help="URL of a shared cache server (cache_server.py)")
+    parser.add_argument('--cache-token', help="token the shared cache server expects")
+    parser.add_argument('--no-prepass', action='store_true',
+                        help="translate each file on its own instead of the distinct lines of all files first")
+    parser.add_argument('--no-progress', action='store_true', help="only print the summary line")
+    parser.add_argument('--profile', action='store_true',
+                        help="time each stage and print the breakdown to stderr (also saved under profiles/)")
+    parser.add_argument('--profile-sample', action='store_true',
+                        help="like --profile, and sample stacks for a flame graph (.collapsed file)")
+    return parser.parse_args(argv)
+
+
+def run(args, out):
+    try:
+        languages = translation_core.resolve_languages(args.languages.split(','))
+        files = translation_core.collect_files(args.inputs, args.recursive)
+    except (ValueError, FileNotFoundError) as e:
+        out.write('error', message=str(e))
+        return EXIT_USAGE
+    if args.service not in translation_core.TRANSLATION_SERVICES:
+        out.write('error', message=f"Unknown service: {args.service} "
+                                   f"(available: {', '.join(translation_core.TRANSLATION_SERVICES)})")
+        return EXIT_USAGE
+
+    settings = {
+        'translation_service': args.service,
+        'organize_by_file': not args.flat,
+        'output_naming': args.naming,
+        'output_encoding': args.encoding,
+        'overwrite_existing': args.overwrite,
+        'max_request_chars': args.max_chars,
+        'translation_memory': not args.no_memory,
+        'memory_threshold': args.memory_threshold,
+        'cache_server': args.cache_server,
+        'cache_server_token': args.cache_token,
+    }
+    # Offline models hold the GIL and a lot of memory; one set of them is enough
+    concurrency = 1 if translation_core.TRANSLATION_SERVICES[args.service].is_offline else max(1, args.concurrency)
+
+    counts = {'done': 0, 'skipped': 0, 'failed': 0}
+    counts_lock = threading.Lock()
+    stop = threading.Event()
+
+    def language_done(file_path, language, status, error):
+        with counts_lock:
+            counts[status] += 1
+        fields = {'file': file_path, 'language': language, 'status': status}
+        if error:
+            fields['error'] = error
+        out.write('language', **fields)
+
+    processor = translation_core.FileProcessor(languages, settings, on_language_done=language_done,
+                                               should_stop=stop.is_set)
+
+    # Every thread gets its own backends; caches are loaded once and shared between them
+    primary = processor.create_translators()
+    for translator in primary.values():
+        translator.batch_size = args.batch_size
+    local = threading.local()
+
+    def translators():
+        if not hasattr(local, 'translators'):
+            local.translators = processor.create_translators(share_cache_with=primary)
+            for translator in local.translators.values():
+                translator.batch_size = args.batch_size
+        return local.translators
+
+    def task(index, file_path):
+        if stop.is_set():
+            return
+        start_time = time.perf_counter()
+        try:
+            processor.process_file(file_path, len(files), index, translators())
+        except Exception as e:
+            # Failures outside a language (e.g. an unwritable output folder)
+            with counts_lock:
+                counts['failed'] += 1
+            out.write('file', file=file_path, status='failed', error=str(e))
+            return
+        out.write('file', file=file_path, status='done', index=index + 1, total=len(files),
+                  seconds=round(time.perf_counter() - start_time, 3))
+
+    out.write('start', files=len(files), languages=list(languages.values()), service=args.service,
+              concurrency=concurrency)
+    start_time = time.perf_counter()
+    interrupted = False
+    pool = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        if len(files) > 1 and not args.no_prepass:
+            processor.prepare_series(files, primary, max_workers=concurrency)
+            out.write('prepass', seconds=round(time.perf_counter() - start_time, 3))
+        futures = [pool.submit(task, i, file_path) for i, file_path in enumerate(files)]
+        for future in as_completed(futures):
+            future.result()
+    except KeyboardInterrupt:
+        interrupted = True
+        stop.set()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    summary = dict(counts, files=len(files), seconds=round(time.perf_counter() - start_time, 3),
+                   interrupted=interrupted)
+    out.write('summary', **summary)
+    if interrupted:
+        return EXIT_INTERRUPTED
+    return EXIT_FAILED if counts['failed'] else EXIT_OK
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.profile or args.profile_sample:
+        PROFILER.start(sample=args.profile_sample)
+    try:
+        return run(args, ProgressWriter(enabled=not args.no_progress))
+    finally:
+        breakdown, _, _ = PROFILER.stop()
+        if breakdown:
+            print(breakdown, file=sys.stderr)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,195 @@
+import re
+
+SRT_TIME = re.compile(r'(\d+):(\d+):(\d+)[,.](\d+)\s*-->\s*(\d+):(\d+):(\d+)[,.](\d+)')
+
+
+class Cue:
+    __slots__ = ('index', 'line', 'offset', 'start', 'end', 'text')
+
+    def __init__(self, index, line, offset, start, end, text):
+        self.index = index    # 0-based cue number
+        self.line = line      # 1-based line of the first text line
+        self.offset = offset  # byte offset of the cue block in the file
+        self.start = start    # milliseconds, None for plain text
+        self.end = end
+        self.text = text
+
+
+def format_time(ms):
+    if ms is None:
+        return ''
+    hours, ms = divmod(int(ms), 3600000)
+    minutes, ms = divmod(ms, 60000)
+    seconds, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{ms:03d}"
+
+
+def _srt_ms(h, m, s, frac):
+    return ((int(h) * 60 + int(m)) * 60 + int(s)) * 1000 + int(frac.ljust(3, '0')[:3])
+
+
+def _ass_ms(value):
+    h, m, s = value.strip().split(':')
+    seconds, _, frac = s.partition('.')
+    return ((int(h) * 60 + int(m)) * 60 + int(seconds)) * 1000 + int(frac.ljust(3, '0')[:3] or 0)
+
+
+def _lines(f):
+    # (line number, byte offset, decoded text) without loading the whole file
+    offset = 0
+    for number, raw in enumerate(f, 1):
+        text = raw.decode('utf-8', errors='replace')
+        if number == 1:
+            text = text.lstrip('\ufeff')
+        yield number, offset, text.rstrip('\r\n')
+        offset += len(raw)
+
+
+def detect_format(path):
+    lower = str(path).lower()
+    if lower.endswith('.ass') or lower.endswith('.ssa'):
+        return 'ass'
+    if lower.endswith('.srt'):
+        return 'srt'
+    try:
+        with open(path, 'rb') as f:
+            head = [f.readline().decode('utf-8', 'replace').strip().lstrip('\ufeff') for _ in range(2)]
+        if head[0].isdigit() and '-->' in head[1]:
+            return 'srt'
+    except OSError:
+        pass
+    return 'txt'
+
+
+def iter_srt(f):
+    index = 0
+    block = []  # lines of the current block
+    for number, offset, text in _lines(f):
+        if text.strip():
+            block.append((number, offset, text))
+            continue
+        if block:
+            cue = _srt_block(block, index)
+            if cue:
+                yield cue
+                index += 1
+            block = []
+    if block:
+        cue = _srt_block(block, index)
+        if cue:
+            yield cue
+
+
+def _srt_block(block, index):
+    for i, (_, _, text) in enumerate(block[:2]):
+        match = SRT_TIME.search(text)
+        if match:
+            g = match.groups()
+            body = block[i + 1:]
+            line = body[0][0] if body else block[i][0] + 1
+            return Cue(index, line, block[0][1], _srt_ms(*g[:4]), _srt_ms(*g[4:]),
+                       '\n'.join(text for _, _, text in body))
+    return None
+
+
+def iter_ass(f):
+    index = 0
+    for number, offset, text in _lines(f):
+        if not text.startswith('Dialogue:'):
+            continue
+        fields = text[len('Dialogue:'):].split(',', 9)
+        if len(fields) < 10:
+            continue
+        try:
+            start, end = _ass_ms(fields[1]), _ass_ms(fields[2])
+        except ValueError:
+            continue
+        yield Cue(index, number, offset, start, end, fields[9])
+        index += 1
+
+
+def iter_txt(f):
+    index = 0
+    for number, offset, text in _lines(f):
+        if text.strip():
+            yield Cue(index, number, offset, None, None, text)
+            index += 1
+
+
+def iter_cues(path):
+    """Stream the cues of an SRT, ASS or plain text file."""
+    fmt = detect_format(path)
+    parser = {'srt': iter_srt, 'ass': iter_ass}.get(fmt, iter_txt)
+    with open(path, 'rb') as f:
+        yield from parser(f)
+
+
+class CueFile:
+    """Offsets and timings of every cue in a file; text is read back on demand.
+
+    Scanning keeps only three integers per cue, so views over very large
+    files pay for the text of the rows actually shown.
+    """
+
+    TEXT_CACHE_SIZE = 512
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.format = detect_format(path)
+        self.parser = {'srt': iter_srt, 'ass': iter_ass}.get(self.format, iter_txt)
+        self.offsets = []
+        self.starts = []
+        self.ends = []
+        with open(path, 'rb') as f:
+            for cue in self.parser(f):
+                self.offsets.append(cue.offset)
+                self.starts.append(cue.start)
+                self.ends.append(cue.end)
+        self._texts = {}
+
+    def __len__(self):
+        return len(self.offsets)
+
+    @property
+    def timed(self):
+        return self.format != 'txt'
+
+    def text(self, row):
+        text = self._texts.get(row)
+        if text is None:
+            with open(self.path, 'rb') as f:
+                f.seek(self.offsets[row])
+                cue = next(self.parser(f), None)
+            text = cue.text if cue else ''
+            if len(self._texts) >= self.TEXT_CACHE_SIZE:
+                self._texts.pop(next(iter(self._texts)))
+            self._texts[row] = text
+        return text
+
+
+def align_cues(original, translated, tolerance=500):
+    """Pair rows of two CueFiles by start time; unmatched rows pair with None.
+
+    Files without timestamps are paired by position.
+    """
+    if not (original.timed and translated.timed):
+        count = max(len(original), len(translated))
+        return [(i if i < len(original) else None, i if i < len(translated) else None) for i in range(count)]
+
+    pairs = []
+    i = j = 0
+    while i < len(original) and j < len(translated):
+        a, b = original.starts[i], translated.starts[j]
+        if abs(a - b) <= tolerance:
+            pairs.append((i, j))
+            i += 1
+            j += 1
+        elif a < b:
+            pairs.append((i, None))
+            i += 1
+        else:
+            pairs.append((None, j))
+            j += 1
+    pairs.extend((k, None) for k in range(i, len(original)))
+    pairs.extend((None, k) for k in range(j, len(translated)))
+    return pairs
@@ -0,0 +1,125 @@
+import time
+
+# matplotlib is only imported once the Dashboard tab is first opened
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QPushButton
+
+
+class PerformanceDashboard(QWidget):
+    HISTORY_DAYS = 14
+    # CACHE_LOOKUPS result label -> pie slice
+    CACHE_RESULTS = (('hit', 'Cache Hits'), ('shared', 'Shared Cache Hits'),
+                     ('memory', 'Translation Memory'), ('miss', 'Cache Misses'))
+    
+    def __init__(self, store):
+        super().__init__()
+        self.store = store
+        self.language_names = {}
+        self.rendered = {}  # chart name -> data currently drawn
+        self.setup_ui()
+    
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        
+        # Create matplotlib figure with fixed axes; refreshes only touch charts whose data changed
+        self.figure = Figure(figsize=(12, 8))
+        self.canvas = FigureCanvas(self.figure)
+        layout.addWidget(self.canvas)
+        
+        self.ax_languages = self.figure.add_subplot(2, 2, 1)
+        self.ax_speed = self.figure.add_subplot(2, 2, 2)
+        self.ax_cache = self.figure.add_subplot(2, 2, 3)
+        self.ax_types = self.figure.add_subplot(2, 2, 4)
+        self.speed_line, = self.ax_speed.plot([], [], marker='o')
+        self.ax_speed.set_title('Translation Speed (subtitles/min)')
+        self.ax_speed.set_xlabel('Days ago')
+        self.ax_speed.invert_xaxis()  # today on the right
+        
+        # Refresh button
+        refresh_btn = QPushButton('Refresh Dashboard')
+        refresh_btn.clicked.connect(self.update_charts)
+        layout.addWidget(refresh_btn)
+    
+    def set_language_names(self, names):
+        # lang_code -> display name for the language chart
+        self.language_names = names
+    
+    def query(self):
+        since = time.time() - self.HISTORY_DAYS * 86400
+        cues = self.store.totals('cues')
+        top = sorted(cues.items(), key=lambda item: item[1], reverse=True)[:8]
+        
+        day = 86400
+        today = int(time.time()) // day * day
+        cue_days = self.store.timeline('cues', day, since)
+        second_days = self.store.timeline('translate_seconds', day, since)
+        speed = []
+        for ts in sorted(cue_days):
+            seconds = sum(second_days.get(ts, {}).values())
+            if seconds > 0:
+                speed.append(((today - ts) // day, sum(cue_days[ts].values()) / seconds * 60))
+        
+        cache = self.store.totals('cache')
+        types = self.store.totals('files')
+        return {
+            'languages': tuple((self.language_names.get(code, code), count) for code, count in top),
+            'speed': tuple(speed),
+            'cache': tuple((label, cache.get(result, 0)) for result, label in self.CACHE_RESULTS),
+            'types': tuple(sorted((label.upper(), count) for label, count in types.items())),
+        }
+    
+    def update_charts(self):
+        data = self.query()
+        changed = False
+        for name, draw in (('languages', self.draw_languages), ('speed', self.draw_speed),
+                           ('cache', self.draw_cache), ('types', self.draw_types)):
+            if name not in self.rendered or self.rendered[name] != data[name]:
+                draw(data[name], self.rendered.get(name))
+                self.rendered[name] = data[name]
+                changed = True
+        
+        if changed:
+            self.figure.tight_layout()
+            self.canvas.draw_idle()
+    
+    def draw_bars(self, ax, data, previous, title):
+        labels = [label for label, _ in data]
+        values = [value for _, value in data]
+        if previous and [label for label, _ in previous] == labels:
+            # Same categories: just move the bar tops
+            for bar, value in zip(ax.patches, values):
+                bar.set_height(value)
+            ax.relim()
+            ax.autoscale_view()
+            return
+        ax.cla()
+        ax.set_title(title)
+        if data:
+            ax.bar(labels, values)
+            ax.tick_params(axis='x', rotation=45)
+        else:
+            ax.text(0.5, 0.5, 'No data yet', ha='center', va='center', transform=ax.transAxes)
+    
+    def draw_languages(self, data, previous):
+        self.draw_bars(self.ax_languages, data, previous, 'Most Translated Languages (cues)')
+    
+    def draw_types(self, data, previous):
+        self.draw_bars(self.ax_types, data, previous, 'File Types Processed')
+    
+    def draw_speed(self, data, previous):
+        self.speed_line.set_data([day for day, _ in data], [speed for _, speed in data])
+        self.ax_speed.relim()
+        self.ax_speed.autoscale_view()
+    
+    def draw_cache(self, data, previous):
+        self.ax_cache.cla()
+        self.ax_cache.set_title('Cache Performance')
+        # Results that never happened would only leave empty 0% labels on the pie
+        slices = [(label, count) for label, count in data if count]
+        if slices:
+            self.ax_cache.pie([count for _, count in slices], labels=[label for label, _ in slices],
+                              autopct='%1.1f%%')
+        else:
+            self.ax_cache.text(0.5, 0.5, 'No data yet', ha='center', va='center',
+                               transform=self.ax_cache.transAxes)
@@ -0,0 +1,636 @@
+"""Spread file x language jobs over worker processes on several machines.
+
+The coordinator owns the files. It lists the jobs whose outputs are
+missing, hands each to a worker together with the source file's content,
+and writes the output the worker sends back where the translator would
+have written it, so workers only need to reach the coordinator's port.
+A job is leased to one worker at a time; the worker renews the lease while
+it translates, and a job whose lease runs out (the worker crashed or lost
+the network) goes to the next worker that asks. Failed and timed out jobs
+are retried up to --retries times. Each worker sticks to the languages it
+translated before, so its cache stays warm and two workers do not pay for
+the same recurring lines. Example:
+
+    python distributed.py coordinator movies/ -r -l es,de,fr --host 0.0.0.0 --token secret
+    python distributed.py worker http://coordinator-host:8766 --token secret -j 2
+
+The coordinator only listens on this machine unless --host says otherwise,
+and it refuses to listen on other addresses without a --token.
+
+--local-workers N starts N workers next to the coordinator, e.g. for testing.
+"""
+import argparse
+import base64
+import hmac
+import ipaddress
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from events import EVENTS
+from job_queue import QUEUED, RUNNING, DONE, FAILED
+from translation_core import (TRANSLATION_SERVICES, FileProcessor, SubtitleTranslator, collect_files,
+                              resolve_languages)
+
+DEFAULT_PORT = 8766
+LEASE_SECONDS = 120
+MAX_RETRIES = 2
+POLL_INTERVAL = 1.0  # how often an idle worker asks again while other workers hold the last jobs
+PATIENCE = 60  # seconds a worker keeps retrying an unreachable coordinator
+MAX_BODY = 64 * 1024 * 1024
+# The coordinator's settings that decide what an output looks like; the rest is up to each worker
+WORKER_SETTINGS = ('translation_service', 'output_encoding', 'max_request_chars', 'batch_size')
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+
+class Coordinator:
+    """The jobs of a run and their leases; every method is safe to call from the server's threads."""
+
+    def __init__(self, files, languages, settings, lease=LEASE_SECONDS, max_retries=MAX_RETRIES):
+        self.settings = settings
+        self.lease = lease
+        self.max_retries = max_retries
+        self.lock = threading.Lock()
+        self.finished = threading.Event()
+        self.jobs = {}
+        self.queued = {}  # lang_code -> deque of job ids in file order
+        self.affinity = {}  # worker -> lang_code it was given last
+        self.writing = set()  # ids of jobs whose output is being written
+        self.skipped = 0
+        # Only for output paths; the translation memory is the workers' business
+        processor = FileProcessor(languages, dict(settings, translation_memory=False))
+        overwrite = settings.get('overwrite_existing', False)
+        for file_path in files:
+            for language, lang_code in languages.items():
+                output = processor.output_file(file_path, language)
+                if output.exists() and not overwrite:
+                    self.skipped += 1
+                    continue
+                job_id = len(self.jobs) + 1
+                self.jobs[job_id] = {'id': job_id, 'file': str(file_path), 'language': language,
+                                     'lang_code': lang_code, 'output': output, 'state': QUEUED, 'retries': 0,
+                                     'worker': None, 'holders': set(), 'expires': 0.0, 'started': 0.0,
+                                     'error': None}
+                self.queued.setdefault(lang_code, deque()).append(job_id)
+        if not self.jobs:
+            self.finished.set()
+
+    def _language_for(self, worker):
+        waiting = [lang_code for lang_code, ids in self.queued.items() if ids]
+        if not waiting:
+            return None
+        if self.affinity.get(worker) in waiting:
+            return self.affinity[worker]
+        # A language nobody is on yet, then the one with the most work left
+        busy = Counter(job['lang_code'] for job in self.jobs.values() if job['state'] == RUNNING)
+        return min(waiting, key=lambda lang_code: (busy[lang_code], -len(self.queued[lang_code])))
+
+    def expire_leases(self):
+        with self.lock:
+            self._expire(time.time())
+
+    def _expire(self, now):
+        for job in self.jobs.values():
+            if job['state'] == RUNNING and job['expires'] < now and job['id'] not in self.writing:
+                EVENTS.warning('jobs', "Lease of %s -> %s held by %s ran out", Path(job['file']).name,
+                               job['language'], job['worker'])
+                self._retry(job, "lease expired")
+
+    def _retry(self, job, error):
+        job['retries'] += 1
+        job['error'] = error
+        job['worker'] = None
+        if job['retries'] > self.max_retries:
+            job['state'] = FAILED
+            EVENTS.error('jobs', "%s -> %s failed for good: %s", Path(job['file']).name, job['language'], error)
+            self._check_finished()
+        else:
+            job['state'] = QUEUED
+            self.queued[job['lang_code']].appendleft(job['id'])
+
+    def _check_finished(self):
+        if all(job['state'] in (DONE, FAILED) for job in self.jobs.values()):
+            self.finished.set()
+
+    def _owned(self, worker, job_id):
+        job = self.jobs.get(job_id)
+        return job if job and job['state'] == RUNNING and job['worker'] == worker else None
+
+    def claim(self, worker):
+        """Lease the next job to worker; None when no job is waiting."""
+        now = time.time()
+        with self.lock:
+            self._expire(now)
+            lang_code = self._language_for(worker)
+            if lang_code is None:
+                return None
+            job = self.jobs[self.queued[lang_code].popleft()]
+            job.update(state=RUNNING, worker=worker, expires=now + self.lease, started=now)
+            job['holders'].add(worker)
+            self.affinity[worker] = lang_code
+            return dict(job)
+
+    def renew(self, worker, job_id):
+        with self.lock:
+            job = self._owned(worker, job_id)
+            if job:
+                job['expires'] = time.time() + self.lease
+            return job is not None
+
+    def complete(self, worker, job_id, content):
+        """Write a job's output; False when another worker's result came first or it could not be written.
+
+        Only a worker that held the job's lease at some point may deliver it;
+        a result that comes in after the lease ran out is still taken.
+        """
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if not job or job['state'] == DONE or job_id in self.writing:
+                return False
+            if worker not in job['holders']:
+                EVENTS.warning('jobs', "Refused a result for job %s from %s, which never held it", job_id, worker)
+                return False
+            self.writing.add(job_id)
+            output = job['output']
+        # Outside the lock, so a slow disk does not hold up every other worker's claims and heartbeats
+        try:
+            output.parent.mkdir(parents=True, exist_ok=True)
+            temp = output.with_name(f".{output.name}.{job_id}.tmp")
+            temp.write_bytes(content)
+            os.replace(temp, output)
+        except OSError as e:
+            with self.lock:
+                self.writing.discard(job_id)
+                EVENTS.error('jobs', "Could not write %s: %s", output, e)
+                if self._owned(worker, job_id):
+                    self._retry(job, f"could not write the output: {e}")
+            return False
+        with self.lock:
+            self.writing.discard(job_id)
+            # A result that comes in after its lease ran out is as good as the retry's
+            if job_id in self.queued[job['lang_code']]:
+                self.queued[job['lang_code']].remove(job_id)
+            job.update(state=DONE, worker=worker, error=None)
+            EVENTS.info('jobs', "%s -> %s done by %s in %.1fs", Path(job['file']).name, job['language'], worker,
+                        time.time() - job['started'])
+            self._check_finished()
+            return True
+
+    def fail(self, worker, job_id, error):
+        with self.lock:
+            job = self._owned(worker, job_id)
+            if job:
+                EVENTS.warning('jobs', "%s -> %s failed on %s: %s", Path(job['file']).name, job['language'],
+                               worker, error)
+                self._retry(job, error)
+
+    def release(self, worker, job_id):
+        # A worker that stops hands its job back without charging a retry
+        with self.lock:
+            job = self._owned(worker, job_id)
+            if job:
+                job.update(state=QUEUED, worker=None)
+                self.queued[job['lang_code']].appendleft(job_id)
+
+    def counts(self):
+        with self.lock:
+            counts = Counter(job['state'] for job in self.jobs.values())
+        return {state: counts.get(state, 0) for state in (QUEUED, RUNNING, DONE, FAILED)}
+
+
+class _CoordinatorHandler(BaseHTTPRequestHandler):
+    coordinator = None
+    token = None
+
+    def _authorized(self):
+        if not self.token:
+            return True
+        header = self.headers.get('Authorization', '')
+        if hmac.compare_digest(header.encode(), f"Bearer {self.token}".encode()):
+            return True
+        self.send_error(401)
+        return False
+
+    def _send_json(self, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/run':
+            self.send_error(404)
+            return
+        if not self._authorized():
+            return
+        coordinator = self.coordinator
+        settings = {key: coordinator.settings[key] for key in WORKER_SETTINGS if key in coordinator.settings}
+        self._send_json({'settings': settings, 'lease': coordinator.lease, 'counts': coordinator.counts(),
+                         'finished': coordinator.finished.is_set()})
+
+    def do_POST(self):
+        routes = {'/claim': self._claim, '/renew': self._renew, '/complete': self._complete,
+                  '/fail': self._fail, '/release': self._release}
+        route = routes.get(self.path.split('?', 1)[0])
+        if route is None:
+            self.send_error(404)
+            return
+        if not self._authorized():
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            if not 0 < length <= MAX_BODY:
+                raise ValueError("missing or oversized body")
+            request = json.loads(self.rfile.read(length))
+            if not isinstance(request, dict) or not isinstance(request.get('worker'), str):
+                raise ValueError("expected a JSON object with a worker name")
+            response = route(request)
+        except (ValueError, KeyError, TypeError) as e:
+            self.send_error(400, str(e))
+            return
+        self._send_json(response)
+
+    def _claim(self, request):
+        coordinator = self.coordinator
+        job = coordinator.claim(request['worker'])
+        if job is None:
+            return {'job': None, 'finished': coordinator.finished.is_set()}
+        try:
+            source = Path(job['file']).read_bytes()
+        except OSError as e:
+            coordinator.fail(request['worker'], job['id'], str(e))
+            return {'job': None, 'finished': coordinator.finished.is_set()}
+        return {'job': {'id': job['id'], 'name': Path(job['file']).name, 'language': job['language'],
+                        'lang_code': job['lang_code'], 'output_name': job['output'].name,
+                        'source': base64.b64encode(source).decode('ascii')}}
+
+    def _renew(self, request):
+        return {'ok': self.coordinator.renew(request['worker'], int(request['id']))}
+
+    def _complete(self, request):
+        content = base64.b64decode(request['output'], validate=True)
+        return {'ok': self.coordinator.complete(request['worker'], int(request['id']), content)}
+
+    def _fail(self, request):
+        self.coordinator.fail(request['worker'], int(request['id']), str(request.get('error') or 'unknown error'))
+        return {'ok': True}
+
+    def _release(self, request):
+        self.coordinator.release(request['worker'], int(request['id']))
+        return {'ok': True}
+
+    def log_message(self, format, *args):
+        # Idle workers poll every second; job events are reported through EVENTS instead
+        pass
+
+
+class CoordinatorServer:
+    """Serves a Coordinator from a daemon thread; nothing runs until start() is called."""
+
+    def __init__(self, coordinator, port=DEFAULT_PORT, host='127.0.0.1', token=None):
+        self.coordinator = coordinator
+        self.host = host
+        self.port = port
+        self.token = token
+        self.httpd = None
+        self.thread = None
+
+    def start(self):
+        handler = type('CoordinatorHandler', (_CoordinatorHandler,),
+                       {'coordinator': self.coordinator, 'token': self.token})
+        self.httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='coordinator', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+            self.thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+
+class Worker:
+    """Claims jobs from a coordinator and translates concurrency of them at a time.
+
+    settings are this machine's own (translation memory, shared cache);
+    the service and output format come from the coordinator.
+    """
+
+    def __init__(self, url, token=None, concurrency=1, name=None, settings=None, patience=PATIENCE):
+        self.url = url.rstrip('/')
+        self.token = token
+        self.concurrency = max(1, concurrency)
+        self.name = name or f"{socket.gethostname()}-{os.getpid()}"
+        self.local_settings = settings or {}
+        self.patience = patience
+        self.stopped = threading.Event()
+        self.lock = threading.Lock()
+        self.active = set()  # ids of the jobs being translated, renewed by the heartbeat
+        self.primary = {}  # lang_code -> translator whose cache the other slots share
+        self.processor = None
+        self.lease = LEASE_SECONDS
+        self.counts = Counter()
+
+    def _request(self, path, payload=None):
+        data = json.dumps(payload).encode('utf-8') if payload is not None else None
+        headers = {'Content-Type': 'application/json'}
+        if self.token:
+            headers['Authorization'] = f"Bearer {self.token}"
+        request = urllib.request.Request(self.url + path, data, headers)
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return json.loads(response.read())
+
+    def _call(self, path, payload=None):
+        """The coordinator's answer, retried for up to patience seconds; raises ConnectionError after."""
+        deadline = time.monotonic() + self.patience
+        while True:
+            try:
+                return self._request(path, None if payload is None else dict(payload, worker=self.name))
+            except (OSError, ValueError) as e:
+                if time.monotonic() >= deadline or self.stopped.is_set():
+                    raise ConnectionError(f"Coordinator {self.url} unreachable: {e}") from e
+                EVENTS.warning('jobs', "Coordinator %s unreachable, retrying: %s", self.url, e)
+                time.sleep(2)
+
+    def run(self):
+        """Work until the coordinator has no jobs left; returns {'done', 'failed', 'released', 'discarded'} counts."""
+        config = self._call('/run')
+        self.lease = config['lease']
+        settings = dict(config['settings'], **self.local_settings)
+        self.processor = FileProcessor({}, settings, should_stop=self.stopped.is_set)
+        EVENTS.info('jobs', "Worker %s joined %s with %d slots", self.name, self.url, self.concurrency)
+        heartbeat = threading.Thread(target=self._heartbeat, name='lease-heartbeat', daemon=True)
+        heartbeat.start()
+        slots = [threading.Thread(target=self._slot, name=f'worker-slot-{i}', daemon=True)
+                 for i in range(self.concurrency)]
+        for slot in slots:
+            slot.start()
+        try:
+            for slot in slots:
+                # Joined with a timeout so Ctrl+C gets through
+                while slot.is_alive():
+                    slot.join(0.5)
+        except KeyboardInterrupt:
+            # Give the slots a moment to hand their jobs back instead of leaving them to expire
+            self.stopped.set()
+            for slot in slots:
+                slot.join(10)
+            raise
+        finally:
+            self.stopped.set()
+        return dict(self.counts)
+
+    def stop(self):
+        # Jobs being translated are handed back once their current batch is done
+        self.stopped.set()
+
+    def _heartbeat(self):
+        while not self.stopped.wait(self.lease / 3):
+            with self.lock:
+                active = list(self.active)
+            for job_id in active:
+                try:
+                    if not self._call('/renew', {'id': job_id})['ok']:
+                        EVENTS.warning('jobs', "Lost the lease of job %d; its result may be discarded", job_id)
+                except ConnectionError as e:
+                    EVENTS.warning('jobs', "Could not renew job %d: %s", job_id, e)
+
+    def _slot(self):
+        translators = {}
+        try:
+            while not self.stopped.is_set():
+                answer = self._call('/claim', {})
+                job = answer.get('job')
+                if job is None:
+                    if answer.get('finished'):
+                        return
+                    self.stopped.wait(POLL_INTERVAL)
+                    continue
+                self._process(job, translators)
+        except ConnectionError as e:
+            EVENTS.error('jobs', "%s", e)
+            self.stopped.set()
+
+    def _translator(self, lang_code, translators):
+        if lang_code not in translators:
+            settings = self.processor.settings
+            with self.lock:
+                # Every slot has its own backend, but a language's cache is loaded once
+                primary = self.primary.get(lang_code)
+                translator = SubtitleTranslator(lang_code, None, settings.get('translation_service', 'google'),
+                                                primary, self.processor.memory, self.processor.shared_cache)
+                self.primary.setdefault(lang_code, translator)
+            translator.batch_size = settings.get('batch_size', translator.batch_size)
+            if settings.get('max_request_chars'):
+                translator.max_chars = settings['max_request_chars']
+            translators[lang_code] = translator
+        return translators[lang_code]
+
+    def _process(self, job, translators):
+        folder = Path(tempfile.mkdtemp(prefix='srt_job_'))
+        with self.lock:
+            self.active.add(job['id'])
+        try:
+            source = folder / job['name']
+            source.write_bytes(base64.b64decode(job['source']))
+            output = folder / 'output' / job['output_name']
+            output.parent.mkdir()
+            start_time = time.perf_counter()
+            try:
+                self.processor.translate_file(str(source), str(output), self._translator(job['lang_code'], translators))
+            except Exception as e:
+                EVENTS.error('jobs', "%s -> %s failed: %s", job['name'], job['language'], e)
+                self.counts['failed'] += 1
+                self._call('/fail', {'id': job['id'], 'error': str(e)})
+                return
+            if not output.exists():
+                # Stopped halfway
+                self.counts['released'] += 1
+                self._call('/release', {'id': job['id']})
+                return
+            answer = self._call('/complete', {'id': job['id'],
+                                              'output': base64.b64encode(output.read_bytes()).decode('ascii')})
+            if not answer.get('ok'):
+                # Another worker's result came first, or the coordinator could not write this one
+                self.counts['discarded'] += 1
+                EVENTS.warning('jobs', "%s -> %s was translated but the coordinator did not take the result",
+                               job['name'], job['language'])
+                return
+            self.counts['done'] += 1
+            EVENTS.info('jobs', "%s -> %s translated in %.1fs", job['name'], job['language'],
+                        time.perf_counter() - start_time)
+        finally:
+            with self.lock:
+                self.active.discard(job['id'])
+            shutil.rmtree(folder, ignore_errors=True)
+
+
+def _is_loopback(host):
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return host == 'localhost'
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Translate file x language jobs on several machines")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    coordinator = subparsers.add_parser('coordinator', help="hand out the jobs and collect the outputs")
+    coordinator.add_argument('inputs', nargs='+', help="subtitle files or folders")
+    coordinator.add_argument('-l', '--languages', required=True, help="comma separated language codes or names")
+    coordinator.add_argument('-s', '--service', default='google', help="translation service key")
+    coordinator.add_argument('-r', '--recursive', action='store_true', help="descend into sub-folders")
+    coordinator.add_argument('--flat', action='store_true',
+                             help="write into translated_subtitles/ instead of per-file folders")
+    coordinator.add_argument('--naming', default='{filename}_{language}', help="output naming template")
+    coordinator.add_argument('--encoding', default='utf-8', help="output encoding")
+    coordinator.add_argument('--batch-size', type=int, default=50)
+    coordinator.add_argument('--max-chars', type=int, default=0,
+                             help="largest request in characters (default: the service's limit)")
+    coordinator.add_argument('--overwrite', action='store_true', help="re-translate existing outputs")
+    coordinator.add_argument('--host', default='127.0.0.1',
+                             help="address to listen on (default: this machine only; 0.0.0.0 for all "
+                                  "interfaces, which requires --token)")
+    coordinator.add_argument('--port', type=int, default=DEFAULT_PORT)
+    coordinator.add_argument('--token', help="shared secret workers must send")
+    coordinator.add_argument('--lease', type=int, default=LEASE_SECONDS,
+                             help="seconds a worker may go without renewing a job before it is handed out again")
+    coordinator.add_argument('--retries', type=int, default=MAX_RETRIES, help="attempts after a failed job")
+    coordinator.add_argument('--local-workers', type=int, default=0, help="workers to start on this machine")
+
+    worker = subparsers.add_parser('worker', help="translate jobs of a coordinator")
+    worker.add_argument('url', help="coordinator URL, e.g. http://host:8766")
+    worker.add_argument('-j', '--concurrency', type=int, default=1, help="jobs translated in parallel")
+    worker.add_argument('--token', help="shared secret of the coordinator")
+    worker.add_argument('--name', help="worker name in the coordinator's log (default: host-pid)")
+    worker.add_argument('--memory-threshold', type=float, default=0.9,
+                        help="minimum similarity (0-1) for reusing a near-identical line's translation")
+    worker.add_argument('--no-memory', action='store_true', help="do not use the translation memory")
+    worker.add_argument('--cache-server', help="URL of a shared cache server (cache_server.py)")
+    worker.add_argument('--cache-token', help="token the shared cache server expects")
+    return parser.parse_args(argv)
+
+
+def run_coordinator(args):
+    try:
+        languages = resolve_languages(args.languages.split(','))
+        files = collect_files(args.inputs, args.recursive)
+    except (ValueError, FileNotFoundError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return EXIT_USAGE
+    if args.service not in TRANSLATION_SERVICES:
+        print(f"❌ Unknown service: {args.service} (available: {', '.join(TRANSLATION_SERVICES)})", file=sys.stderr)
+        return EXIT_USAGE
+    if not args.token and not _is_loopback(args.host):
+        # Anyone who can reach the port could otherwise read the sources and overwrite outputs
+        print(f"❌ Listening on {args.host} requires --token", file=sys.stderr)
+        return EXIT_USAGE
+    settings = {
+        'translation_service': args.service,
+        'organize_by_file': not args.flat,
+        'output_naming': args.naming,
+        'output_encoding': args.encoding,
+        'overwrite_existing': args.overwrite,
+        'max_request_chars': args.max_chars,
+        'batch_size': args.batch_size,
+    }
+    coordinator = Coordinator(files, languages, settings, args.lease, args.retries)
+    try:
+        server = CoordinatorServer(coordinator, args.port, args.host, args.token).start()
+    except OSError as e:
+        print(f"❌ Could not listen on port {args.port}: {e}", file=sys.stderr)
+        return EXIT_FAILED
+    print(f"📡 {len(coordinator.jobs)} jobs for {len(files)} files on {server.url} "
+          f"({coordinator.skipped} outputs already exist)")
+
+    workers = []
+    for i in range(args.local_workers):
+        command = [sys.executable, os.path.abspath(__file__), 'worker', f"http://127.0.0.1:{server.port}",
+                   '--name', f"local-{i + 1}"]
+        if args.token:
+            command += ['--token', args.token]
+        workers.append(subprocess.Popen(command))
+
+    start_time = time.perf_counter()
+    interrupted = False
+    try:
+        while not coordinator.finished.wait(1):
+            # Claims check leases too, but with every worker gone nobody claims
+            coordinator.expire_leases()
+        # Idle workers poll again within POLL_INTERVAL; let them hear that the run is over
+        time.sleep(POLL_INTERVAL * 2)
+    except KeyboardInterrupt:
+        interrupted = True
+    finally:
+        server.stop()
+        for process in workers:
+            if process.poll() is None:
+                process.terminate()
+            process.wait()
+
+    counts = coordinator.counts()
+    elapsed = time.perf_counter() - start_time
+    print(f"📦 {counts[DONE]} done, {counts[FAILED]} failed, {counts[QUEUED] + counts[RUNNING]} unfinished "
+          f"in {elapsed:.1f}s")
+    for job in coordinator.jobs.values():
+        if job['state'] == FAILED:
+            print(f"❌ {job['file']} -> {job['language']}: {job['error']}", file=sys.stderr)
+    if interrupted:
+        return EXIT_INTERRUPTED
+    return EXIT_FAILED if counts[FAILED] else EXIT_OK
+
+
+def run_worker(args):
+    settings = {
+        'translation_memory': not args.no_memory,
+        'memory_threshold': args.memory_threshold,
+        'cache_server': args.cache_server,
+        'cache_server_token': args.cache_token,
+    }
+    worker = Worker(args.url, args.token, args.concurrency, args.name, settings)
+    try:
+        counts = worker.run()
+    except ConnectionError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return EXIT_FAILED
+    except KeyboardInterrupt:
+        worker.stop()
+        return EXIT_INTERRUPTED
+    print(f"📦 {worker.name}: {counts.get('done', 0)} jobs done, {counts.get('failed', 0)} failed")
+    return EXIT_OK
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == 'coordinator':
+        return run_coordinator(args)
+    return run_worker(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""Structured event stream for translation diagnostics.
+
+Events carry a level, a category and a %-style message that is only
+formatted when at least one sink will receive it, so disabled levels cost a
+single comparison. Categories can be sampled (keep 1 in N below WARNING) to
+thin out per-item chatter on long runs.
+
+Environment:
+    SRT_MAKER_LOG_LEVEL   debug, info, warning, error or off (default info)
+    SRT_MAKER_LOG_SAMPLE  per-category sampling, e.g. "cache=20,batch=5"
+    SRT_MAKER_LOG_FILE    also append events as JSON lines to this file
+"""
+import json
+import os
+import sys
+import threading
+import time
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+
+LEVEL_NAMES = {DEBUG: 'debug', INFO: 'info', WARNING: 'warning', ERROR: 'error', OFF: 'off'}
+LEVELS = {name: level for level, name in LEVEL_NAMES.items()}
+
+
+class Event:
+    __slots__ = ('time', 'level', 'category', 'message', 'fields')
+
+    def __init__(self, level, category, message, fields):
+        self.time = time.time()
+        self.level = level
+        self.category = category
+        self.message = message
+        self.fields = fields
+
+
+class Sink:
+    """Base sink; subclasses implement handle(event)."""
+
+    def __init__(self, level=DEBUG):
+        self.level = level
+
+    def handle(self, event):
+        raise NotImplementedError
+
+
+class ConsoleSink(Sink):
+    def __init__(self, level=DEBUG, stream=None):
+        super().__init__(level)
+        self.stream = stream
+
+    def handle(self, event):
+        # Windowed frozen builds have no stdout at all
+        stream = self.stream or sys.stdout
+        if stream is None:
+            return
+        try:
+            stream.write(f"[{LEVEL_NAMES[event.level].upper()}] {event.category}: {event.message}\n")
+        except (OSError, ValueError):
+            pass
+
+
+class FileSink(Sink):
+    """Appends events as JSON lines."""
+
+    def __init__(self, path, level=DEBUG):
+        super().__init__(level)
+        self.path = path
+        self.lock = threading.Lock()
+
+    def handle(self, event):
+        record = {'time': event.time, 'level': LEVEL_NAMES[event.level], 'category': event.category,
+                  'message': event.message}
+        record.update(event.fields)
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self.lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+
+class CallbackSink(Sink):
+    """Forwards each event to a callable, e.g. a Qt signal's emit."""
+
+    def __init__(self, callback, level=INFO):
+        super().__init__(level)
+        self.callback = callback
+
+    def handle(self, event):
+        self.callback(event)
+
+
+class EventStream:
+    def __init__(self, level=INFO):
+        self.level = level
+        self.sinks = []
+        self.sample_rates = {}  # category -> keep 1 in N
+        self.sample_counts = {}
+        self.lock = threading.Lock()
+        self._update_threshold()
+
+    def _update_threshold(self):
+        # Lowest level any sink would accept, or OFF when nothing listens
+        sink_level = min((sink.level for sink in self.sinks), default=OFF)
+        self.threshold = max(self.level, sink_level)
+
+    def set_level(self, level):
+        self.level = LEVELS.get(level, INFO) if isinstance(level, str) else level
+        self._update_threshold()
+
+    def add_sink(self, sink):
+        with self.lock:
+            self.sinks = self.sinks + [sink]
+            self._update_threshold()
+        return sink
+
+    def remove_sink(self, sink):
+        with self.lock:
+            self.sinks = [s for s in self.sinks if s is not sink]
+            self._update_threshold()
+
+    def set_sample_rate(self, category, every):
+        self.sample_rates[category] = max(1, int(every))
+
+    def enabled(self, level):
+        return level >= self.threshold
+
+    def emit(self, level, category, message, *args, **fields):
+        if level < self.threshold:
+            return
+        every = self.sample_rates.get(category)
+        if every and every > 1 and level < WARNING:
+            with self.lock:
+                count = self.sample_counts.get(category, 0)
+                self.sample_counts[category] = count + 1
+            if count % every:
+                return
+        event = Event(level, category, message % args if args else message, fields)
+        for sink in self.sinks:
+            if level >= sink.level:
+                sink.handle(event)
+
+    def debug(self, category, message, *args, **fields):
+        if DEBUG >= self.threshold:
+            self.emit(DEBUG, category, message, *args, **fields)
+
+    def info(self, category, message, *args, **fields):
+        if INFO >= self.threshold:
+            self.emit(INFO, category, message, *args, **fields)
+
+    def warning(self, category, message, *args, **fields):
+        self.emit(WARNING, category, message, *args, **fields)
+
+    def error(self, category, message, *args, **fields):
+        self.emit(ERROR, category, message, *args, **fields)
+
+    def configure_from_env(self):
+        self.set_level(os.environ.get('SRT_MAKER_LOG_LEVEL', 'info').lower())
+        for item in os.environ.get('SRT_MAKER_LOG_SAMPLE', '').split(','):
+            category, _, every = item.partition('=')
+            if category.strip() and every.strip().isdigit():
+                self.set_sample_rate(category.strip(), every.strip())
+        if os.environ.get('SRT_MAKER_LOG_FILE'):
+            self.add_sink(FileSink(os.environ['SRT_MAKER_LOG_FILE']))
+
+
+EVENTS = EventStream()
+CONSOLE = EVENTS.add_sink(ConsoleSink())
+EVENTS.configure_from_env()
@@ -0,0 +1,61 @@
+import random
+import threading
+import time
+
+SEPARATOR = "\n\n\n"
+
+
+class FakeBackendError(Exception):
+    pass
+
+
+class FakeBackend:
+    """Deterministic in-process stand-in for an online translation service.
+
+    Translations are "[<target>] <source>" per segment, so batched requests
+    split back exactly like a well-behaved service. Latency and failures are
+    driven by a seeded RNG, which makes two runs with the same seed identical.
+    """
+
+    def __init__(self, latency=0.0, per_char_latency=0.0, failure_rate=0.0, seed=0):
+        self.latency = latency
+        self.per_char_latency = per_char_latency
+        self.failure_rate = failure_rate
+        self.seed = seed
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.random = random.Random(self.seed)
+            self.requests = 0
+            self.chars = 0
+            self.failures = 0
+
+    def translator_class(self, source='auto', target='en'):
+        # Matches the constructor signature TranslationService expects from online translators
+        return FakeTranslator(self, source, target)
+
+    def call(self, text, target):
+        with self.lock:
+            self.requests += 1
+            self.chars += len(text)
+            fail = self.failure_rate and self.random.random() < self.failure_rate
+            if fail:
+                self.failures += 1
+        delay = self.latency + self.per_char_latency * len(text)
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise FakeBackendError("Simulated translation service failure")
+        return SEPARATOR.join(f"[{target}] {segment}" for segment in text.split(SEPARATOR))
+
+
+class FakeTranslator:
+    def __init__(self, backend, source='auto', target='en'):
+        self.backend = backend
+        self.source = source
+        self.target = target
+
+    def translate(self, text):
+        return self.backend.call(text, self.target)
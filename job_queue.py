@@ -0,0 +1,179 @@
+import sqlite3
+import threading
+import time
+
+from app_paths import get_app_dir
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    file_path TEXT NOT NULL,
+    language TEXT NOT NULL,
+    lang_code TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'queued',
+    retries INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs (state, id);
+CREATE INDEX IF NOT EXISTS idx_jobs_file ON jobs (file_path, lang_code, state);
+"""
+
+
+class JobQueue:
+    """Durable file x language job queue stored in SQLite.
+
+    Every lookup goes through an index, so queue operations stay cheap no
+    matter how many finished jobs have piled up in the history.
+    """
+
+    def __init__(self, db_path=None, max_retries=3):
+        self.db_path = str(db_path or get_app_dir() / 'jobs.db')
+        self.max_retries = max_retries
+        self.lock = threading.Lock()
+        # Worker threads report job results, so the connection is shared behind a lock
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def enqueue(self, file_path, languages):
+        # languages: {language name: language code}; outstanding duplicates are skipped
+        now = time.time()
+        added = 0
+        with self.lock, self.conn:
+            for language, lang_code in languages.items():
+                row = self.conn.execute(
+                    "SELECT 1 FROM jobs WHERE file_path = ? AND lang_code = ? AND state IN (?, ?) LIMIT 1",
+                    (str(file_path), lang_code, QUEUED, RUNNING)
+                ).fetchone()
+                if row:
+                    continue
+                self.conn.execute(
+                    "INSERT INTO jobs (file_path, language, lang_code, state, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (str(file_path), language, lang_code, QUEUED, now, now)
+                )
+                added += 1
+        return added
+
+    def claim_next(self):
+        """Mark every queued job of the oldest queued file as running.
+
+        Returns (file_path, {lang_code: (job_id, language)}) or None.
+        """
+        with self.lock, self.conn:
+            row = self.conn.execute(
+                "SELECT file_path FROM jobs WHERE state = ? ORDER BY id LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if not row:
+                return None
+            file_path = row[0]
+            rows = self.conn.execute(
+                # Without the hint SQLite walks every queued row through idx_jobs_state
+                "SELECT id, language, lang_code FROM jobs INDEXED BY idx_jobs_file "
+                "WHERE file_path = ? AND state = ? ORDER BY id",
+                (file_path, QUEUED)
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE jobs SET state = ?, updated_at = ? WHERE id = ?",
+                [(RUNNING, time.time(), job_id) for job_id, _, _ in rows]
+            )
+        return file_path, {lang_code: (job_id, language) for job_id, language, lang_code in rows}
+
+    def mark_done(self, job_id):
+        self._set_state(job_id, DONE)
+
+    def mark_failed(self, job_id, error=None):
+        # Failed jobs go back in the queue until they run out of retries; only a running job can fail,
+        # so languages a run already finished or charged keep their state
+        with self.lock, self.conn:
+            row = self.conn.execute(
+                "SELECT retries FROM jobs WHERE id = ? AND state = ?", (job_id, RUNNING)
+            ).fetchone()
+            if not row:
+                return
+            retries = row[0] + 1
+            state = QUEUED if retries <= self.max_retries else FAILED
+            self.conn.execute(
+                "UPDATE jobs SET state = ?, retries = ?, error = ?, updated_at = ? WHERE id = ?",
+                (state, retries, str(error) if error else None, time.time(), job_id)
+            )
+
+    def release(self, job_ids):
+        # Put interrupted jobs back without charging a retry
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "UPDATE jobs SET state = ?, updated_at = ? WHERE id = ? AND state = ?",
+                [(QUEUED, time.time(), job_id, RUNNING) for job_id in job_ids]
+            )
+
+    def recover(self):
+        # Jobs still marked running were interrupted by a crash; that costs a retry so
+        # a file that keeps taking the app down eventually ends up failed
+        with self.lock, self.conn:
+            now = time.time()
+            self.conn.execute(
+                "UPDATE jobs SET state = ?, retries = retries + 1, updated_at = ? "
+                "WHERE state = ? AND retries >= ?",
+                (FAILED, now, RUNNING, self.max_retries)
+            )
+            cursor = self.conn.execute(
+                "UPDATE jobs SET state = ?, retries = retries + 1, updated_at = ? WHERE state = ?",
+                (QUEUED, now, RUNNING)
+            )
+            return cursor.rowcount
+
+    def pending_count(self):
+        with self.lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE state = ?", (QUEUED,)
+            ).fetchone()[0]
+
+    def pending_files(self, limit):
+        """Paths of the oldest files with queued jobs, without claiming them."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT file_path FROM jobs WHERE state = ? GROUP BY file_path ORDER BY MIN(id) LIMIT ?",
+                (QUEUED, limit)
+            ).fetchall()
+        return [file_path for file_path, in rows]
+
+    def pending_file_count(self):
+        with self.lock:
+            return self.conn.execute(
+                "SELECT COUNT(DISTINCT file_path) FROM jobs WHERE state = ?", (QUEUED,)
+            ).fetchone()[0]
+
+    def counts(self):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT state, COUNT(*) FROM jobs INDEXED BY idx_jobs_state GROUP BY state"
+            ).fetchall()
+        counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def export_metrics(self):
+        # Queue depth is read from the database only when metrics are scraped
+        import metrics
+        for state in (QUEUED, RUNNING, DONE, FAILED):
+            metrics.QUEUE_JOBS.labels(state).set_function(lambda state=state: self.counts()[state])
+
+    def _set_state(self, job_id, state):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "UPDATE jobs SET state = ?, error = NULL, updated_at = ? WHERE id = ?",
+                (state, time.time(), job_id)
+            )
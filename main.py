@@ -1,13 +1,15 @@
 import os
 import sys
 import time
+STARTUP_TIME = time.perf_counter()  # reference point for the cold start measurement
 import hashlib
 import json
 import shutil
 import re
 import sqlite3
-import requests
 import tempfile
+import threading
+from collections import deque
 from pathlib import Path
 from datetime import datetime
 from PyQt5 import QtWidgets, QtCore, QtGui
@@ -15,25 +17,23 @@ from PyQt5.QtCore import QThread, pyqtSignal, QTimer, QSize, QRect, QPoint, QFil
 from PyQt5.QtWidgets import *
 from PyQt5.QtGui import QFont, QPixmap, QIcon, QKeySequence
 
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-
-try:
-    import torch
-    GPU_AVAILABLE = torch.cuda.is_available()
-    print(f"TORCH: PyTorch is available. GPU support: {GPU_AVAILABLE}")
-except ImportError:
-    print("TORCH IMPORT ERROR: PyTorch is not installed or not available.")
-    GPU_AVAILABLE = False
-
-try:
-    from transformers import MarianMTModel, MarianTokenizer, pipeline
-    TRANSFORMERS_AVAILABLE = True
-    print("TRANSFORMERS: Available for offline translation")
-except ImportError:
-    print("TRANSFORMERS IMPORT ERROR: transformers library not available")
-    TRANSFORMERS_AVAILABLE = False
+from app_paths import get_cache_dir
+from job_queue import JobQueue
+import metrics
+from metrics_server import MetricsServer
+from timeseries import TimeSeriesStore, RunRecorder
+from cue_parser import format_time, CueFile, align_cues
+from search_index import SearchIndex, translated_outputs
+import bulk_replace
+import cache_bundle
+from cache_server import CacheClient
+from cache_store import CacheEvictor, default_store
+import cache_rebuild
+from events import EVENTS, CallbackSink, WARNING
+from profiling import PROFILER
+from settings_store import SettingsStore
+from translation_core import (TRANSLATION_SERVICES, DEFAULT_LANGUAGES, LANGUAGES, SUPPORTED_FORMATS,
+                              FileProcessor, google_translator, gpu_available, torch_installed)
 
 # Comprehensive UI texts for translation
 UI_TEXTS = {
@@ -108,136 +108,322 @@ UI_TEXTS = {
     'monitoring': 'Monitoring'
 }
 
-# Cache for translated UI texts
-TRANSLATED_CACHE = {}
-
-
-
+# Cached UI translations are only valid for the UI_TEXTS they were made from
+UI_CACHE_VERSION = 1
+# Queued files whose lines share requests with the file being translated
+MAX_PACKED_FILES = 200
+UI_TEXTS_HASH = hashlib.sha256(json.dumps(UI_TEXTS, sort_keys=True).encode()).hexdigest()[:16]
 
+class UITextCache:
+    """Translated UI texts on disk, one file per language."""
+    
+    def __init__(self, directory=None):
+        self.directory = Path(directory or get_cache_dir())
+        self.languages = {}  # lang_code -> {key: text}
+        self.lock = threading.Lock()
+    
+    def path(self, lang_code):
+        return self.directory / f"ui_texts_{lang_code}.json"
+    
+    def get(self, lang_code):
+        with self.lock:
+            if lang_code not in self.languages:
+                self.languages[lang_code] = self.load(lang_code)
+            return dict(self.languages[lang_code])
+    
+    def load(self, lang_code):
+        try:
+            with open(self.path(lang_code), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != UI_CACHE_VERSION or data.get('texts_hash') != UI_TEXTS_HASH:
+            return {}
+        return {key: text for key, text in data.get('texts', {}).items() if key in UI_TEXTS}
+    
+    def store(self, lang_code, texts):
+        with self.lock:
+            self.languages[lang_code] = dict(texts)
+        data = json.dumps({'version': UI_CACHE_VERSION, 'texts_hash': UI_TEXTS_HASH, 'texts': texts},
+                          ensure_ascii=False, indent=2)
+        path = self.path(lang_code)
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            EVENTS.error('ui', "Error saving UI translations: %s", e)
 
-# Performance Dashboard
-class PerformanceDashboard(QWidget):
-    def __init__(self):
-        super().__init__()
-        self.setup_ui()
+class GpuProbe(QThread):
+    result = pyqtSignal(bool)
     
-    def setup_ui(self):
-        layout = QVBoxLayout(self)
-        
-        # Create matplotlib figure
-        self.figure = Figure(figsize=(12, 8))
-        self.canvas = FigureCanvas(self.figure)
-        layout.addWidget(self.canvas)
-        
-        # Refresh button
-        refresh_btn = QPushButton('Refresh Dashboard')
-        refresh_btn.clicked.connect(self.update_charts)
-        layout.addWidget(refresh_btn)
-        
-        self.update_charts()
-    
-    def update_charts(self):
-        self.figure.clear()
-        
-        # Create subplots
-        ax1 = self.figure.add_subplot(2, 2, 1)
-        ax2 = self.figure.add_subplot(2, 2, 2)
-        ax3 = self.figure.add_subplot(2, 2, 3)
-        ax4 = self.figure.add_subplot(2, 2, 4)
-        
-        # Sample data - replace with actual stats
-        languages = ['Spanish', 'French', 'German', 'Chinese', 'Arabic']
-        counts = [45, 32, 28, 22, 18]
-        
-        # Language usage chart
-        ax1.bar(languages, counts)
-        ax1.set_title('Most Translated Languages')
-        ax1.tick_params(axis='x', rotation=45)
-        
-        # Translation speed over time
-        days = list(range(1, 8))
-        speeds = [120, 135, 142, 138, 155, 148, 162]
-        ax2.plot(days, speeds, marker='o')
-        ax2.set_title('Translation Speed (subtitles/min)')
-        ax2.set_xlabel('Days')
-        
-        # Cache hit ratio
-        cache_data = ['Cache Hits', 'Cache Misses']
-        cache_values = [75, 25]
-        ax3.pie(cache_values, labels=cache_data, autopct='%1.1f%%')
-        ax3.set_title('Cache Performance')
-        
-        # File types processed
-        file_types = ['SRT', 'ASS', 'TXT']
-        file_counts = [65, 25, 10]
-        ax4.bar(file_types, file_counts)
-        ax4.set_title('File Types Processed')
-        
-        self.figure.tight_layout()
-        self.canvas.draw()
+    def run(self):
+        self.result.emit(gpu_available())
 
 class UITranslationWorker(QThread):
-    progress = pyqtSignal(str, int, int)  # language, current, total
-    finished = pyqtSignal()
+    """Fetches the UI texts one language is missing and adds them to the UITextCache."""
     
-    def __init__(self):
+    translated = pyqtSignal(str, dict)  # lang_code, all texts known for it
+    
+    def __init__(self, lang_code, cache):
         super().__init__()
+        self.lang_code = lang_code
+        self.cache = cache
         self.should_stop = False
     
     def run(self):
-        languages = list(LANGUAGES.values())
-        total_langs = len(languages)
-        
-        for i, lang_code in enumerate(languages):
-            if self.should_stop:
-                break
-                
-            if lang_code == 'en':  # Skip English
-                continue
-                
-            self.progress.emit(lang_code, i + 1, total_langs)
-            
-            # Check if translations already exist for this language
-            missing_translations = []
-            for key in UI_TEXTS.keys():
-                cache_key = f"{lang_code}_{key}"
-                if cache_key not in TRANSLATED_CACHE:
-                    missing_translations.append(key)
+        texts = self.cache.get(self.lang_code)
+        known = len(texts)
+        missing = [key for key in UI_TEXTS if key not in texts]
+        try:
+            translator = google_translator(source='en', target=self.lang_code)
             
-            if missing_translations:
-                try:
-                    translator = GoogleTranslator(source='en', target=lang_code)
-                    
-                    # Translate in batches
-                    for j in range(0, len(missing_translations), 10):
-                        if self.should_stop:
-                            break
-                            
-                        batch = missing_translations[j:j+10]
-                        texts_to_translate = [UI_TEXTS[key] for key in batch]
-                        
-                        # Batch translate
-                        batch_text = "\n\n\n".join(texts_to_translate)
-                        translated_batch = translator.translate(batch_text)
-                        translations = translated_batch.split("\n\n\n")
-                        
-                        # Store in cache
-                        for k, key in enumerate(batch):
-                            if k < len(translations):
-                                cache_key = f"{lang_code}_{key}"
-                                TRANSLATED_CACHE[cache_key] = translations[k].strip()
-                        
-                        time.sleep(0.1)  # Small delay to avoid rate limiting
-                        
-                except Exception as e:
-                    print(f"Error translating to {lang_code}: {e}")
-                    continue
-        
-        self.finished.emit()
+            # Translate in batches
+            for j in range(0, len(missing), 10):
+                if self.should_stop:
+                    break
+                batch = missing[j:j+10]
+                translations = translator.translate("\n\n\n".join(UI_TEXTS[key] for key in batch)).split("\n\n\n")
+                if len(translations) != len(batch):
+                    # The separators did not survive; translate one by one so texts stay matched to keys
+                    translations = [translator.translate(UI_TEXTS[key]) for key in batch]
+                for key, translation in zip(batch, translations):
+                    if translation and translation.strip():
+                        texts[key] = translation.strip()
+                time.sleep(0.1)  # Small delay to avoid rate limiting
+        except Exception as e:
+            EVENTS.warning('ui', "Could not translate the interface to %s: %s", self.lang_code, e)
+        
+        if len(texts) > known:
+            self.cache.store(self.lang_code, texts)
+        self.translated.emit(self.lang_code, texts)
+    
+    def stop(self):
+        self.should_stop = True
+
+class ReplaceWorker(QThread):
+    progress = pyqtSignal(int, int)  # current, total
+    file_done = pyqtSignal(object)  # bulk_replace.ReplaceResult
+    finished = pyqtSignal(int, int, bool)  # occurrences, files changed, dry run
+    
+    def __init__(self, files, pattern, replacement, dry_run=False):
+        super().__init__()
+        self.files = list(files)
+        self.pattern = pattern
+        self.replacement = replacement
+        self.dry_run = dry_run
+        self.should_stop = False
+    
+    def run(self):
+        total = len(self.files)
+        occurrences = 0
+        changed = 0
+        for i, result in enumerate(bulk_replace.replace_files(self.files, self.pattern, self.replacement, self.dry_run,
+                                                              should_stop=lambda: self.should_stop), 1):
+            occurrences += result.count
+            if result.count:
+                changed += 1
+            self.file_done.emit(result)
+            self.progress.emit(i, total)
+        self.finished.emit(occurrences, changed, self.dry_run)
     
     def stop(self):
         self.should_stop = True
 
+class LogSink(QtCore.QObject):
+    """Buffers log entries and hands them to a widget in batches.
+    
+    Entries go into a ring buffer of max_lines and are flushed at most once
+    per interval_ms. While is_visible() is False nothing is drawn; the buffer
+    just keeps the newest entries until the widget is shown again.
+    """
+    
+    def __init__(self, write_batch, is_visible, max_lines=1000, interval_ms=33, parent=None):
+        super().__init__(parent)
+        self.write_batch = write_batch  # called with (entries, dropped count)
+        self.is_visible = is_visible
+        self.pending = deque(maxlen=max_lines)
+        self.dropped = 0
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.flush)
+    
+    def write(self, entry):
+        if len(self.pending) == self.pending.maxlen:
+            self.dropped += 1
+        self.pending.append(entry)
+        if not self.timer.isActive():
+            self.timer.start()
+    
+    def flush(self):
+        self.timer.stop()
+        if not self.pending or not self.is_visible():
+            return
+        entries = list(self.pending)
+        dropped = self.dropped
+        self.pending.clear()
+        self.dropped = 0
+        self.write_batch(entries, dropped)
+    
+    def clear(self):
+        self.pending.clear()
+        self.dropped = 0
+
+class CueTableModel(QtCore.QAbstractTableModel):
+    """Rows of a CueFile, handed to the view in chunks as it scrolls."""
+    
+    FETCH_SIZE = 200
+    HEADERS = ['#', 'Start', 'End', 'Text']
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.cue_file = None
+        self.loaded = 0
+    
+    def set_file(self, cue_file):
+        self.beginResetModel()
+        self.cue_file = cue_file
+        self.loaded = 0
+        self.endResetModel()
+    
+    def total_rows(self):
+        return len(self.cue_file) if self.cue_file else 0
+    
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else self.loaded
+    
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self.loaded < self.total_rows()
+    
+    def fetchMore(self, parent):
+        count = min(self.FETCH_SIZE, self.total_rows() - self.loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QtCore.QModelIndex(), self.loaded, self.loaded + count - 1)
+        self.loaded += count
+        self.endInsertRows()
+    
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+    
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid() or role not in (QtCore.Qt.DisplayRole, QtCore.Qt.ToolTipRole):
+            return None
+        row, column = index.row(), index.column()
+        if column == 0:
+            return str(row + 1)
+        if column == 1:
+            return format_time(self.cue_file.starts[row])
+        if column == 2:
+            return format_time(self.cue_file.ends[row])
+        text = self.cue_file.text(row)
+        return text if role == QtCore.Qt.ToolTipRole else text.replace('\n', ' / ')
+
+class CueCompareModel(CueTableModel):
+    """Original and translated cues side by side, paired by start time."""
+    
+    HEADERS = ['Start', 'Original', 'Translated']
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.original = None
+        self.translated = None
+        self.pairs = []
+    
+    def set_files(self, original, translated):
+        self.beginResetModel()
+        self.original = original
+        self.translated = translated
+        if original and translated:
+            self.pairs = align_cues(original, translated)
+        elif original or translated:
+            only = original or translated
+            self.pairs = [(i, None) if original else (None, i) for i in range(len(only))]
+        else:
+            self.pairs = []
+        self.loaded = 0
+        self.endResetModel()
+    
+    def total_rows(self):
+        return len(self.pairs)
+    
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        i, j = self.pairs[index.row()]
+        column = index.column()
+        if role == QtCore.Qt.ForegroundRole and column > 0 and (i is None or j is None):
+            return QtGui.QBrush(QtGui.QColor('#e67e22'))  # cue missing on one side
+        if role not in (QtCore.Qt.DisplayRole, QtCore.Qt.ToolTipRole):
+            return None
+        if column == 0:
+            start = self.original.starts[i] if i is not None else self.translated.starts[j]
+            return format_time(start)
+        cue_file, row = (self.original, i) if column == 1 else (self.translated, j)
+        if row is None:
+            return ''
+        text = cue_file.text(row)
+        return text if role == QtCore.Qt.ToolTipRole else text.replace('\n', ' / ')
+
+class LanguageListModel(QtCore.QAbstractListModel):
+    """Checkable rows for every language, drawn by a single list view."""
+    
+    def __init__(self, languages, checked=(), parent=None):
+        super().__init__(parent)
+        self.languages = sorted(languages.items())
+        self.checked = set(checked)
+    
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.languages)
+    
+    def flags(self, index):
+        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsUserCheckable
+    
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        lang, code = self.languages[index.row()]
+        if role == QtCore.Qt.DisplayRole:
+            return f"{lang} ({code})"
+        if role == QtCore.Qt.CheckStateRole:
+            return QtCore.Qt.Checked if lang in self.checked else QtCore.Qt.Unchecked
+        return None
+    
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if not index.isValid() or role != QtCore.Qt.CheckStateRole:
+            return False
+        lang = self.languages[index.row()][0]
+        if value == QtCore.Qt.Checked:
+            self.checked.add(lang)
+        else:
+            self.checked.discard(lang)
+        self.dataChanged.emit(index, index, [role])
+        return True
+    
+    def set_checked(self, languages, checked=True):
+        if checked:
+            self.checked.update(languages)
+        else:
+            self.checked.difference_update(languages)
+        self.refresh()
+    
+    def reset_checked(self, languages):
+        self.checked = set(languages)
+        self.refresh()
+    
+    def refresh(self):
+        if self.languages:
+            self.dataChanged.emit(self.index(0), self.index(len(self.languages) - 1), [QtCore.Qt.CheckStateRole])
+    
+    def checked_languages(self):
+        return {lang: code for lang, code in self.languages if lang in self.checked}
+
 # Flow Layout for language tags
 class FlowLayout(QLayout):
     def __init__(self, parent=None, margin=0, spacing=-1):
@@ -316,18 +502,54 @@ class FlowLayout(QLayout):
         return y + lineHeight - rect.y() + self.margin
 
 class TranslationStats:
+    # Session view over the process-wide metrics registry: values are deltas since reset()
     def __init__(self):
         self.reset()
     
     def reset(self):
-        self.files_processed = 0
-        self.languages_processed = 0
-        self.subtitles_translated = 0
-        self.cache_hits = 0
-        self.cache_misses = 0
+        self._baseline = self._snapshot()
         self.start_time = None
         self.end_time = None
-        self.errors = 0
+    
+    def _snapshot(self):
+        lookups = {'hit': 0, 'miss': 0}
+        for (lang, result), child in metrics.CACHE_LOOKUPS.children():
+            lookups[result] = lookups.get(result, 0) + child.get()
+        return {
+            'files': metrics.FILES_PROCESSED.total(),
+            'languages': metrics.LANGUAGES_PROCESSED.total(),
+            'subtitles': metrics.CUES_TRANSLATED.total(),
+            'cache_hits': lookups['hit'] + lookups.get('shared', 0) + lookups.get('memory', 0),
+            'cache_misses': lookups['miss'],
+            'errors': metrics.TRANSLATION_ERRORS.total(),
+        }
+    
+    def _delta(self, key):
+        return int(self._snapshot()[key] - self._baseline[key])
+    
+    @property
+    def files_processed(self):
+        return self._delta('files')
+    
+    @property
+    def languages_processed(self):
+        return self._delta('languages')
+    
+    @property
+    def subtitles_translated(self):
+        return self._delta('subtitles')
+    
+    @property
+    def cache_hits(self):
+        return self._delta('cache_hits')
+    
+    @property
+    def cache_misses(self):
+        return self._delta('cache_misses')
+    
+    @property
+    def errors(self):
+        return self._delta('errors')
     
     def start_session(self):
         self.start_time = datetime.now()
@@ -369,102 +591,6 @@ class FolderWatcher(QThread):
                     self.processed_files.add(str(file))
                     self.file_detected.emit(str(file))
 
-import pysrt
-import ass
-from deep_translator import GoogleTranslator
-from deep_translator.constants import GOOGLE_LANGUAGES_TO_CODES
-
-
-
-# Offline Translation Models
-class OfflineTranslator:
-    def __init__(self, model_name='marian'):
-        self.model_name = model_name
-        self.models = {}
-        self.tokenizers = {}
-        
-    def get_model_key(self, source_lang, target_lang):
-        if source_lang == 'auto':
-            source_lang = 'en'
-        return f"{source_lang}-{target_lang}"
-    
-    def load_model(self, source_lang, target_lang):
-        if not TRANSFORMERS_AVAILABLE:
-            raise Exception("Transformers library not available")
-            
-        model_key = self.get_model_key(source_lang, target_lang)
-        
-        if model_key in self.models:
-            return self.models[model_key], self.tokenizers[model_key]
-        
-        try:
-            if self.model_name == 'marian':
-                model_name = f"Helsinki-NLP/opus-mt-{source_lang}-{target_lang}"
-                tokenizer = MarianTokenizer.from_pretrained(model_name)
-                model = MarianMTModel.from_pretrained(model_name)
-            else:
-                model = pipeline("translation", model=f"Helsinki-NLP/opus-mt-{source_lang}-{target_lang}")
-                tokenizer = None
-                
-            self.models[model_key] = model
-            self.tokenizers[model_key] = tokenizer
-            return model, tokenizer
-            
-        except Exception as e:
-            raise Exception(f"Model not available for {source_lang}->{target_lang}: {e}")
-    
-    def translate(self, text, target_lang, source_lang='en'):
-        try:
-            model, tokenizer = self.load_model(source_lang, target_lang)
-            
-            if tokenizer:
-                inputs = tokenizer(text, return_tensors="pt", padding=True, truncation=True, max_length=512)
-                translated = model.generate(**inputs)
-                result = tokenizer.decode(translated[0], skip_special_tokens=True)
-            else:
-                result = model(text)[0]['translation_text']
-                
-            return result
-        except Exception as e:
-            return f"[Translation Error: {e}]"
-
-# Translation Services
-class TranslationService:
-    def __init__(self, name, translator_class, is_offline=False):
-        self.name = name
-        self.translator_class = translator_class
-        self.is_offline = is_offline
-    
-    def translate(self, text, target_lang, source_lang='auto'):
-        if self.is_offline:
-            translator = self.translator_class()
-            return translator.translate(text, target_lang, source_lang)
-        else:
-            translator = self.translator_class(source=source_lang, target=target_lang)
-            return translator.translate(text)
-
-TRANSLATION_SERVICES = {
-    'google': TranslationService('Google Translate (Recommended)', GoogleTranslator, False),
-    'marian': TranslationService('Marian MT (Offline)', OfflineTranslator, True) if TRANSFORMERS_AVAILABLE else None,
-    'opus': TranslationService('Opus-MT (Offline)', lambda: OfflineTranslator('opus'), True) if TRANSFORMERS_AVAILABLE else None
-}
-
-# Remove None services
-TRANSLATION_SERVICES = {k: v for k, v in TRANSLATION_SERVICES.items() if v is not None}
-
-# Default languages that are enabled
-DEFAULT_LANGUAGES = {
-    "Spanish": "es", "Dutch": "nl", "Russian": "ru", "German": "de",
-    "Turkish": "tr", "Chinese": "zh-CN", "Japanese": "ja", "Persian": "fa",
-    "Portuguese": "pt", "Arabic": "ar", "Tamil": "ta", "Telugu": "te",
-    "Malayalam": "ml", "Bengali": "bn", "Indonesian": "id", "Filipino": "tl"
-}
-
-# Get all available languages from deep-translator
-LANGUAGES = {name.title(): code for name, code in GOOGLE_LANGUAGES_TO_CODES.items()}
-
-SUPPORTED_FORMATS = ('.srt', '.ass', '.txt')
-
 DARK_STYLE = """
 QMainWindow {
     background-color: #1e1e1e;
@@ -583,229 +709,6 @@ QStatusBar {
 }
 """
 
-class SubtitleTranslator:
-    def __init__(self, dest_lang, stats=None, service='google'):
-        self.dest_lang = dest_lang
-        self.service = service
-        self.cache = self._load_cache()
-        self.batch_size = 50
-        self.stats = stats
-        
-        # Initialize translator based on service
-        if service in TRANSLATION_SERVICES:
-            service_obj = TRANSLATION_SERVICES[service]
-            if service_obj.is_offline:
-                self.translator = service_obj.translator_class()
-                self.is_offline = True
-            else:
-                self.translator = GoogleTranslator(source='auto', target=dest_lang)
-                self.is_offline = False
-        else:
-            self.translator = GoogleTranslator(source='auto', target=dest_lang)
-            self.is_offline = False
-    
-    def _load_cache(self):
-        # Use writable cache location
-        if getattr(sys, 'frozen', False):
-            cache_dir = Path(os.path.expanduser('~')) / 'AppData' / 'Local' / 'SRT_Maker' / 'cache'
-        else:
-            cache_dir = Path('./cache')
-        
-        cache_dir.mkdir(parents=True, exist_ok=True)
-        cache_file = cache_dir / f"cache_{self.dest_lang}.json"
-        
-        if cache_file.exists():
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
-    
-    def _save_cache(self):
-        try:
-            # Use same writable cache location
-            if getattr(sys, 'frozen', False):
-                cache_dir = Path(os.path.expanduser('~')) / 'AppData' / 'Local' / 'SRT_Maker' / 'cache'
-            else:
-                cache_dir = Path('./cache')
-            
-            cache_dir.mkdir(parents=True, exist_ok=True)
-            cache_file = cache_dir / f"cache_{self.dest_lang}.json"
-            
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, ensure_ascii=False)
-        except Exception as e:
-            # Cache errors are less critical, just log them
-            print(f"❌ Error saving cache: {e}")
-    
-    def _get_cache_key(self, text):
-        return hashlib.md5(text.encode()).hexdigest()
-    
-    def translate_batch(self, texts):
-        results = [None] * len(texts)
-        to_translate = []
-        indices = []
-        
-        # Creative header for batch processing
-        print(f"\n{'='*80}")
-        print(f"🌐 TRANSLATION BATCH: {len(texts)} entries → {self.dest_lang}")
-        print(f"{'='*80}")
-        
-        # Phase 1: Cache analysis
-        print(f"\n📊 PHASE 1: CACHE ANALYSIS")
-        print(f"{'─'*50}")
-        
-        cache_hits = 0
-        for i, text in enumerate(texts):
-            if not text.strip():
-                print(f"⚠️  Empty subtitle at position {i} - skipping")
-                results[i] = text
-                continue
-            
-            clean_text = text.split(":")[1].strip() if ":" in text else text
-            cache_key = self._get_cache_key(clean_text)
-            
-            if cache_key in self.cache:
-                cache_hits += 1
-                if self.stats:
-                    self.stats.cache_hits += 1
-                results[i] = self.cache[cache_key]
-                if i % 20 == 0 or i < 3:
-                    print(f"💾 [{i:4d}] Cache hit: \"{clean_text[:30]}{'...' if len(clean_text) > 30 else ''}\"")
-            else:
-                if self.stats:
-                    self.stats.cache_misses += 1
-                to_translate.append(clean_text)
-                indices.append(i)
-        
-        # Cache statistics
-        if texts:
-            cache_ratio = cache_hits/len(texts)*100
-            print(f"\n📈 Cache efficiency: {cache_hits}/{len(texts)} entries ({cache_ratio:.1f}%)")
-            
-            if cache_ratio == 100:
-                print("✨ PERFECT CACHE HIT! No translation needed.")
-            elif cache_ratio > 80:
-                print("🚀 EXCELLENT CACHE PERFORMANCE!")
-            elif cache_ratio > 50:
-                print("👍 GOOD CACHE PERFORMANCE!")
-            elif cache_ratio > 20:
-                print("🔍 MODERATE CACHE UTILIZATION")
-            else:
-                print("🆕 MOSTLY NEW CONTENT")
-        
-        # Phase 2: Translation
-        if to_translate:
-            print(f"\n🔄 PHASE 2: TRANSLATION")
-            print(f"{'─'*50}")
-            print(f"📦 Need to translate {len(to_translate)} entries")
-            
-            for retry in range(3):
-                try:
-                    print(f"\n🚀 ATTEMPT {retry + 1} {'='*30}")
-                    batch_text = "\n\n\n".join(to_translate)
-                    print(f"📤 Sending batch to Google Translate API...")
-                    
-                    # Show a simple spinner
-                    start_time = time.time()
-                    translated_batch = self.translator.translate(batch_text)
-                    elapsed = time.time() - start_time
-                    
-                    print(f"📥 Response received in {elapsed:.2f}s")
-                    translations = translated_batch.split("\n\n\n")
-                    
-                    if len(translations) != len(to_translate):
-                        print(f"\n⚠️  SPLIT MISMATCH DETECTED!")
-                        print(f"┌─ Expected: {len(to_translate)} segments")
-                        print(f"└─ Received: {len(translations)} segments")
-                        print(f"\n♻️  Switching to individual translation mode...")
-                        
-                        translations = []
-                        for i, text in enumerate(to_translate):
-                            print(f"   • Translating item {i+1}/{len(to_translate)}...", end="\r")
-                            translations.append(self.translator.translate(text))
-                        print("\n✅ Individual translations completed!")
-                    else:
-                        print(f"✅ Batch translation successful!")
-                    
-                    # Phase 3: Saving results
-                    print(f"\n💾 PHASE 3: SAVING RESULTS")
-                    print(f"{'─'*50}")
-                    
-                    for i, (idx, translation) in enumerate(zip(indices, translations)):
-                        clean_translation = translation.strip()
-                        # Fix escaped newlines and other common issues
-                        clean_translation = clean_translation.replace('\\n', '\n').replace('\\r', '\r')
-                        clean_translation = clean_translation.replace('\\t', '\t')
-                        results[idx] = clean_translation
-                        cache_key = self._get_cache_key(to_translate[i])
-                        self.cache[cache_key] = clean_translation
-                        
-                        # Show sample translations (first 3 and last 1)
-                        if i < 3 or i == len(indices) - 1:
-                            src_preview = to_translate[i][:30] + ('...' if len(to_translate[i]) > 30 else '')
-                            tgt_preview = clean_translation[:30] + ('...' if len(clean_translation) > 30 else '')
-                            print(f"   • \"{src_preview}\" → \"{tgt_preview}\"")
-                        elif i == 3 and len(indices) > 4:
-                            print(f"   • ... {len(indices) - 4} more translations ...")
-                    
-                    print(f"\n🎉 TRANSLATION COMPLETE!")
-                    break
-                    
-                except Exception as e:
-                    print(f"\n❌ ERROR: Translation failed (attempt {retry + 1})")
-                    print(f"   {str(e)}")
-                    
-                    if retry < 2:
-                        wait_time = 2 ** retry
-                        print(f"⏱️  Waiting {wait_time}s before retry...")
-                        time.sleep(wait_time)
-                    else:
-                        print("❌ All attempts failed! Using original text.")
-                        for i, idx in enumerate(indices):
-                            results[idx] = to_translate[i]
-        
-        print(f"\n{'='*80}")
-        return results
-    
-    def translate(self, text):
-        print(f"\n{'='*80}")
-        print(f"🔤 SINGLE TEXT TRANSLATION → {self.dest_lang}")
-        print(f"{'='*80}")
-        
-        for retry in range(3):
-            try:
-                print(f"🔄 Attempt {retry + 1}: Translating text...")
-                start_time = time.time()
-                
-                if self.is_offline:
-                    result = self.translator.translate(text, self.dest_lang, 'en')
-                else:
-                    result = self.translator.translate(text)
-                
-                # Fix escaped newlines and other common issues
-                result = result.replace('\\n', '\n').replace('\\r', '\r').replace('\\t', '\t')
-                    
-                elapsed = time.time() - start_time
-                
-                print(f"✅ Translation successful in {elapsed:.2f}s!")
-                print(f"📝 Original: \"{text[:50]}{'...' if len(text) > 50 else ''}\"")
-                print(f"🌐 Result:   \"{result[:50]}{'...' if len(result) > 50 else ''}\"")
-                print(f"{'='*80}")
-                return result
-                
-            except Exception as e:
-                print(f"❌ Translation error (attempt {retry + 1}): {e}")
-                if retry < 2:
-                    wait_time = 2 ** retry
-                    print(f"⏱️  Waiting {wait_time}s before retry...")
-                    time.sleep(wait_time)
-        
-        print(f"⚠️  All translation attempts failed, returning original text")
-        print(f"{'='*80}")
-        return text
-
 class TranslationWorker(QThread):
     progress = pyqtSignal(str)
     file_progress = pyqtSignal(int, int)  # current, total
@@ -815,22 +718,31 @@ class TranslationWorker(QThread):
     error = pyqtSignal(str)
     stopped = pyqtSignal()
     
-    def __init__(self, files, languages, settings, stats=None):
+    def __init__(self, files, languages, settings, stats=None, job_queue=None, jobs=None, pack_files=None):
         super().__init__()
         self.files = files
+        self.pack_files = pack_files or files  # files whose lines are packed into shared requests first
         self.languages = languages
         self.settings = settings
-        self.stats = stats
         self.is_stopped = False
+        self.processor = FileProcessor(languages, settings, stats, job_queue, jobs,
+                                       on_progress=self.progress.emit,
+                                       on_language_progress=self.language_progress.emit,
+                                       on_subtitle_progress=self.subtitle_progress.emit,
+                                       should_stop=lambda: self.is_stopped)
     
     def run(self):
         try:
+            # One set of translators for the whole run, so each cache is loaded once
+            translators = self.processor.create_translators()
+            if len(self.pack_files) > 1:
+                self.processor.prepare_series(self.pack_files, translators)
             for i, file_path in enumerate(self.files):
                 if self.is_stopped:
                     self.stopped.emit()
                     return
                 self.file_progress.emit(i + 1, len(self.files))
-                self.process_file(file_path, len(self.files), i)
+                self.processor.process_file(file_path, len(self.files), i, translators)
             if not self.is_stopped:
                 self.finished.emit()
         except Exception as e:
@@ -839,173 +751,10 @@ class TranslationWorker(QThread):
     
     def stop(self):
         self.is_stopped = True
-    
-    def process_file(self, file_path, total_files, current_index):
-        path = Path(file_path)
-        
-        # Create output folder based on settings
-        if self.settings.get('organize_by_file', True):
-            output_folder = path.parent / path.stem
-        else:
-            output_folder = path.parent / "translated_subtitles"
-        
-        output_folder.mkdir(exist_ok=True)
-        
-        self.progress.emit(f"📁 Processing: {path.name} ({current_index + 1}/{total_files})")
-        
-        service = self.settings.get('translation_service', 'google')
-        translators = {lang_code: SubtitleTranslator(lang_code, self.stats, service) 
-                      for lang_code in self.languages.values()}
-        
-        if self.stats:
-            self.stats.files_processed += 1
-        
-        for i, (language, lang_code) in enumerate(self.languages.items()):
-            if self.is_stopped:
-                return
-            
-            self.language_progress.emit(i + 1, len(self.languages))
-            
-            # Generate custom filename
-            naming_template = self.settings.get('output_naming', '{filename}_{language}')
-            filename = naming_template.format(
-                filename=path.stem,
-                language=language,
-                date=datetime.now().strftime('%Y%m%d'),
-                time=datetime.now().strftime('%H%M%S')
-            )
-            
-            if self.settings.get('organize_by_file', True):
-                output_file = output_folder / f"{filename}.srt"
-            else:
-                output_file = output_folder / f"{filename}.srt"
-            
-            if output_file.exists() and not self.settings.get('overwrite_existing', False):
-                self.progress.emit(f"⏭️ {language} already exists, skipping...")
-                continue
-            
-            try:
-                translator = translators[lang_code]
-                ext = path.suffix.lower()
-                
-                if ext == '.srt' or (ext == '.txt' and self.is_srt_format(file_path)):
-                    self.translate_srt(file_path, output_file, translator)
-                elif ext == '.ass':
-                    self.translate_ass_to_srt(file_path, output_file, translator)
-                elif ext == '.txt':
-                    self.translate_plain_txt(file_path, output_file, translator)
-                
-                if not self.is_stopped:
-                    if self.stats:
-                        self.stats.languages_processed += 1
-                    self.progress.emit(f"✅ {language} completed!")
-                
-            except Exception as e:
-                if not self.is_stopped:
-                    if self.stats:
-                        self.stats.errors += 1
-                    print(f"❌ Error processing {language}: {e}")
-                    self.progress.emit(f"❌ {language} failed: {str(e)}")
-        
-        if not self.is_stopped:
-            # Create copy with colons removed and move copy instead of original
-            try:
-                if self.settings.get('organize_by_file', True):
-                    # Read original file
-                    with open(path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    # Remove colons from content
-                    modified_content = '\n'.join(
-                        line.split(':', 1)[1].strip() if ':' in line else line 
-                        for line in content.split('\n')
-                    )
-                    
-                    # Create modified copy
-                    modified_file = output_folder / path.name
-                    with open(modified_file, 'w', encoding='utf-8') as f:
-                        f.write(modified_content)
-                    
-                    print(f"📎 Created modified copy (no colons) at: {modified_file}")
-            except Exception as e:
-                print(f"⚠️ Could not create modified copy: {e}")
-            
-            self.progress.emit(f"🎉 Completed: {path.name} (original preserved)")
-    
-    def translate_srt(self, input_file, output_file, translator):
-        subs = pysrt.open(input_file)
-        texts = [sub.text for sub in subs]
-        
-        for i in range(0, len(texts), translator.batch_size):
-            if self.is_stopped:
-                return
-                
-            batch = texts[i:i+translator.batch_size]
-            translations = translator.translate_batch(batch)
-            
-            for j, translation in enumerate(translations):
-                subs[i+j].text = translation
-                if self.stats:
-                    self.stats.subtitles_translated += 1
-            
-            progress = min(i+translator.batch_size, len(subs))
-            self.subtitle_progress.emit(progress, len(subs))
-            print(f"📝 Processed {progress}/{len(subs)} subtitles")
-        
-        if not self.is_stopped:
-            translator._save_cache()
-            encoding = self.settings.get('output_encoding', 'utf-8')
-            subs.save(output_file, encoding=encoding)
-    
-    def translate_ass_to_srt(self, input_file, output_file, translator):
-        with open(input_file, "r", encoding="utf-8-sig") as f:
-            doc = ass.parse(f)
-        
-        texts = [event.text for event in doc.events]
-        subs = pysrt.SubRipFile()
-        
-        for i in range(0, len(texts), translator.batch_size):
-            if self.is_stopped:
-                return
-                
-            batch = texts[i:i+translator.batch_size]
-            translations = translator.translate_batch(batch)
-            
-            for j, translation in enumerate(translations):
-                event = doc.events[i+j]
-                start = pysrt.SubRipTime.from_ordinal(event.start.total_seconds() * 1000)
-                end = pysrt.SubRipTime.from_ordinal(event.end.total_seconds() * 1000)
-                subs.append(pysrt.SubRipItem(i+j+1, start, end, translation))
-            
-            progress = min(i+translator.batch_size, len(doc.events))
-            self.subtitle_progress.emit(progress, len(doc.events))
-            print(f"📝 Processed {progress}/{len(doc.events)} events")
-        
-        if not self.is_stopped:
-            translator._save_cache()
-            encoding = self.settings.get('output_encoding', 'utf-8')
-            subs.save(output_file, encoding=encoding)
-    
-    def translate_plain_txt(self, input_file, output_file, translator):
-        with open(input_file, "r", encoding="utf-8") as f:
-            text = f.read()
-        
-        translated = translator.translate(text)
-        translator._save_cache()
-        subs = pysrt.SubRipFile([pysrt.SubRipItem(1, 
-            pysrt.SubRipTime(0,0,0,0), pysrt.SubRipTime(0,0,10,0), translated)])
-        encoding = self.settings.get('output_encoding', 'utf-8')
-        subs.save(output_file, encoding=encoding)
-    
-    def is_srt_format(self, file_path):
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                lines = [f.readline().strip() for _ in range(3)]
-            return lines[0].isdigit() and '-->' in lines[1]
-        except:
-            return False
 
 class SubtitleTranslatorGUI(QMainWindow):
+    event_logged = pyqtSignal(str)  # warnings and errors from the event stream, any thread
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("🎬 Subtitle Translator Pro")
@@ -1015,22 +764,35 @@ class SubtitleTranslatorGUI(QMainWindow):
         
         self.worker = None
         self.enabled_languages = {}
-        self.settings = self.load_settings()
+        self.settings_store = SettingsStore()
+        self.settings = self.settings_store.load()
         self.stats = TranslationStats()
         self.folder_watchers = []
         self.watch_folders = self.settings.get('watchlist', [])
-        self.watch_queue = []
+        self.job_queue = JobQueue(max_retries=self.settings.get('retry_count', 3))
+        self.recovered_jobs = self.job_queue.recover()
+        self.job_queue.export_metrics()
+        metrics.CACHE_BYTES.set_function(self.get_cache_size)
+        # Keeps the translation cache within its size limits while the app runs
+        self.cache_evictor = CacheEvictor()
+        self.apply_cache_limits()
+        self.cache_evictor.start()
+        self.metrics_server = None
+        self.start_metrics_server()
+        self.history = TimeSeriesStore()
+        self.search_index = SearchIndex()
+        self.replace_worker = None
+        self.run_recorder = RunRecorder()
+        self.active_jobs = {}  # lang_code -> (job id, language) for the running queue item
+        self.pack_files = []  # queued files pre-translated along with the running queue item
+        self.packed_files = set()  # queued files whose lines an earlier run already pre-translated
         self.recent_files = self.settings.get('recent_files', [])
         self.profiles = self.settings.get('profiles', {})
         self.ui_language = self.settings.get('ui_language', 'en')
-        
-
-        
-        # Start background UI translation worker
-        self.ui_translator = UITranslationWorker()
-        self.ui_translator.progress.connect(self.on_translation_progress)
-        self.ui_translator.finished.connect(self.on_translation_finished)
-        self.ui_translator.start()
+        self.ui_text_cache = UITextCache()
+        self.ui_texts = {}  # translations for ui_language; tr() falls back to English
+        self.ui_translator = None
+        self.ui_refetch = False  # the running UI translator was stopped for a language switch
         
         self.setup_ui()
         self.setup_status_bar()
@@ -1047,22 +809,38 @@ class SubtitleTranslatorGUI(QMainWindow):
             self.restoreGeometry(QtCore.QByteArray.fromHex(self.settings['layout_state'].encode()))
     
     def tr(self, key):
-        if self.ui_language == 'en':
-            return UI_TEXTS.get(key, key)
-        
-        # Check cache first
-        cache_key = f"{self.ui_language}_{key}"
-        if cache_key in TRANSLATED_CACHE:
-            return TRANSLATED_CACHE[cache_key]
-        
-        # Translate using Google Translate
-        try:
-            translator = GoogleTranslator(source='en', target=self.ui_language)
-            translated = translator.translate(UI_TEXTS.get(key, key))
-            TRANSLATED_CACHE[cache_key] = translated
-            return translated
-        except:
-            return UI_TEXTS.get(key, key)
+        # Never touches the network; texts not fetched yet are shown in English
+        return self.ui_texts.get(key) or UI_TEXTS.get(key, key)
+    
+    def set_ui_language(self, lang_code):
+        self.ui_language = lang_code
+        self.ui_texts = {} if lang_code == 'en' else self.ui_text_cache.get(lang_code)
+        self.refresh_ui_texts()
+        if lang_code != 'en' and len(self.ui_texts) < len(UI_TEXTS):
+            self.fetch_ui_texts()
+    
+    def fetch_ui_texts(self):
+        if self.ui_translator and self.ui_translator.isRunning():
+            # on_ui_translator_finished starts over for the newly selected language
+            self.ui_translator.stop()
+            self.ui_refetch = True
+            return
+        self.ui_translator = UITranslationWorker(self.ui_language, self.ui_text_cache)
+        self.ui_translator.translated.connect(self.on_ui_texts_fetched)
+        self.ui_translator.finished.connect(self.on_ui_translator_finished)
+        self.ui_translator.start()
+        self.status_bar.showMessage(f"Translating interface to {self.ui_language}...")
+    
+    def on_ui_texts_fetched(self, lang_code, texts):
+        if lang_code == self.ui_language:
+            self.ui_texts = texts
+            self.refresh_ui_texts()
+    
+    def on_ui_translator_finished(self):
+        # A switch may have come back to the language being fetched (A -> B -> A); that fetch was cut short too
+        refetch, self.ui_refetch = self.ui_refetch, False
+        if refetch and self.ui_language != 'en' and len(self.ui_texts) < len(UI_TEXTS):
+            self.fetch_ui_texts()
     
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls():
@@ -1133,20 +911,8 @@ class SubtitleTranslatorGUI(QMainWindow):
         self.save_settings()
     
     def save_settings(self):
-        try:
-            with open(self.settings_file, 'w') as f:
-                json.dump(self.settings, f, indent=4)
-        except Exception as e:
-            # Try fallback location
-            try:
-                fallback_file = Path(os.path.expanduser('~')) / 'SRT_Maker_settings.json'
-                with open(fallback_file, 'w') as f:
-                    json.dump(self.settings, f, indent=4)
-                self.settings_file = fallback_file
-                self.status_bar.showMessage(f"Settings saved to: {fallback_file.name}")
-            except Exception as e2:
-                QMessageBox.critical(self, "Settings Error", f"Failed to save settings:\n{str(e2)}")
-                self.status_bar.showMessage("Failed to save settings")
+        # Coalesced with other changes made in the next half second into a single write
+        self.settings_store.save()
     
     def save_profiles(self):
         self.settings['profiles'] = self.profiles
@@ -1158,7 +924,8 @@ class SubtitleTranslatorGUI(QMainWindow):
             self.profiles[name] = dict(self.enabled_languages)
             self.save_profiles()
             self.update_profile_menu()
-            self.update_profile_combo()
+            if self.tab_built(self.settings_tab):
+                self.update_profile_combo()
     
     def load_profile(self, name):
         if name in self.profiles:
@@ -1198,28 +965,37 @@ class SubtitleTranslatorGUI(QMainWindow):
         main_layout = QVBoxLayout(central_widget)
         main_layout.addWidget(self.tab_widget)
         
-        # Setup main tab
+        # Main and Watch are needed right away (queue, activity log, auto-start watching)
         self.setup_main_tab()
+        self.setup_watch_tab()
         
-        # Setup settings tab
-        self.setup_settings_tab()
-        
-        # Setup about tab
-        self.setup_about_tab()
+        # The other tabs are built the first time they are opened
+        self.tab_builders = {
+            self.settings_tab: self.setup_settings_tab,
+            self.about_tab: self.setup_about_tab,
+            self.preview_tab: self.setup_preview_tab,
+            self.stats_tab: self.setup_stats_tab,
+            self.compare_tab: self.setup_compare_tab,
+            self.find_replace_tab: self.setup_find_replace_tab,
+            self.dashboard_tab: self.setup_dashboard_tab,
+        }
         
-        # Setup new tabs
-        self.setup_preview_tab()
-        self.setup_watch_tab()
-        self.setup_stats_tab()
-        self.setup_compare_tab()
-        self.setup_find_replace_tab()
-        self.setup_dashboard_tab()
+        # Logs are drawn in batches at ~30fps, and not at all while their tab is hidden
+        self.progress_log = LogSink(self.write_progress_lines, self.log_text.isVisible, max_lines=self.MAX_LOG_LINES, parent=self)
+        self.activity_log = LogSink(self.write_activity_entries, self.watch_log.isVisible, max_lines=self.MAX_ACTIVITY_ENTRIES, parent=self)
+        self.tab_widget.currentChanged.connect(self.flush_logs)
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
+        self.event_logged.connect(self.update_progress)
+        self.event_sink = EVENTS.add_sink(CallbackSink(lambda event: self.event_logged.emit(f"⚠️ {event.message}"), WARNING))
         
         # Auto-start watching if folders exist
         QTimer.singleShot(500, self.auto_start_watching)
         
-        # Apply initial UI translations
-        QTimer.singleShot(100, self.refresh_ui_texts)
+        # Resume jobs left in the queue by the previous session
+        QTimer.singleShot(1500, self.resume_queued_jobs)
+        
+        # Apply cached UI translations, fetching any that are missing in the background
+        QTimer.singleShot(100, lambda: self.set_ui_language(self.ui_language))
     
     def setup_status_bar(self):
         self.status_bar = QStatusBar()
@@ -1275,6 +1051,18 @@ class SubtitleTranslatorGUI(QMainWindow):
         clear_cache_action.triggered.connect(self.clear_cache)
         tools_menu.addAction(clear_cache_action)
         
+        export_cache_action = QAction("Export Cache...", self)
+        export_cache_action.triggered.connect(self.export_cache)
+        tools_menu.addAction(export_cache_action)
+        
+        import_cache_action = QAction("Import Cache...", self)
+        import_cache_action.triggered.connect(self.import_cache)
+        tools_menu.addAction(import_cache_action)
+        
+        rebuild_cache_action = QAction("Rebuild Cache from Outputs...", self)
+        rebuild_cache_action.triggered.connect(self.rebuild_cache)
+        tools_menu.addAction(rebuild_cache_action)
+        
         # Help menu
         help_menu = menu_bar.addMenu("Help")
         
@@ -1377,6 +1165,7 @@ class SubtitleTranslatorGUI(QMainWindow):
         
         self.log_text = QTextEdit()
         self.log_text.setMaximumHeight(200)
+        self.log_text.document().setMaximumBlockCount(self.MAX_LOG_LINES)
         self.log_text.setPlaceholderText("Translation logs will appear here...")
         progress_layout.addWidget(self.log_text)
         
@@ -1458,29 +1247,16 @@ class SubtitleTranslatorGUI(QMainWindow):
         self.update_profile_combo()
         lang_settings_layout.addLayout(profile_layout)
         
-        # Scroll area for languages
-        lang_scroll = QScrollArea()
-        lang_scroll.setWidgetResizable(True)
-        lang_scroll_content = QWidget()
-        self.settings_lang_layout = QVBoxLayout(lang_scroll_content)
-        
-        # Create checkboxes for all available languages
-        self.settings_lang_checkboxes = {}
-        
-        # Sort languages alphabetically
-        sorted_languages = sorted(LANGUAGES.items())
-        
-        for lang, code in sorted_languages:
-            checkbox = QCheckBox(f"{lang} ({code})")
-            # Check if this language is in enabled languages
-            checkbox.setChecked(lang in self.enabled_languages)
-            self.settings_lang_checkboxes[lang] = checkbox
-            self.settings_lang_layout.addWidget(checkbox)
-        
-        lang_scroll_content.setLayout(self.settings_lang_layout)
-        lang_scroll.setWidget(lang_scroll_content)
-        lang_scroll.setMinimumHeight(300)
-        lang_settings_layout.addWidget(lang_scroll)
+        # Languages sorted alphabetically, checked when enabled; the view only draws visible rows
+        self.settings_lang_model = LanguageListModel(LANGUAGES, self.enabled_languages, self)
+        self.settings_lang_filter = QtCore.QSortFilterProxyModel(self)
+        self.settings_lang_filter.setSourceModel(self.settings_lang_model)
+        self.settings_lang_filter.setFilterCaseSensitivity(QtCore.Qt.CaseInsensitive)
+        self.settings_lang_view = QListView()
+        self.settings_lang_view.setModel(self.settings_lang_filter)
+        self.settings_lang_view.setUniformItemSizes(True)
+        self.settings_lang_view.setMinimumHeight(300)
+        lang_settings_layout.addWidget(self.settings_lang_view)
         
         scroll_layout.addWidget(lang_settings_group)
         
@@ -1558,18 +1334,20 @@ class SubtitleTranslatorGUI(QMainWindow):
         gpu_layout = QHBoxLayout()
         self.use_gpu = QCheckBox("Use GPU Acceleration (if available)")
         self.use_gpu.setChecked(self.settings.get('use_gpu', False))
-        self.use_gpu.setEnabled(GPU_AVAILABLE)
+        self.use_gpu.setEnabled(False)
         gpu_layout.addWidget(self.use_gpu)
         
-        # GPU status indicator
-        gpu_status = QLabel()
-        if GPU_AVAILABLE:
-            gpu_status.setText("🟢 Running on GPU")
-            gpu_status.setStyleSheet("color: #14a085; font-weight: bold;")
+        # GPU status indicator; importing torch takes seconds, so CUDA is probed in the background
+        self.gpu_status = QLabel()
+        gpu_layout.addWidget(self.gpu_status)
+        if torch_installed():
+            self.gpu_status.setText("⏳ Checking GPU...")
+            self.gpu_status.setStyleSheet("color: #888; font-weight: bold;")
+            self.gpu_probe = GpuProbe()
+            self.gpu_probe.result.connect(self.set_gpu_status)
+            QTimer.singleShot(2000, self.gpu_probe.start)
         else:
-            gpu_status.setText("🔴 GPU not available")
-            gpu_status.setStyleSheet("color: #d32f2f; font-weight: bold;")
-        gpu_layout.addWidget(gpu_status)
+            self.set_gpu_status(False)
         
         advanced_translation_layout.addLayout(gpu_layout)
         
@@ -1589,10 +1367,75 @@ class SubtitleTranslatorGUI(QMainWindow):
         self.enable_cache.setChecked(self.settings.get('enable_cache', True))
         cache_settings_layout.addWidget(self.enable_cache)
         
-        # Clear cache button
+        # Translation memory
+        memory_layout = QHBoxLayout()
+        self.translation_memory = QCheckBox("Reuse translations of near-identical lines")
+        self.translation_memory.setChecked(self.settings.get('translation_memory', True))
+        memory_layout.addWidget(self.translation_memory)
+        memory_layout.addWidget(QLabel("Minimum similarity:"))
+        self.memory_threshold = QSpinBox()
+        self.memory_threshold.setRange(50, 100)
+        self.memory_threshold.setSuffix("%")
+        self.memory_threshold.setValue(round(self.settings.get('memory_threshold', 0.9) * 100))
+        self.memory_threshold.setToolTip("100% only matches lines that differ in case or spacing")
+        memory_layout.addWidget(self.memory_threshold)
+        cache_settings_layout.addLayout(memory_layout)
+        
+        # Size limits
+        limits_layout = QHBoxLayout()
+        limits_layout.addWidget(QLabel("Size limit:"))
+        self.cache_max_mb = QSpinBox()
+        self.cache_max_mb.setRange(0, 100000)
+        self.cache_max_mb.setSuffix(" MB")
+        self.cache_max_mb.setSpecialValueText("Unlimited")
+        self.cache_max_mb.setValue(self.settings.get('cache_max_mb', 500))
+        limits_layout.addWidget(self.cache_max_mb)
+        limits_layout.addWidget(QLabel("Per language:"))
+        self.cache_language_max_mb = QSpinBox()
+        self.cache_language_max_mb.setRange(0, 100000)
+        self.cache_language_max_mb.setSuffix(" MB")
+        self.cache_language_max_mb.setSpecialValueText("Unlimited")
+        self.cache_language_max_mb.setValue(self.settings.get('cache_language_max_mb', 100))
+        limits_layout.addWidget(self.cache_language_max_mb)
+        limits_layout.addWidget(QLabel("Remove first:"))
+        self.cache_policy = QComboBox()
+        self.cache_policy.addItem("Least recently used", 'lru')
+        self.cache_policy.addItem("Least frequently used", 'lfu')
+        self.cache_policy.setCurrentIndex(max(0, self.cache_policy.findData(self.settings.get('cache_policy', 'lru'))))
+        limits_layout.addWidget(self.cache_policy)
+        cache_settings_layout.addLayout(limits_layout)
+        
+        # Shared cache server
+        server_layout = QHBoxLayout()
+        server_layout.addWidget(QLabel("Shared cache server:"))
+        self.cache_server = QLineEdit(self.settings.get('cache_server', ''))
+        self.cache_server.setPlaceholderText("http://host:8765 (empty = this machine only)")
+        self.cache_server.setToolTip("Workstations using the same server translate each line only once; "
+                                     "start it with cache_server.py")
+        server_layout.addWidget(self.cache_server)
+        server_layout.addWidget(QLabel("Token:"))
+        self.cache_server_token = QLineEdit(self.settings.get('cache_server_token', ''))
+        self.cache_server_token.setEchoMode(QLineEdit.Password)
+        server_layout.addWidget(self.cache_server_token)
+        test_server_btn = QPushButton("Test")
+        test_server_btn.clicked.connect(self.test_cache_server)
+        server_layout.addWidget(test_server_btn)
+        cache_settings_layout.addLayout(server_layout)
+        
+        # Cache buttons
+        cache_buttons_layout = QHBoxLayout()
         self.clear_cache_btn = QPushButton("🗑️ Clear Cache")
         self.clear_cache_btn.clicked.connect(self.clear_cache)
-        cache_settings_layout.addWidget(self.clear_cache_btn)
+        cache_buttons_layout.addWidget(self.clear_cache_btn)
+        export_cache_btn = QPushButton("📤 Export...")
+        export_cache_btn.setToolTip("Save the caches to a bundle for another machine")
+        export_cache_btn.clicked.connect(self.export_cache)
+        cache_buttons_layout.addWidget(export_cache_btn)
+        import_cache_btn = QPushButton("📥 Import...")
+        import_cache_btn.setToolTip("Merge a cache bundle or TMX file into the caches")
+        import_cache_btn.clicked.connect(self.import_cache)
+        cache_buttons_layout.addWidget(import_cache_btn)
+        cache_settings_layout.addLayout(cache_buttons_layout)
         
         # Cache info
         self.cache_info = QLabel("Cache size: Calculating...")
@@ -1601,6 +1444,37 @@ class SubtitleTranslatorGUI(QMainWindow):
         
         scroll_layout.addWidget(cache_settings_group)
         
+        # Monitoring Settings
+        monitoring_group = QGroupBox("📡 Monitoring")
+        monitoring_layout = QVBoxLayout(monitoring_group)
+        
+        metrics_layout = QHBoxLayout()
+        metrics_layout.addWidget(QLabel("Metrics endpoint port (0 = disabled):"))
+        self.metrics_port = QSpinBox()
+        self.metrics_port.setMinimum(0)
+        self.metrics_port.setMaximum(65535)
+        self.metrics_port.setValue(self.settings.get('metrics_port', 0))
+        metrics_layout.addWidget(self.metrics_port)
+        monitoring_layout.addLayout(metrics_layout)
+        
+        metrics_note = QLabel("Serves Prometheus metrics at http://127.0.0.1:<port>/metrics")
+        metrics_note.setStyleSheet("color: #888; font-style: italic;")
+        monitoring_layout.addWidget(metrics_note)
+        
+        profiling_layout = QHBoxLayout()
+        profiling_layout.addWidget(QLabel("Profile translation runs:"))
+        self.profiling = QComboBox()
+        self.profiling.addItem("Off", 'off')
+        self.profiling.addItem("Stage timers", 'stages')
+        self.profiling.addItem("Stage timers + sampling profiler", 'sample')
+        self.profiling.setCurrentIndex(max(0, self.profiling.findData(self.settings.get('profiling', 'off'))))
+        self.profiling.setToolTip("Writes a per-stage breakdown, and with sampling a flame graph file, "
+                                  "to the profiles folder after each run")
+        profiling_layout.addWidget(self.profiling)
+        monitoring_layout.addLayout(profiling_layout)
+        
+        scroll_layout.addWidget(monitoring_group)
+        
         # UI Settings
         ui_settings_group = QGroupBox("🌍 UI Settings")
         ui_settings_layout = QVBoxLayout(ui_settings_group)
@@ -1764,10 +1638,27 @@ class SubtitleTranslatorGUI(QMainWindow):
         file_layout.addWidget(self.preview_file_combo)
         layout.addLayout(file_layout)
         
-        # Preview text area
-        self.preview_text = QTextEdit()
-        self.preview_text.setReadOnly(True)
-        layout.addWidget(self.preview_text)
+        self.preview_info = QLabel()
+        layout.addWidget(self.preview_info)
+        
+        # Cue table, rows are read from disk as they scroll into view
+        self.preview_model = CueTableModel(self)
+        self.preview_view = self.create_cue_view(self.preview_model)
+        layout.addWidget(self.preview_view)
+        self.update_preview_files()
+    
+    def create_cue_view(self, model):
+        view = QTableView()
+        view.setModel(model)
+        view.setWordWrap(False)
+        view.setAlternatingRowColors(True)
+        view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        view.verticalHeader().hide()
+        # Fixed row heights keep scrolling independent of the row count
+        view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        view.verticalHeader().setDefaultSectionSize(24)
+        view.horizontalHeader().setStretchLastSection(True)
+        return view
     
     def setup_watch_tab(self):
         layout = QVBoxLayout(self.watch_tab)
@@ -1844,7 +1735,7 @@ class SubtitleTranslatorGUI(QMainWindow):
         control_layout.addWidget(self.auto_translate_cb)
         
         # Queue info
-        self.queue_label = QLabel("Queue: 0 files")
+        self.queue_label = QLabel(f"Queue: {self.job_queue.pending_file_count()} files")
         self.queue_label.setStyleSheet("color: #888;")
         control_layout.addWidget(self.queue_label)
         
@@ -1913,7 +1804,11 @@ class SubtitleTranslatorGUI(QMainWindow):
             'subtitles': QLabel("Subtitles translated: 0"),
             'cache_ratio': QLabel("Cache hit ratio: 0%"),
             'duration': QLabel("Duration: 0s"),
-            'errors': QLabel("Errors: 0")
+            'errors': QLabel("Errors: 0"),
+            'latency': QLabel("Request latency: p50 0.00s / p95 0.00s"),
+            'request_chars': QLabel("Average request size: 0 chars"),
+            'throughput': QLabel("Throughput: -"),
+            'model_load': QLabel("Model load time: -")
         }
         
         for label in self.stats_labels.values():
@@ -1927,6 +1822,7 @@ class SubtitleTranslatorGUI(QMainWindow):
         layout.addWidget(reset_btn)
         
         layout.addStretch()
+        self.update_stats_display()
     
     def select_single_file(self):
         try:
@@ -1988,63 +1884,30 @@ class SubtitleTranslatorGUI(QMainWindow):
         # Return all enabled languages since we process all of them
         return self.enabled_languages
     
-    def load_settings(self):
-        # Use AppData directory for settings in installed version
-        if getattr(sys, 'frozen', False):
-            # Running as executable
-            settings_dir = Path(os.path.expanduser('~')) / 'AppData' / 'Local' / 'SRT_Maker'
-            settings_dir.mkdir(parents=True, exist_ok=True)
-            settings_file = settings_dir / 'settings.json'
+    def report_startup_time(self):
+        elapsed = time.perf_counter() - STARTUP_TIME
+        metrics.STARTUP_SECONDS.set(elapsed)
+        EVENTS.info('startup', "First window shown %.0f ms after start", elapsed * 1000)
+        if os.environ.get('SRT_MAKER_STARTUP_PROBE'):
+            # benchmark.py --startup reads this line and times the process from spawn
+            print(json.dumps({'startup_seconds': elapsed}), flush=True)
+            QApplication.instance().quit()
+    
+    def set_gpu_status(self, available):
+        self.use_gpu.setEnabled(available)
+        if available:
+            self.gpu_status.setText("🟢 Running on GPU")
+            self.gpu_status.setStyleSheet("color: #14a085; font-weight: bold;")
         else:
-            # Running as script
-            settings_file = Path('./settings.json')
-            
-        if settings_file.exists():
-            try:
-                with open(settings_file, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"Error loading settings: {e}")
-        
-        # Store settings file path for saving
-        self.settings_file = settings_file
-        
-        # Default settings
-        return {
-            'organize_by_file': True,
-            'move_original': True,
-            'overwrite_existing': False,
-            'batch_size': 50,
-            'retry_count': 3,
-            'enable_cache': True,
-            'recent_files': [],
-            'profiles': {},
-            'watchlist': [],
-            'ui_language': 'en',
-            'output_naming': '{filename}_{language}',
-            'output_encoding': 'utf-8',
-            'layout_state': None,
-            'translation_service': 'google',
-            'use_gpu': GPU_AVAILABLE,
-            'offline_mode': False,
-            'offline_model': 'marian'
-        }
+            self.gpu_status.setText("🔴 GPU not available")
+            self.gpu_status.setStyleSheet("color: #d32f2f; font-weight: bold;")
     
     def load_enabled_languages(self):
-        # Use same settings file as load_settings
-        if hasattr(self, 'settings_file') and self.settings_file.exists():
-            try:
-                with open(self.settings_file, 'r') as f:
-                    settings = json.load(f)
-                    return settings.get('languages', DEFAULT_LANGUAGES)
-            except Exception as e:
-                print(f"Error loading language settings: {e}")
-        return DEFAULT_LANGUAGES
+        return self.settings.get('languages', DEFAULT_LANGUAGES)
     
     def save_all_settings(self):
         # Get selected languages from settings tab
-        selected_languages = {lang: LANGUAGES[lang] for lang, checkbox in self.settings_lang_checkboxes.items() 
-                            if checkbox.isChecked()}
+        selected_languages = self.settings_lang_model.checked_languages()
         
         if not selected_languages:
             QMessageBox.warning(self, "No Languages", "Please select at least one language.")
@@ -2059,30 +1922,44 @@ class SubtitleTranslatorGUI(QMainWindow):
             'batch_size': self.batch_size.value(),
             'retry_count': self.retry_count.value(),
             'enable_cache': self.enable_cache.isChecked(),
+            'translation_memory': self.translation_memory.isChecked(),
+            'memory_threshold': self.memory_threshold.value() / 100,
+            'cache_max_mb': self.cache_max_mb.value(),
+            'cache_language_max_mb': self.cache_language_max_mb.value(),
+            'cache_policy': self.cache_policy.currentData(),
+            'cache_server': self.cache_server.text().strip(),
+            'cache_server_token': self.cache_server_token.text(),
             'ui_language': self.ui_language_combo.currentData(),
             'output_naming': self.output_naming.text(),
             'output_encoding': self.output_encoding.currentText(),
             'layout_state': self.saveGeometry().toHex().data().decode(),
             'translation_service': self.translation_service.currentData(),
             'use_gpu': self.use_gpu.isChecked(),
-            'offline_mode': self.offline_mode.isChecked()
+            'offline_mode': self.offline_mode.isChecked(),
+            'metrics_port': self.metrics_port.value(),
+            'profiling': self.profiling.currentData()
         }
         
+        restart_metrics = settings['metrics_port'] != self.settings.get('metrics_port', 0)
+        
         # Update settings object
         self.settings.update(settings)
         self.enabled_languages = selected_languages
         
-        # Save to file
-        try:
-            self.save_settings()
-            
-            # Update main tab language list
-            self.update_main_tab_languages()
-            
+        # Update main tab language list
+        self.update_main_tab_languages()
+        
+        if restart_metrics:
+            self.start_metrics_server()
+        self.apply_cache_limits()
+        
+        # Written right away so the confirmation is truthful
+        self.save_settings()
+        if self.settings_store.flush():
             QMessageBox.information(self, "Success", "Settings saved successfully!")
             self.status_bar.showMessage("Settings saved successfully")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to save settings: {e}")
+        else:
+            QMessageBox.critical(self, "Error", f"Failed to save settings: {self.settings_store.last_error}")
     
     def update_main_tab_languages(self):
         # Clear existing tags
@@ -2105,69 +1982,172 @@ class SubtitleTranslatorGUI(QMainWindow):
             self.lang_flow_layout.addWidget(no_langs)
     
     def filter_languages(self):
-        search_text = self.search_input.text().lower()
-        
-        for lang, checkbox in self.settings_lang_checkboxes.items():
-            if search_text in lang.lower() or search_text in LANGUAGES[lang].lower():
-                checkbox.setVisible(True)
-            else:
-                checkbox.setVisible(False)
+        # Rows read "Name (code)", so this matches either
+        self.settings_lang_filter.setFilterFixedString(self.search_input.text())
+    
+    def filtered_languages(self):
+        rows = (self.settings_lang_filter.mapToSource(self.settings_lang_filter.index(row, 0)).row()
+                for row in range(self.settings_lang_filter.rowCount()))
+        return [self.settings_lang_model.languages[row][0] for row in rows]
     
     def settings_select_all_languages(self):
-        for checkbox in self.settings_lang_checkboxes.values():
-            if checkbox.isVisible():  # Only select visible (filtered) checkboxes
-                checkbox.setChecked(True)
+        # Only the visible (filtered) languages
+        self.settings_lang_model.set_checked(self.filtered_languages(), True)
     
     def settings_deselect_all_languages(self):
-        for checkbox in self.settings_lang_checkboxes.values():
-            if checkbox.isVisible():  # Only deselect visible (filtered) checkboxes
-                checkbox.setChecked(False)
+        self.settings_lang_model.set_checked(self.filtered_languages(), False)
     
-    def update_cache_info(self):
-        cache_size = 0
-        cache_count = 0
-        
-        # Use correct cache location
-        if getattr(sys, 'frozen', False):
-            cache_dir = Path(os.path.expanduser('~')) / 'AppData' / 'Local' / 'SRT_Maker' / 'cache'
+    def get_cache_size(self):
+        return default_store().total_bytes()
+    
+    def apply_cache_limits(self):
+        # The evictor picks the new limits up on its next check
+        self.cache_evictor.configure(self.settings.get('cache_max_mb', 500) * 1024 * 1024,
+                                     self.settings.get('cache_language_max_mb', 100) * 1024 * 1024,
+                                     self.settings.get('cache_policy', 'lru'))
+    
+    def test_cache_server(self):
+        url = self.cache_server.text().strip()
+        if not url:
+            QMessageBox.information(self, "Shared Cache", "No server set; translations are cached on this machine only.")
+            return
+        QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
+        try:
+            health = CacheClient(url, self.cache_server_token.text() or None).health()
+        finally:
+            QApplication.restoreOverrideCursor()
+        if health is None:
+            QMessageBox.warning(self, "Shared Cache", f"Could not reach {url}. Check the address, the token "
+                                                      "and that cache_server.py is running there.")
         else:
-            cache_dir = Path('./cache')
-        
-        if cache_dir.exists():
-            for cache_file in cache_dir.glob('cache_*.json'):
-                try:
-                    cache_size += cache_file.stat().st_size
-                    cache_count += 1
-                except:
-                    pass
+            QMessageBox.information(self, "Shared Cache", f"Connected: {health.get('entries', 0)} translations "
+                                                          f"in {health.get('languages', 0)} languages.")
+    
+    def start_metrics_server(self):
+        # Off unless a port is configured; the endpoint is only reachable from this machine by default
+        if self.metrics_server:
+            self.metrics_server.stop()
+            self.metrics_server = None
+        port = self.settings.get('metrics_port', 0)
+        if not port:
+            return
+        try:
+            self.metrics_server = MetricsServer(port, self.settings.get('metrics_host', '127.0.0.1')).start()
+            EVENTS.info('metrics', "Metrics endpoint: %s", self.metrics_server.url)
+        except OSError as e:
+            EVENTS.error('metrics', "Could not start metrics endpoint on port %s: %s", port, e)
+    
+    def update_cache_info(self):
+        usage = default_store().usage()
+        cache_size = sum(size for _, size in usage.values())
+        entry_count = sum(count for count, _ in usage.values())
         
         if cache_size > 1024 * 1024:
             size_str = f"{cache_size / (1024 * 1024):.2f} MB"
         else:
             size_str = f"{cache_size / 1024:.2f} KB"
         
-        self.cache_info.setText(f"Cache size: {size_str} ({cache_count} files)")
+        self.cache_info.setText(f"Cache size: {size_str} ({entry_count} translations in {len(usage)} languages)")
     
     def clear_cache(self):
         try:
-            count = 0
-            # Use correct cache location
-            if getattr(sys, 'frozen', False):
-                cache_dir = Path(os.path.expanduser('~')) / 'AppData' / 'Local' / 'SRT_Maker' / 'cache'
-            else:
-                cache_dir = Path('./cache')
+            count = default_store().clear()
             
-            if cache_dir.exists():
-                for cache_file in cache_dir.glob('cache_*.json'):
-                    cache_file.unlink()
-                    count += 1
-            
-            self.update_cache_info()
-            QMessageBox.information(self, "Cache Cleared", f"Successfully cleared {count} cache files.")
-            self.status_bar.showMessage(f"Cleared {count} cache files")
+            if self.tab_built(self.settings_tab):
+                self.update_cache_info()
+            QMessageBox.information(self, "Cache Cleared", f"Successfully cleared {count} cached translations.")
+            self.status_bar.showMessage(f"Cleared {count} cached translations")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to clear cache: {e}")
     
+    def export_cache(self):
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Export Cache", "srt_maker_cache.jsonl.gz",
+            "Cache Bundles (*.jsonl.gz);;TMX Files (*.tmx);;All Files (*)")
+        if not file_path:
+            return
+        
+        QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
+        try:
+            written, skipped = cache_bundle.export_bundle(file_path)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to export cache: {e}")
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+        
+        message = f"Exported {written} translations."
+        if skipped:
+            message += f"\n{skipped} entries without a stored source line cannot be written to TMX."
+        QMessageBox.information(self, "Cache Exported", message)
+        self.status_bar.showMessage(f"Exported {written} translations to {file_path}")
+    
+    def import_cache(self):
+        if self.worker and self.worker.isRunning():
+            # The running translators would overwrite the merged cache files when they save
+            QMessageBox.warning(self, "Translation Running", "Import the cache once the translation has finished.")
+            return
+        
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Import Cache", "", "Cache Bundles (*.jsonl.gz *.jsonl *.tmx *.tmx.gz);;All Files (*)")
+        if not file_path:
+            return
+        
+        answer = QMessageBox.question(
+            self, "Import Cache",
+            "Some lines may already be cached with a different translation.\n\n"
+            "Replace them with the translations from the file?",
+            QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel, QMessageBox.No)
+        if answer == QMessageBox.Cancel:
+            return
+        
+        QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
+        try:
+            counts = cache_bundle.import_bundle(file_path, 'replace' if answer == QMessageBox.Yes else 'keep')
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to import cache: {e}")
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+        
+        if self.tab_built(self.settings_tab):
+            self.update_cache_info()
+        QMessageBox.information(
+            self, "Cache Imported",
+            f"{counts['added']} added, {counts['replaced']} replaced, {counts['kept']} kept, "
+            f"{counts['unchanged']} unchanged, {counts['skipped']} skipped.")
+        self.status_bar.showMessage(f"Imported {counts['added'] + counts['replaced']} translations from {file_path}")
+    
+    def rebuild_cache(self):
+        if self.worker and self.worker.isRunning():
+            QMessageBox.warning(self, "Translation Running", "Rebuild the cache once the translation has finished.")
+            return
+        
+        folder = QFileDialog.getExistingDirectory(self, "Select Folder with Translated Subtitles")
+        if not folder:
+            return
+        
+        QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
+        try:
+            stats, counts = cache_rebuild.rebuild_cache(
+                [folder], recursive=True,
+                naming=self.settings.get('output_naming', '{filename}_{language}'),
+                encoding=self.settings.get('output_encoding', 'utf-8'))
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to rebuild cache: {e}")
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+        
+        if self.tab_built(self.settings_tab):
+            self.update_cache_info()
+        QMessageBox.information(
+            self, "Cache Rebuilt",
+            f"Paired {stats['paired']} cues from {stats['outputs']} translated files of {stats['sources']} sources.\n"
+            f"{stats['unaligned']} cues did not line up and were skipped.\n\n"
+            f"{counts['added']} translations added, {counts['kept']} cached differently and kept.")
+        self.status_bar.showMessage(f"Added {counts['added']} translations from {folder}")
+    
     def open_output_folder(self):
         if not self.output_folder:
             return
@@ -2187,7 +2167,10 @@ class SubtitleTranslatorGUI(QMainWindow):
             QMessageBox.warning(self, "No Files", "Please select files to translate.")
             return
         
-        selected_langs = self.get_selected_languages()
+        if self.active_jobs:
+            selected_langs = {language: lang_code for lang_code, (_, language) in self.active_jobs.items()}
+        else:
+            selected_langs = self.get_selected_languages()
         if not selected_langs:
             QMessageBox.warning(self, "No Languages", "Please select at least one language.")
             return
@@ -2197,7 +2180,7 @@ class SubtitleTranslatorGUI(QMainWindow):
         self.file_progress_bar.setValue(0)
         self.lang_progress_bar.setValue(0)
         self.sub_progress_bar.setValue(0)
-        self.log_text.clear()
+        self.clear_logs()
         
         # Get current settings
         current_settings = {
@@ -2206,11 +2189,20 @@ class SubtitleTranslatorGUI(QMainWindow):
             'overwrite_existing': self.settings.get('overwrite_existing', False),
             'batch_size': self.settings.get('batch_size', 50),
             'retry_count': self.settings.get('retry_count', 3),
-            'enable_cache': self.settings.get('enable_cache', True)
+            'enable_cache': self.settings.get('enable_cache', True),
+            'translation_memory': self.settings.get('translation_memory', True),
+            'memory_threshold': self.settings.get('memory_threshold', 0.9),
+            'cache_server': self.settings.get('cache_server', ''),
+            'cache_server_token': self.settings.get('cache_server_token', '')
         }
         
         self.stats.start_session()
-        self.worker = TranslationWorker(self.files, selected_langs, current_settings, self.stats)
+        self.run_recorder.start()
+        if self.settings.get('profiling', 'off') != 'off':
+            PROFILER.start(sample=self.settings['profiling'] == 'sample')
+        jobs = {lang_code: job_id for lang_code, (job_id, _) in self.active_jobs.items()}
+        self.worker = TranslationWorker(self.files, selected_langs, current_settings, self.stats,
+                                        self.job_queue if jobs else None, jobs, self.pack_files if jobs else None)
         self.worker.progress.connect(self.update_progress)
         self.worker.file_progress.connect(self.update_file_progress)
         self.worker.language_progress.connect(self.update_language_progress)
@@ -2230,8 +2222,16 @@ class SubtitleTranslatorGUI(QMainWindow):
         self.translation_stopped()
     
     def update_progress(self, message):
-        self.log_text.append(message)
-        QtCore.QCoreApplication.processEvents()
+        self.progress_log.write(message)
+    
+    def write_progress_lines(self, lines, dropped):
+        if dropped:
+            lines.insert(0, f"... {dropped} earlier lines omitted")
+        self.log_text.append('\n'.join(lines))
+    
+    def flush_logs(self, *args):
+        self.progress_log.flush()
+        self.activity_log.flush()
     
     def update_file_progress(self, current, total):
         self.file_progress_bar.setMaximum(total)
@@ -2245,20 +2245,31 @@ class SubtitleTranslatorGUI(QMainWindow):
         self.sub_progress_bar.setMaximum(total)
         self.sub_progress_bar.setValue(current)
     
+    def record_run(self):
+        self.run_recorder.finish(self.history)
+        breakdown, report, stacks = PROFILER.stop()
+        if breakdown:
+            self.progress_log.write(f"\n⏱️ Time per stage:\n{breakdown}")
+            if report:
+                self.progress_log.write(f"Profile saved to {report}" + (f" and {stacks.name}" if stacks else ""))
+        if hasattr(self, 'dashboard'):
+            self.dashboard.update_charts()
+    
     def translation_finished(self):
         self.btn_start.setEnabled(True)
         self.btn_stop.setEnabled(False)
         self.stats.end_session()
+        self.record_run()
         self.update_stats_display()
-        self.log_text.append("\n🎉 Translation completed successfully!")
+        self.progress_log.write("\n🎉 Translation completed successfully!")
+        self.progress_log.flush()
+        self.active_jobs = {}
+        self.packed_files.update(self.pack_files)
+        self.pack_files = []
         
         # Process next file in watch queue
-        if self.watch_queue:
-            next_file = self.watch_queue.pop(0)
-            self.queue_label.setText(f"Queue: {len(self.watch_queue)} files")
-            self.add_log_entry("🚀 Processing queue", f"{Path(next_file).name}", "success")
-            self.files = [next_file]
-            QTimer.singleShot(1000, self.start_translation)  # Small delay
+        if self.job_queue.pending_count():
+            QTimer.singleShot(1000, self.process_next_job)  # Small delay
         else:
             QMessageBox.information(self, "Success", "Translation completed successfully!")
             self.status_bar.showMessage("Translation completed successfully")
@@ -2266,33 +2277,71 @@ class SubtitleTranslatorGUI(QMainWindow):
     def translation_stopped(self):
         self.btn_start.setEnabled(True)
         self.btn_stop.setEnabled(False)
-        self.log_text.append("\n⏹️ Translation stopped by user.")
+        self.record_run()
+        if self.active_jobs:
+            # Unfinished languages stay queued for the next run
+            self.job_queue.release(job_id for job_id, _ in self.active_jobs.values())
+            self.active_jobs = {}
+            self.pack_files = []
+            self.update_queue_label()
+        self.progress_log.write("\n⏹️ Translation stopped by user.")
+        self.progress_log.flush()
         QMessageBox.warning(self, "Stopped", "Translation was stopped by user.")
         self.status_bar.showMessage("Translation stopped by user")
     
     def translation_error(self, error):
         self.btn_start.setEnabled(True)
         self.btn_stop.setEnabled(False)
-        self.log_text.append(f"\n❌ Error: {error}")
-        QMessageBox.critical(self, "Error", f"An error occurred: {error}")
+        self.record_run()
+        if self.active_jobs:
+            for job_id, _ in self.active_jobs.values():
+                self.job_queue.mark_failed(job_id, error)
+            self.active_jobs = {}
+            self.pack_files = []
+            self.update_queue_label()
+            self.add_log_entry("❌ Translation failed", f"{Path(self.files[0]).name}: {error}", "error")
+        self.progress_log.write(f"\n❌ Error: {error}")
+        self.progress_log.flush()
         self.status_bar.showMessage(f"Error: {error}")
+        
+        # One broken file must not hold up the rest of the watch queue
+        if self.job_queue.pending_count():
+            QTimer.singleShot(1000, self.process_next_job)
+        else:
+            QMessageBox.critical(self, "Error", f"An error occurred: {error}")
     
     def clear_logs(self):
+        self.progress_log.clear()
         self.log_text.clear()
     
     def closeEvent(self, event):
         if self.worker and self.worker.isRunning():
             self.worker.terminate()
             self.worker.wait()
+        if self.replace_worker and self.replace_worker.isRunning():
+            self.replace_worker.stop()
+            self.replace_worker.wait()
+        if self.ui_translator and self.ui_translator.isRunning():
+            self.ui_translator.stop()
+            self.ui_translator.wait()
         
-        # Cleanup cache files if they're too large
-        for cache_file in Path('./cache/').glob('cache_*.json'):
-            if cache_file.stat().st_size > 10*1024*1024:
-                cache_file.unlink()
+        # Interrupted jobs are picked up again on the next launch
+        if self.active_jobs:
+            self.job_queue.release(job_id for job_id, _ in self.active_jobs.values())
+        self.job_queue.close()
+        if self.metrics_server:
+            self.metrics_server.stop()
+        self.history.close()
+        EVENTS.remove_sink(self.event_sink)
+        self.search_index.close()
+        self.settings_store.close()
+        self.cache_evictor.stop()
         
         event.accept()
     
     def update_preview_files(self):
+        if not self.tab_built(self.preview_tab):
+            return
         self.preview_file_combo.clear()
         if self.files:
             for file in self.files:
@@ -2302,11 +2351,12 @@ class SubtitleTranslatorGUI(QMainWindow):
         file_path = self.preview_file_combo.currentData()
         if file_path and Path(file_path).exists():
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                self.preview_text.setPlainText(content[:2000])  # First 2000 chars
+                cue_file = CueFile(file_path)
+                self.preview_model.set_file(cue_file)
+                self.preview_info.setText(f"{len(cue_file)} cues")
             except Exception as e:
-                self.preview_text.setPlainText(f"Error reading file: {e}")
+                self.preview_model.set_file(None)
+                self.preview_info.setText(f"Error reading file: {e}")
     
     def add_watch_folder(self):
         folder = QFileDialog.getExistingDirectory(self, "Select Watch Folder")
@@ -2352,17 +2402,11 @@ class SubtitleTranslatorGUI(QMainWindow):
         for watcher in self.folder_watchers:
             watcher.stop_watching()
         self.folder_watchers.clear()
-        
-        # Stop UI translation worker
-        if hasattr(self, 'ui_translator') and self.ui_translator.isRunning():
-            self.ui_translator.stop()
-            self.ui_translator.wait()
-        self.watch_queue.clear()
         self.start_watch_btn.setEnabled(True)
         self.stop_watch_btn.setEnabled(False)
         self.watch_status.setText("Status: Stopped")
         self.watch_status.setStyleSheet("color: #d32f2f; font-weight: bold;")
-        self.queue_label.setText("Queue: 0 files")
+        self.update_queue_label()
         self.add_log_entry("⏹️ Stopped monitoring", "All folders", "warning")
     
     def on_file_detected(self, file_path):
@@ -2370,28 +2414,79 @@ class SubtitleTranslatorGUI(QMainWindow):
         self.add_log_entry("📄 File detected", f"{Path(file_path).name}", "info", folder_name)
         
         if self.auto_translate_cb.isChecked():
+            languages = self.get_selected_languages()
+            if not languages:
+                self.add_log_entry("⚠️ No languages selected", f"skipping {Path(file_path).name}", "warning", folder_name)
+                return
+            if not self.job_queue.enqueue(file_path, languages):
+                return
             if not self.worker or not self.worker.isRunning():
                 # Start translation immediately if not busy
-                self.files = [file_path]
-                self.add_log_entry("🚀 Translation started", f"{Path(file_path).name}", "success")
-                self.start_translation()
+                self.process_next_job()
             else:
                 # Add to queue if translation is running
-                self.watch_queue.append(file_path)
-                self.queue_label.setText(f"Queue: {len(self.watch_queue)} files")
+                self.update_queue_label()
                 self.add_log_entry("⏳ Added to queue", f"{Path(file_path).name}", "info")
     
+    def process_next_job(self):
+        if self.worker and self.worker.isRunning():
+            return
+        claimed = self.job_queue.claim_next()
+        if not claimed:
+            self.update_queue_label()
+            return
+        file_path, self.active_jobs = claimed
+        self.files = [file_path]
+        # Small clips dropped into a watched folder would each cost a mostly empty request per language;
+        # the pre-pass packs the lines of the files still waiting into the same requests instead
+        self.packed_files.discard(file_path)
+        waiting = [path for path in self.job_queue.pending_files(MAX_PACKED_FILES)
+                   if path not in self.packed_files and path != file_path]
+        self.pack_files = [file_path] + waiting if waiting else []
+        self.update_queue_label()
+        self.add_log_entry("🚀 Translation started", f"{Path(file_path).name}", "success")
+        self.start_translation()
+    
+    def resume_queued_jobs(self):
+        pending = self.job_queue.pending_file_count()
+        self.update_queue_label()
+        if pending:
+            self.add_log_entry("♻️ Resuming queue", f"{pending} file(s), {self.recovered_jobs} interrupted job(s)", "info")
+            self.process_next_job()
+    
+    def update_queue_label(self):
+        self.queue_label.setText(f"Queue: {self.job_queue.pending_file_count()} files")
+    
     def reset_stats(self):
         self.stats.reset()
         self.update_stats_display()
     
     def update_stats_display(self):
+        if not self.tab_built(self.stats_tab):
+            return
         self.stats_labels['files'].setText(f"Files processed: {self.stats.files_processed}")
         self.stats_labels['languages'].setText(f"Languages processed: {self.stats.languages_processed}")
         self.stats_labels['subtitles'].setText(f"Subtitles translated: {self.stats.subtitles_translated}")
         self.stats_labels['cache_ratio'].setText(f"Cache hit ratio: {self.stats.get_cache_ratio():.1f}%")
         self.stats_labels['duration'].setText(f"Duration: {self.stats.get_duration():.1f}s")
         self.stats_labels['errors'].setText(f"Errors: {self.stats.errors}")
+        
+        latency = metrics.REQUEST_LATENCY.merged()
+        self.stats_labels['latency'].setText(
+            f"Request latency: p50 {latency.quantile(0.5):.2f}s / p95 {latency.quantile(0.95):.2f}s "
+            f"({latency.count} requests)")
+        chars = metrics.REQUEST_CHARS.merged()
+        avg_chars = chars.sum / chars.count if chars.count else 0
+        self.stats_labels['request_chars'].setText(f"Average request size: {avg_chars:.0f} chars")
+        rates = [f"{lang}: {child.get():.1f}" for (lang,), child in sorted(metrics.CUES_PER_SECOND.children())]
+        self.stats_labels['throughput'].setText(
+            f"Throughput (cues/sec): {', '.join(rates)}" if rates else "Throughput: -")
+        model_load = metrics.MODEL_LOAD_SECONDS.merged()
+        if model_load.count:
+            self.stats_labels['model_load'].setText(
+                f"Model load time: avg {model_load.sum / model_load.count:.1f}s ({model_load.count} loads)")
+        else:
+            self.stats_labels['model_load'].setText("Model load time: -")
     
     def update_recent_menu(self):
         self.recent_menu.clear()
@@ -2428,59 +2523,58 @@ class SubtitleTranslatorGUI(QMainWindow):
     def load_profile_from_combo(self, name):
         if name and name != "-- Select Profile --":
             self.load_profile(name)
-            # Update checkboxes to match profile
-            for lang, checkbox in self.settings_lang_checkboxes.items():
-                checkbox.setChecked(lang in self.enabled_languages)
+            # Update the language list to match the profile
+            self.settings_lang_model.reset_checked(self.enabled_languages)
+    
+    LOG_COLORS = {
+        "success": "#14a085",
+        "warning": "#ff9800", 
+        "error": "#d32f2f",
+        "info": "#2196f3"
+    }
+    LOG_BACKGROUNDS = {
+        "success": "#0d4d40",
+        "warning": "#4d3300",
+        "error": "#4d1a1a", 
+        "info": "#1a2d4d"
+    }
+    MAX_LOG_LINES = 5000
+    MAX_ACTIVITY_ENTRIES = 100
     
     def add_log_entry(self, action, details, level="info", folder=None):
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        
-        # Create styled log entry
-        item = QListWidgetItem()
-        
-        # Color coding based on level
-        colors = {
-            "success": "#14a085",
-            "warning": "#ff9800", 
-            "error": "#d32f2f",
-            "info": "#2196f3"
-        }
-        
-        color = colors.get(level, "#ffffff")
-        folder_text = f" [{folder}]" if folder else ""
-        
-        # HTML formatted text with colors and styling
-        html_text = f"""
-        <div style="color: {color}; padding: 2px;">
-            <span style="color: #888; font-size: 10px;">[{timestamp}]</span>
-            <span style="font-weight: bold; margin-left: 8px;">{action}</span>
-            <span style="color: #ccc; margin-left: 8px;">{details}</span>
-            <span style="color: #666; font-style: italic;">{folder_text}</span>
-        </div>
-        """
-        
-        item.setText(f"[{timestamp}] {action}: {details}{folder_text}")
-        item.setToolTip(html_text)
-        
-        # Set background color based on level
-        bg_colors = {
-            "success": "#0d4d40",
-            "warning": "#4d3300",
-            "error": "#4d1a1a", 
-            "info": "#1a2d4d"
-        }
-        
-        item.setBackground(QtGui.QColor(bg_colors.get(level, "#2d2d2d")))
-        item.setForeground(QtGui.QColor(color))
-        
-        self.watch_log.addItem(item)
-        self.watch_log.scrollToBottom()
-        
-        # Keep only last 100 entries
-        if self.watch_log.count() > 100:
+        # Formatting is deferred to the flush, and only for entries that survive the cap
+        self.activity_log.write((datetime.now().strftime("%H:%M:%S"), action, details, level, folder))
+    
+    def write_activity_entries(self, entries, dropped):
+        for timestamp, action, details, level, folder in entries:
+            item = QListWidgetItem()
+            
+            color = self.LOG_COLORS.get(level, "#ffffff")
+            folder_text = f" [{folder}]" if folder else ""
+            
+            # HTML formatted text with colors and styling
+            html_text = f"""
+            <div style="color: {color}; padding: 2px;">
+                <span style="color: #888; font-size: 10px;">[{timestamp}]</span>
+                <span style="font-weight: bold; margin-left: 8px;">{action}</span>
+                <span style="color: #ccc; margin-left: 8px;">{details}</span>
+                <span style="color: #666; font-style: italic;">{folder_text}</span>
+            </div>
+            """
+            
+            item.setText(f"[{timestamp}] {action}: {details}{folder_text}")
+            item.setToolTip(html_text)
+            item.setBackground(QtGui.QColor(self.LOG_BACKGROUNDS.get(level, "#2d2d2d")))
+            item.setForeground(QtGui.QColor(color))
+            self.watch_log.addItem(item)
+        
+        # Keep only the last MAX_ACTIVITY_ENTRIES entries
+        while self.watch_log.count() > self.MAX_ACTIVITY_ENTRIES:
             self.watch_log.takeItem(0)
+        self.watch_log.scrollToBottom()
     
     def clear_activity_log(self):
+        self.activity_log.clear()
         self.watch_log.clear()
         self.add_log_entry("🗑️ Log cleared", "Activity log reset", "info")
     
@@ -2500,8 +2594,7 @@ class SubtitleTranslatorGUI(QMainWindow):
     def on_ui_language_changed(self):
         new_language = self.ui_language_combo.currentData()
         if new_language != self.ui_language:
-            self.ui_language = new_language
-            self.refresh_ui_texts()
+            self.set_ui_language(new_language)
     
     def refresh_ui_texts(self):
         # Update window title
@@ -2551,81 +2644,95 @@ class SubtitleTranslatorGUI(QMainWindow):
     def select_original_file(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Select Original File", "", "Subtitle Files (*.srt *.ass *.txt)")
         if file_path:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                self.orig_text.setPlainText(f.read())
+            self.load_compare_file(file_path, original=True)
     
     def select_translated_file(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Select Translated File", "", "Subtitle Files (*.srt *.ass *.txt)")
         if file_path:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                self.trans_text.setPlainText(f.read())
+            self.load_compare_file(file_path, original=False)
+    
+    def load_compare_file(self, file_path, original):
+        try:
+            cue_file = CueFile(file_path)
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Error reading file: {e}")
+            return
+        if original:
+            self.compare_original = cue_file
+            self.orig_file_btn.setText(Path(file_path).name)
+        else:
+            self.compare_translated = cue_file
+            self.trans_file_btn.setText(Path(file_path).name)
+        self.compare_model.set_files(self.compare_original, self.compare_translated)
     
     def find_all(self):
         find_text = self.find_input.text()
         if not find_text:
             return
         
-        results = []
+        # Search the sources and their translated outputs through the cue index
+        paths = []
         for file_path in self.files:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    if self.regex_mode.isChecked():
-                        matches = re.finditer(find_text, content, 0 if self.case_sensitive.isChecked() else re.IGNORECASE)
-                        for match in matches:
-                            results.append(f"{Path(file_path).name}: Line {content[:match.start()].count(chr(10)) + 1}")
-                    else:
-                        lines = content.split('\n')
-                        for i, line in enumerate(lines):
-                            if (find_text in line) if self.case_sensitive.isChecked() else (find_text.lower() in line.lower()):
-                                results.append(f"{Path(file_path).name}: Line {i + 1}: {line.strip()}")
-            except Exception as e:
-                results.append(f"Error reading {Path(file_path).name}: {e}")
+            paths.append(str(file_path))
+            paths.extend(translated_outputs(file_path))
+        self.search_index.sync(paths)
+        
+        results = []
+        try:
+            for hit in self.search_index.search(find_text, paths, self.case_sensitive.isChecked(), self.regex_mode.isChecked()):
+                timestamp = f" [{format_time(hit.start_ms)}]" if hit.start_ms is not None else ""
+                results.append(f"{Path(hit.path).name}: Line {hit.line}{timestamp}: {hit.text.strip()}")
+        except re.error as e:
+            results.append(f"Invalid regular expression: {e}")
         
         self.find_results.setPlainText('\n'.join(results))
     
     def replace_all(self):
         find_text = self.find_input.text()
         replace_text = self.replace_input.text()
-        if not find_text:
+        if not find_text or (self.replace_worker and self.replace_worker.isRunning()):
             return
         
-        replaced_count = 0
-        for file_path in self.files:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                if self.regex_mode.isChecked():
-                    new_content, count = re.subn(find_text, replace_text, content, 0 if self.case_sensitive.isChecked() else re.IGNORECASE)
-                else:
-                    if self.case_sensitive.isChecked():
-                        new_content = content.replace(find_text, replace_text)
-                        count = content.count(find_text)
-                    else:
-                        # Case insensitive replace
-                        import re
-                        new_content = re.sub(re.escape(find_text), replace_text, content, flags=re.IGNORECASE)
-                        count = len(re.findall(re.escape(find_text), content, re.IGNORECASE))
-                
-                if count > 0:
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(new_content)
-                    replaced_count += count
-            except Exception as e:
-                self.find_results.append(f"Error processing {Path(file_path).name}: {e}")
+        regex = self.regex_mode.isChecked()
+        try:
+            pattern = bulk_replace.compile_pattern(find_text, self.case_sensitive.isChecked(), regex)
+        except re.error as e:
+            self.find_results.setPlainText(f"Invalid regular expression: {e}")
+            return
         
-        self.find_results.append(f"\nReplaced {replaced_count} occurrences across {len(self.files)} files")
-    
-
-    
-    def on_translation_progress(self, language, current, total):
-        progress = int((current / total) * 100)
-        self.status_bar.showMessage(f"Pre-translating UI: {language} ({progress}%)")
-    
-    def on_translation_finished(self):
-        self.status_bar.showMessage("UI translation cache ready - Language switching will be instant!")
-        QTimer.singleShot(3000, lambda: self.status_bar.showMessage("Ready"))
+        dry_run = self.dry_run_replace.isChecked()
+        self.find_results.setPlainText("Previewing replacements..." if dry_run else "Replacing...")
+        self.replace_progress.setValue(0)
+        self.replace_btn.setEnabled(False)
+        
+        self.replace_worker = ReplaceWorker(self.files, pattern, bulk_replace.make_replacement(replace_text, regex), dry_run)
+        self.replace_worker.progress.connect(self.on_replace_progress)
+        self.replace_worker.file_done.connect(self.on_replace_file_done)
+        self.replace_worker.finished.connect(self.on_replace_finished)
+        self.replace_worker.start()
+    
+    def on_replace_progress(self, current, total):
+        self.replace_progress.setValue(int(current / total * 100) if total else 100)
+    
+    def on_replace_file_done(self, result):
+        name = Path(result.path).name
+        if result.error:
+            self.find_results.append(f"Error processing {name}: {result.error}")
+        elif result.count and self.replace_worker.dry_run:
+            self.find_results.append(f"{name}: {result.count} occurrences")
+            for line, old_line, new_line in result.samples:
+                self.find_results.append(f"    Line {line}: {old_line}  →  {new_line}")
+        elif result.count:
+            # The indexed cues are stale; the next search reindexes the file
+            self.search_index.remove(result.path)
+    
+    def on_replace_finished(self, occurrences, changed, dry_run):
+        self.replace_btn.setEnabled(True)
+        self.replace_progress.setValue(100)
+        if dry_run:
+            self.find_results.append(f"\nDry run: {occurrences} occurrences in {changed} of {len(self.files)} files would be replaced")
+        else:
+            self.find_results.append(f"\nReplaced {occurrences} occurrences across {len(self.files)} files")
     
     def setup_compare_tab(self):
         layout = QVBoxLayout(self.compare_tab)
@@ -2657,16 +2764,14 @@ class SubtitleTranslatorGUI(QMainWindow):
         file_layout.addLayout(trans_layout)
         layout.addLayout(file_layout)
         
-        # Comparison view
-        compare_layout = QHBoxLayout()
-        self.orig_text = QTextEdit()
-        self.orig_text.setReadOnly(True)
-        self.trans_text = QTextEdit()
-        self.trans_text.setReadOnly(True)
-        
-        compare_layout.addWidget(self.orig_text)
-        compare_layout.addWidget(self.trans_text)
-        layout.addLayout(compare_layout)
+        # Comparison view, cues paired by timestamp
+        self.compare_original = None
+        self.compare_translated = None
+        self.compare_model = CueCompareModel(self)
+        self.compare_view = self.create_cue_view(self.compare_model)
+        self.compare_view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.compare_view.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        layout.addWidget(self.compare_view)
     
     def setup_find_replace_tab(self):
         layout = QVBoxLayout(self.find_replace_tab)
@@ -2696,20 +2801,25 @@ class SubtitleTranslatorGUI(QMainWindow):
         options_layout = QHBoxLayout()
         self.case_sensitive = QCheckBox("Case Sensitive")
         self.regex_mode = QCheckBox("Regular Expression")
+        self.dry_run_replace = QCheckBox("Dry Run (preview only)")
         options_layout.addWidget(self.case_sensitive)
         options_layout.addWidget(self.regex_mode)
+        options_layout.addWidget(self.dry_run_replace)
         controls_layout.addLayout(options_layout)
         
         # Buttons
         btn_layout = QHBoxLayout()
         find_btn = QPushButton("Find All")
-        replace_btn = QPushButton("Replace All")
+        self.replace_btn = QPushButton("Replace All")
         find_btn.clicked.connect(self.find_all)
-        replace_btn.clicked.connect(self.replace_all)
+        self.replace_btn.clicked.connect(self.replace_all)
         btn_layout.addWidget(find_btn)
-        btn_layout.addWidget(replace_btn)
+        btn_layout.addWidget(self.replace_btn)
         controls_layout.addLayout(btn_layout)
         
+        self.replace_progress = QProgressBar()
+        controls_layout.addWidget(self.replace_progress)
+        
         layout.addLayout(controls_layout)
         
         # Results
@@ -2726,10 +2836,24 @@ class SubtitleTranslatorGUI(QMainWindow):
         header.setStyleSheet("color: #14a085; margin: 20px;")
         layout.addWidget(header)
         
-        # Add dashboard widget
-        self.dashboard = PerformanceDashboard()
+        # Imported here so matplotlib only loads once the tab is opened
+        from dashboard import PerformanceDashboard
+        self.dashboard = PerformanceDashboard(self.history)
+        self.dashboard.set_language_names({code: name for name, code in LANGUAGES.items()})
+        self.dashboard.update_charts()
         layout.addWidget(self.dashboard)
     
+    def tab_built(self, tab):
+        return tab not in self.tab_builders
+    
+    def ensure_tab(self, tab):
+        builder = self.tab_builders.pop(tab, None)
+        if builder:
+            builder()
+    
+    def on_tab_changed(self, index):
+        self.ensure_tab(self.tab_widget.widget(index))
+    
 
     
     def auto_start_watching(self):
@@ -2753,6 +2877,8 @@ def main():
     
     window = SubtitleTranslatorGUI()
     window.show()
+    # Runs once the event loop has shown the first window
+    QTimer.singleShot(0, window.report_startup_time)
     
     sys.exit(app.exec_())
 
@@ -0,0 +1,264 @@
+import bisect
+import threading
+
+# Bucket layouts shared by the translation histograms
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+CHAR_BUCKETS = (50, 100, 250, 500, 1000, 2000, 3000, 4000, 5000, 10000)
+MODEL_LOAD_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+class _CounterValue:
+    __slots__ = ('value', 'lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+    def get(self):
+        return self.value
+
+
+class _GaugeValue(_CounterValue):
+    __slots__ = ('function',)
+
+    def __init__(self):
+        super().__init__()
+        self.function = None
+
+    def set(self, value):
+        with self.lock:
+            self.value = value
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+    def set_function(self, function):
+        # Evaluated at read time, for values that already live somewhere else
+        self.function = function
+
+    def get(self):
+        if self.function is not None:
+            try:
+                return float(self.function())
+            except Exception:
+                return self.value
+        return self.value
+
+
+class _HistogramValue:
+    __slots__ = ('bounds', 'counts', 'sum', 'count', 'lock')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.bounds, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def cumulative(self):
+        with self.lock:
+            counts = list(self.counts)
+        total = 0
+        result = []
+        for bound, count in zip(list(self.bounds) + [float('inf')], counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q):
+        # Linear interpolation inside the bucket, good enough for a dashboard
+        buckets = self.cumulative()
+        total = buckets[-1][1]
+        if not total:
+            return 0.0
+        rank = q * total
+        lower_bound, lower_count = 0.0, 0
+        for bound, count in buckets:
+            if count >= rank:
+                if bound == float('inf'):
+                    return lower_bound
+                span = count - lower_count
+                fraction = (rank - lower_count) / span if span else 0
+                return lower_bound + (bound - lower_bound) * fraction
+            lower_bound, lower_count = bound, count
+        return lower_bound
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            # Unlabelled metrics are exported as 0 before their first update
+            self._children[()] = self._new_child()
+
+    def labels(self, *values):
+        # Hot paths should call this once and keep the child around
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(tuple(str(v) for v in values), self._new_child())
+        return child
+
+    def children(self):
+        with self._lock:
+            return list(self._children.items())
+
+    def _new_child(self):
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterValue()
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+    def total(self):
+        return sum(child.get() for _, child in self.children())
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _GaugeValue()
+
+    def set(self, value):
+        self.labels().set(value)
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+    def dec(self, amount=1):
+        self.labels().dec(amount)
+
+    def set_function(self, function):
+        self.labels().set_function(function)
+
+    def get(self):
+        return self.labels().get()
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help_text, labelnames)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def merged(self):
+        # All label combinations folded into one histogram
+        merged = _HistogramValue(self.buckets)
+        for _, child in self.children():
+            with child.lock:
+                for i, count in enumerate(child.counts):
+                    merged.counts[i] += count
+                merged.sum += child.sum
+                merged.count += child.count
+        return merged
+
+
+class MetricsRegistry:
+    """Process-wide collection of named metrics.
+
+    Updates take one uncontended lock per call, so metrics stay enabled in
+    the translation hot path; readers (Statistics tab, exporters) pull values
+    on demand.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, *args, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {metric.kind}")
+            return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._get_or_create(Counter, name, help_text, labelnames)
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self._get_or_create(Gauge, name, help_text, labelnames)
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._get_or_create(Histogram, name, help_text, labelnames, buckets=buckets)
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def collect(self):
+        with self._lock:
+            return list(self._metrics.values())
+
+
+REGISTRY = MetricsRegistry()
+
+# Translation pipeline metrics
+TRANSLATION_REQUESTS = REGISTRY.counter(
+    'srt_translation_requests_total', 'Requests sent to a translation service',
+    ('service', 'lang', 'outcome'))
+REQUEST_LATENCY = REGISTRY.histogram(
+    'srt_translation_request_seconds', 'Latency of a single translation request',
+    ('service', 'lang'), buckets=LATENCY_BUCKETS)
+REQUEST_CHARS = REGISTRY.histogram(
+    'srt_translation_request_chars', 'Characters sent per translation request',
+    ('service',), buckets=CHAR_BUCKETS)
+CUES_TRANSLATED = REGISTRY.counter(
+    'srt_cues_translated_total', 'Subtitle cues written to translated output', ('lang',))
+TRANSLATE_SECONDS = REGISTRY.counter(
+    'srt_translate_seconds_total', 'Wall time spent translating files', ('lang',))
+CUES_PER_SECOND = REGISTRY.gauge(
+    'srt_cues_per_second', 'Throughput of the most recent file per language', ('lang',))
+CACHE_LOOKUPS = REGISTRY.counter(
+    'srt_cache_lookups_total', 'Translation cache lookups', ('lang', 'result'))
+MODEL_LOAD_SECONDS = REGISTRY.histogram(
+    'srt_model_load_seconds', 'Time to load an offline translation model',
+    ('model',), buckets=MODEL_LOAD_BUCKETS)
+
+# Session level counters behind the Statistics tab
+FILES_PROCESSED = REGISTRY.counter('srt_files_processed_total', 'Input files processed', ('type',))
+LANGUAGES_PROCESSED = REGISTRY.counter(
+    'srt_languages_processed_total', 'File/language pairs completed')
+TRANSLATION_ERRORS = REGISTRY.counter(
+    'srt_translation_errors_total', 'File/language pairs that failed')
+
+# Values owned by other components, read through callbacks at scrape time
+QUEUE_JOBS = REGISTRY.gauge('srt_queue_jobs', 'Jobs in the durable job queue by state', ('state',))
+CACHE_BYTES = REGISTRY.gauge('srt_cache_bytes', 'Size of the translation cache on disk')
+STARTUP_SECONDS = REGISTRY.gauge('srt_startup_seconds', 'Seconds from interpreter start to the first window')
+OFFLINE_MODELS_LOADED = REGISTRY.gauge(
+    'srt_offline_models_loaded', 'Offline translation models currently held in memory')
@@ -0,0 +1,98 @@
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import metrics
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def render_prometheus(registry=metrics.REGISTRY):
+    """Serialize every metric in the registry in Prometheus text format 0.0.4."""
+    lines = []
+    for metric in sorted(registry.collect(), key=lambda m: m.name):
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for values, child in sorted(metric.children()):
+            if metric.kind == 'histogram':
+                for bound, count in child.cumulative():
+                    labels = _format_labels(metric.labelnames, values, ('le', _format_value(bound)))
+                    lines.append(f"{metric.name}_bucket{labels} {count}")
+                labels = _format_labels(metric.labelnames, values)
+                lines.append(f"{metric.name}_sum{labels} {_format_value(child.sum)}")
+                lines.append(f"{metric.name}_count{labels} {child.count}")
+            else:
+                labels = _format_labels(metric.labelnames, values)
+                lines.append(f"{metric.name}{labels} {_format_value(child.get())}")
+    return '\n'.join(lines) + '\n'
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = metrics.REGISTRY
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = render_prometheus(self.registry).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would otherwise flood the console
+        pass
+
+
+class MetricsServer:
+    """Serves /metrics from a daemon thread; nothing runs until start() is called."""
+
+    def __init__(self, port, host='127.0.0.1', registry=metrics.REGISTRY):
+        self.host = host
+        self.port = port
+        self.registry = registry
+        self.httpd = None
+        self.thread = None
+
+    def start(self):
+        handler = type('MetricsHandler', (_MetricsHandler,), {'registry': self.registry})
+        self.httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='metrics-server', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+            self.thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/metrics"
@@ -0,0 +1,141 @@
+"""Per-stage timers and an optional sampling profiler for slow runs.
+
+Translation code wraps its stages in PROFILER.stage(name): parsing the
+input, cache and memory lookups, requests to an online service, offline
+model inference, saving the cache and writing outputs. While profiling is
+off a stage costs one attribute check. When a run is profiled (Settings ->
+Monitoring, or cli.py --profile) the totals are written as a breakdown
+table. With sampling, a background thread also records the Python stack
+of every thread every few milliseconds. The stacks are written in the
+collapsed format that speedscope (https://www.speedscope.app) and
+flamegraph.pl read.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from app_paths import get_app_dir
+from events import EVENTS
+
+# Report order; stages not listed here come after them
+STAGES = ('parse', 'cache', 'shared_cache', 'memory', 'request', 'inference', 'cache_save', 'write')
+SAMPLE_INTERVAL = 0.01
+
+
+class _Sampler(threading.Thread):
+    def __init__(self, interval):
+        super().__init__(name='profile-sampler', daemon=True)
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.stacks = Counter()
+        self.samples = 0
+
+    def run(self):
+        own = threading.get_ident()
+        while not self.stopped.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+
+class Profiler:
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.totals = {}  # stage -> (calls, seconds)
+        self.started = 0.0
+        self.sampler = None
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                calls, seconds = self.totals.get(name, (0, 0.0))
+                self.totals[name] = (calls + 1, seconds + elapsed)
+
+    def start(self, sample=False, interval=SAMPLE_INTERVAL):
+        if self.enabled:
+            return
+        with self.lock:
+            self.totals = {}
+        self.started = time.perf_counter()
+        self.enabled = True
+        if sample:
+            self.sampler = _Sampler(interval)
+            self.sampler.start()
+
+    def breakdown(self, elapsed=None):
+        """The stage totals as a text table."""
+        with self.lock:
+            totals = dict(self.totals)
+        stages = [stage for stage in STAGES if stage in totals] + sorted(set(totals) - set(STAGES))
+        measured = sum(seconds for _, seconds in totals.values())
+        lines = []
+        if elapsed is not None:
+            # Stages of parallel threads overlap, so their sum can exceed the run time
+            lines.append(f"Run time {elapsed:.2f}s, time in stages {measured:.2f}s")
+        lines.append(f"{'stage':<14}{'calls':>8}{'total s':>11}{'mean ms':>11}{'share':>8}")
+        for stage in stages:
+            calls, seconds = totals[stage]
+            share = seconds / measured * 100 if measured else 0
+            lines.append(f"{stage:<14}{calls:>8}{seconds:>11.3f}{seconds / calls * 1000:>11.2f}{share:>7.1f}%")
+        return '\n'.join(lines)
+
+    def stop(self, directory=None):
+        """Stop profiling and write the results.
+
+        Returns (breakdown text, breakdown file, collapsed stacks file or None);
+        (None, None, None) when profiling was not running.
+        """
+        if not self.enabled:
+            return None, None, None
+        self.enabled = False
+        elapsed = time.perf_counter() - self.started
+        sampler, self.sampler = self.sampler, None
+        if sampler:
+            sampler.stopped.set()
+            sampler.join()
+
+        folder = Path(directory) if directory else get_app_dir() / 'profiles'
+        folder.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        text = self.breakdown(elapsed)
+        report = folder / f"profile_{stamp}.txt"
+        stacks = None
+        try:
+            report.write_text(text + '\n', encoding='utf-8')
+            if sampler:
+                stacks = folder / f"profile_{stamp}.collapsed"
+                with open(stacks, 'w', encoding='utf-8') as f:
+                    for stack, count in sampler.stacks.most_common():
+                        f.write(f"{stack} {count}\n")
+        except OSError as e:
+            EVENTS.warning('profile', "Could not write the profile to %s: %s", folder, e)
+            return text, None, None
+        EVENTS.info('profile', "Profile of %.1fs written to %s%s", elapsed, report,
+                    f" ({sampler.samples} samples in {stacks.name})" if stacks else "")
+        return text, report, stacks
+
+
+PROFILER = Profiler()
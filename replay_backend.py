@@ -0,0 +1,173 @@
+import json
+import os
+import random
+import statistics
+import threading
+import time
+
+SEPARATOR = "\n\n\n"
+
+
+class ReplayThrottleError(Exception):
+    pass
+
+
+class ReplayMissError(Exception):
+    pass
+
+
+class ReplayRecordedError(Exception):
+    pass
+
+
+class TranslationRecorder:
+    """Appends every request/response pair of wrapped translators to a JSONL file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def wrap(self, translator, target):
+        return RecordingTranslator(translator, self, target)
+
+    def write(self, record):
+        line = json.dumps(record, ensure_ascii=False)
+        with self.lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+
+class RecordingTranslator:
+    def __init__(self, inner, recorder, target):
+        self.inner = inner
+        self.recorder = recorder
+        self.target = target
+
+    def translate(self, text):
+        start_time = time.perf_counter()
+        try:
+            response = self.inner.translate(text)
+        except Exception as e:
+            self.recorder.write({'target': self.target, 'text': text, 'error': str(e),
+                                 'latency': time.perf_counter() - start_time, 'time': time.time()})
+            raise
+        self.recorder.write({'target': self.target, 'text': text, 'response': response,
+                             'latency': time.perf_counter() - start_time, 'time': time.time()})
+        return response
+
+
+class ReplayBackend:
+    """Serves recorded translations offline with the recorded latencies.
+
+    speed scales the waits (2.0 replays twice as fast, 0 disables them).
+    throttle_rate and split_mismatch_rate inject rate-limit errors and
+    responses with a lost segment separator, so retry and mismatch handling
+    in SubtitleTranslator can be load tested without a network.
+    """
+
+    def __init__(self, path, speed=1.0, throttle_rate=0.0, split_mismatch_rate=0.0, seed=0, echo_misses=True):
+        self.path = path
+        self.speed = speed
+        self.throttle_rate = throttle_rate
+        self.split_mismatch_rate = split_mismatch_rate
+        self.seed = seed
+        self.echo_misses = echo_misses
+        self.lock = threading.Lock()
+        self.responses = {}  # (target, text) -> [(response or None, error or None, latency)]
+        self.segments = {}  # (target, segment) -> translated segment, from evenly split batches
+        self.latencies = []
+        self._load()
+        self.reset()
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            os.environ['SRT_MAKER_REPLAY'],
+            speed=float(os.environ.get('SRT_MAKER_REPLAY_SPEED', 1.0)),
+            throttle_rate=float(os.environ.get('SRT_MAKER_REPLAY_THROTTLE', 0.0)),
+            split_mismatch_rate=float(os.environ.get('SRT_MAKER_REPLAY_MISMATCH', 0.0)),
+        )
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                key = (record['target'], record['text'])
+                self.responses.setdefault(key, []).append(
+                    (record.get('response'), record.get('error'), record.get('latency', 0.0)))
+                self.latencies.append(record.get('latency', 0.0))
+                if record.get('response') is not None:
+                    sources = record['text'].split(SEPARATOR)
+                    translations = record['response'].split(SEPARATOR)
+                    if len(sources) == len(translations):
+                        for source, translation in zip(sources, translations):
+                            self.segments[(record['target'], source)] = translation
+        self.default_latency = statistics.median(self.latencies) if self.latencies else 0.0
+
+    def reset(self):
+        with self.lock:
+            self.random = random.Random(self.seed)
+            self.cursors = {}
+            self.requests = 0
+            self.chars = 0
+            self.failures = 0
+            self.misses = 0
+
+    def translator_class(self, source='auto', target='en'):
+        return ReplayTranslator(self, target)
+
+    def _lookup(self, target, text):
+        # Exact recording first (cycling through repeats), then reassemble from known segments
+        entries = self.responses.get((target, text))
+        if entries:
+            cursor = self.cursors.get((target, text), 0)
+            self.cursors[(target, text)] = cursor + 1
+            return entries[cursor % len(entries)]
+        parts = [self.segments.get((target, segment)) for segment in text.split(SEPARATOR)]
+        if all(part is not None for part in parts):
+            return SEPARATOR.join(parts), None, self.default_latency
+        return None, None, None
+
+    def call(self, text, target):
+        with self.lock:
+            self.requests += 1
+            self.chars += len(text)
+            response, error, latency = self._lookup(target, text)
+            throttle = self.throttle_rate and self.random.random() < self.throttle_rate
+            mismatch = self.split_mismatch_rate and self.random.random() < self.split_mismatch_rate
+            if response is None and error is None:
+                self.misses += 1
+            if throttle or error:
+                self.failures += 1
+
+        if latency is None:
+            latency = self.default_latency
+        if self.speed:
+            time.sleep(latency / self.speed)
+
+        if throttle:
+            raise ReplayThrottleError("429 Too Many Requests (injected by replay backend)")
+        if error:
+            raise ReplayRecordedError(error)
+        if response is None:
+            if not self.echo_misses:
+                raise ReplayMissError(f"No recording for {target}: {text[:50]!r}")
+            response = text
+        if mismatch and SEPARATOR in response:
+            # Drop one separator, the way real services sometimes merge adjacent lines
+            response = response.replace(SEPARATOR, "\n", 1)
+        return response
+
+
+class ReplayTranslator:
+    def __init__(self, backend, target):
+        self.backend = backend
+        self.target = target
+
+    def translate(self, text):
+        return self.backend.call(text, self.target)
+
+
+RECORDER = TranslationRecorder(os.environ['SRT_MAKER_RECORD']) if os.environ.get('SRT_MAKER_RECORD') else None
@@ -0,0 +1,181 @@
+import os
+import re
+import sqlite3
+import threading
+from pathlib import Path
+
+from app_paths import get_app_dir
+from cue_parser import iter_cues
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cues (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files (id) ON DELETE CASCADE,
+    cue_index INTEGER NOT NULL,
+    line INTEGER NOT NULL,
+    start_ms INTEGER,
+    end_ms INTEGER,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cues_file ON cues (file_id, cue_index);
+"""
+
+# External-content FTS table over cues.text; trigram tokens let MATCH serve substring searches
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS cues_fts USING fts5 (text, content='cues', content_rowid='id', tokenize='trigram');
+CREATE TRIGGER IF NOT EXISTS cues_ai AFTER INSERT ON cues BEGIN
+    INSERT INTO cues_fts (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS cues_ad AFTER DELETE ON cues BEGIN
+    INSERT INTO cues_fts (cues_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+
+class SearchHit:
+    __slots__ = ('path', 'cue_index', 'line', 'start_ms', 'end_ms', 'text')
+
+    def __init__(self, path, cue_index, line, start_ms, end_ms, text):
+        self.path = path
+        self.cue_index = cue_index
+        self.line = line
+        self.start_ms = start_ms
+        self.end_ms = end_ms
+        self.text = text
+
+
+class SearchIndex:
+    """Persistent cue-level index over source subtitles and their translations.
+
+    sync() only re-parses files whose size or mtime changed, and searches run
+    against the FTS index instead of re-reading every file.
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = str(db_path or get_app_dir() / 'search_index.db')
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        # SQLite's own lower() only folds ASCII; short queries must match "É" the way the per-line check does
+        self.conn.create_function('lower', 1, str.lower, deterministic=True)
+        self.conn.executescript(SCHEMA)
+        try:
+            self.conn.executescript(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite builds without FTS5/trigram fall back to scanning the cues table
+            self.has_fts = False
+        self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def sync(self, paths):
+        """Bring the index up to date for paths; returns the number of files (re)indexed."""
+        changed = 0
+        with self.lock:
+            known = {}
+            for path in paths:
+                row = self.conn.execute("SELECT id, mtime_ns, size FROM files WHERE path = ?", (str(path),)).fetchone()
+                known[str(path)] = row
+        for path, row in known.items():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                if row:
+                    self.remove(path)
+                continue
+            if row and row[1] == stat.st_mtime_ns and row[2] == stat.st_size:
+                continue
+            self.index_file(path, stat)
+            changed += 1
+        return changed
+
+    def index_file(self, path, stat=None):
+        stat = stat or os.stat(path)
+        try:
+            cues = [(cue.index, cue.line, cue.start, cue.end, cue.text) for cue in iter_cues(path)]
+        except OSError:
+            cues = []
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM files WHERE path = ?", (str(path),))
+            file_id = self.conn.execute(
+                "INSERT INTO files (path, mtime_ns, size) VALUES (?, ?, ?)",
+                (str(path), stat.st_mtime_ns, stat.st_size)
+            ).lastrowid
+            self.conn.executemany(
+                "INSERT INTO cues (file_id, cue_index, line, start_ms, end_ms, text) VALUES (?, ?, ?, ?, ?, ?)",
+                [(file_id,) + cue for cue in cues]
+            )
+
+    def remove(self, path):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM files WHERE path = ?", (str(path),))
+
+    def search(self, query, paths=None, case_sensitive=False, regex=False, limit=5000):
+        """Yield SearchHit per matching line of a cue, limited to paths when given."""
+        if regex:
+            pattern = re.compile(query, 0 if case_sensitive else re.IGNORECASE)
+            matches_line = lambda line: pattern.search(line) is not None
+            rows = self._rows(paths)
+        else:
+            needle = query if case_sensitive else query.lower()
+            matches_line = (lambda line: needle in line) if case_sensitive else (lambda line: needle in line.lower())
+            rows = self._rows(paths, query)
+
+        found = 0
+        for path, cue_index, line, start_ms, end_ms, text in rows:
+            for offset, text_line in enumerate(text.split('\n')):
+                if matches_line(text_line):
+                    yield SearchHit(path, cue_index, line + offset, start_ms, end_ms, text_line)
+                    found += 1
+                    if found >= limit:
+                        return
+
+    def _rows(self, paths, query=None):
+        sql = ("SELECT f.path, c.cue_index, c.line, c.start_ms, c.end_ms, c.text FROM cues c "
+               "JOIN files f ON f.id = c.file_id")
+        where = []
+        params = []
+        if query is not None:
+            if self.has_fts and len(query) >= 3:
+                # Trigram MATCH is case-insensitive; exact case is checked per line afterwards
+                where.append("c.id IN (SELECT rowid FROM cues_fts WHERE cues_fts MATCH ?)")
+                params.append('"' + query.replace('"', '""') + '"')
+            else:
+                where.append("instr(lower(c.text), ?) > 0")
+                params.append(query.lower())
+        with self.lock:
+            if paths is not None:
+                self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS search_paths (path TEXT PRIMARY KEY)")
+                self.conn.execute("DELETE FROM search_paths")
+                self.conn.executemany("INSERT OR IGNORE INTO search_paths (path) VALUES (?)",
+                                      [(str(p),) for p in paths])
+                where.append("f.path IN (SELECT path FROM search_paths)")
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            sql += " ORDER BY f.path, c.cue_index"
+            rows = self.conn.execute(sql, params).fetchall()
+        return rows
+
+
+def translated_outputs(source_path):
+    # Output locations used by TranslationWorker.process_file for this source
+    path = Path(source_path)
+    outputs = []
+    per_file = path.parent / path.stem
+    if per_file.is_dir():
+        outputs.extend(p for p in per_file.glob('*.srt') if p.name != path.name)
+    shared = path.parent / 'translated_subtitles'
+    if shared.is_dir():
+        outputs.extend(shared.glob(f'{path.stem}_*.srt'))
+    return [str(p) for p in outputs]
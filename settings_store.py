@@ -0,0 +1,156 @@
+"""Application settings kept in memory and written to disk in the background.
+
+The dict returned by load() is the source of truth while the app runs.
+save() snapshots it and schedules a write; every save() within the next
+DEBOUNCE_SECONDS is folded into that same write, so a burst of dropped
+files or watch events costs one disk write. Files are replaced atomically
+and carry a schema version that load() migrates forward.
+"""
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from app_paths import get_app_dir
+from events import EVENTS
+
+SCHEMA_VERSION = 1
+DEBOUNCE_SECONDS = 0.5
+
+DEFAULTS = {
+    'organize_by_file': True,
+    'move_original': True,
+    'overwrite_existing': False,
+    'batch_size': 50,
+    'retry_count': 3,
+    'enable_cache': True,
+    'translation_memory': True,
+    'memory_threshold': 0.9,
+    'cache_max_mb': 500,
+    'cache_language_max_mb': 100,
+    'cache_policy': 'lru',
+    'cache_server': '',
+    'cache_server_token': '',
+    'recent_files': [],
+    'profiles': {},
+    'watchlist': [],
+    'ui_language': 'en',
+    'output_naming': '{filename}_{language}',
+    'output_encoding': 'utf-8',
+    'layout_state': None,
+    'translation_service': 'google',
+    'use_gpu': False,
+    'offline_mode': False,
+    'offline_model': 'marian',
+    'metrics_port': 0,
+    'profiling': 'off'
+}
+
+
+def _from_unversioned(settings):
+    # Files written before versioning only lack keys added since; DEFAULTS fills those in
+    return settings
+
+
+# version -> function upgrading settings of that version to version + 1
+MIGRATIONS = {
+    0: _from_unversioned,
+}
+
+
+def migrate(settings):
+    version = settings.pop('schema_version', 0)
+    if version > SCHEMA_VERSION:
+        # Written by a newer release; keep every key so downgrading loses nothing
+        EVENTS.warning('settings', "Settings file has schema version %s, this build knows %s",
+                       version, SCHEMA_VERSION)
+        return settings
+    for step in range(version, SCHEMA_VERSION):
+        settings = MIGRATIONS[step](settings)
+    return settings
+
+
+class SettingsStore:
+    def __init__(self, path=None, fallback_path=None, delay=DEBOUNCE_SECONDS):
+        self.path = Path(path or get_app_dir() / 'settings.json')
+        self.fallback_path = Path(fallback_path or Path(os.path.expanduser('~')) / 'SRT_Maker_settings.json')
+        self.delay = delay
+        self.data = {}
+        self.lock = threading.Lock()  # guards pending and timer
+        self.write_lock = threading.Lock()  # taken before lock, so snapshots are written in the order taken
+        self.pending = None  # serialized settings not written yet
+        self.timer = None
+        self.writes = 0
+        self.last_error = None
+
+    def load(self):
+        loaded = {}
+        # The fallback holds settings when the main location was not writable, and older releases
+        # saved every change there once settings.json existed; the newer of the two is the current one
+        paths = [path for path in (self.path, self.fallback_path) if path.exists()]
+        paths.sort(key=lambda path: path.stat().st_mtime, reverse=True)
+        for path in paths:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    loaded = json.load(f)
+                break
+            except (OSError, ValueError) as e:
+                EVENTS.error('settings', "Error loading settings from %s: %s", path, e)
+        self.data = dict(DEFAULTS)
+        self.data.update(migrate(loaded))
+        return self.data
+
+    def save(self):
+        """Schedule a write of the current settings and return immediately."""
+        snapshot = json.dumps(dict(self.data, schema_version=SCHEMA_VERSION), indent=4, ensure_ascii=False)
+        with self.lock:
+            self.pending = snapshot
+            if self.timer is None:
+                self.timer = threading.Timer(self.delay, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def flush(self):
+        """Write pending changes now; returns False if they could not be written."""
+        with self.write_lock:
+            # Taking the snapshot under write_lock keeps a timer flush from writing an older
+            # snapshot after a newer one that an explicit flush() wrote meanwhile
+            with self.lock:
+                if self.timer is not None:
+                    self.timer.cancel()
+                    self.timer = None
+                snapshot, self.pending = self.pending, None
+            if snapshot is None:
+                return self.last_error is None
+            try:
+                self._write(self.path, snapshot)
+            except OSError as e:
+                try:
+                    self._write(self.fallback_path, snapshot)
+                except OSError as e2:
+                    self.last_error = e2
+                    EVENTS.error('settings', "Failed to save settings: %s", e2)
+                    return False
+                EVENTS.warning('settings', "Could not write %s (%s), settings saved to %s",
+                               self.path, e, self.fallback_path)
+                self.path = self.fallback_path
+            self.writes += 1
+            self.last_error = None
+        return True
+
+    def close(self):
+        return self.flush()
+
+    def _write(self, path, data):
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
@@ -0,0 +1,87 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_queue import JobQueue, QUEUED, RUNNING, DONE, FAILED
+
+LANGUAGES = {'Spanish': 'es', 'German': 'de'}
+
+
+class JobQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.queue = JobQueue(os.path.join(self.folder.name, 'jobs.db'), max_retries=1)
+
+    def tearDown(self):
+        self.queue.close()
+        self.folder.cleanup()
+
+    def states(self):
+        with self.queue.lock:
+            return dict(self.queue.conn.execute("SELECT lang_code, state FROM jobs"))
+
+    def retries(self):
+        with self.queue.lock:
+            return dict(self.queue.conn.execute("SELECT lang_code, retries FROM jobs"))
+
+    def test_enqueue_skips_outstanding_duplicates(self):
+        self.assertEqual(self.queue.enqueue('a.srt', LANGUAGES), 2)
+        self.assertEqual(self.queue.enqueue('a.srt', LANGUAGES), 0)
+        self.assertEqual(self.queue.enqueue('a.srt', {}), 0)
+        self.assertEqual(self.queue.pending_count(), 2)
+
+    def test_claim_takes_the_oldest_file(self):
+        self.queue.enqueue('a.srt', LANGUAGES)
+        self.queue.enqueue('b.srt', LANGUAGES)
+        file_path, jobs = self.queue.claim_next()
+        self.assertEqual(file_path, 'a.srt')
+        self.assertEqual({code: language for code, (_, language) in jobs.items()},
+                         {'es': 'Spanish', 'de': 'German'})
+        self.assertEqual(self.queue.pending_files(10), ['b.srt'])
+        self.assertEqual(self.queue.counts()[RUNNING], 2)
+
+    def test_fail_requeues_until_retries_run_out(self):
+        self.queue.enqueue('a.srt', {'Spanish': 'es'})
+        _, jobs = self.queue.claim_next()
+        self.queue.mark_failed(jobs['es'][0], 'timeout')
+        self.assertEqual(self.states(), {'es': QUEUED})
+        _, jobs = self.queue.claim_next()
+        self.queue.mark_failed(jobs['es'][0], 'timeout')
+        self.assertEqual(self.states(), {'es': FAILED})
+        self.assertIsNone(self.queue.claim_next())
+
+    def test_fail_leaves_finished_languages_alone(self):
+        self.queue.enqueue('a.srt', LANGUAGES)
+        _, jobs = self.queue.claim_next()
+        self.queue.mark_done(jobs['es'][0])
+        self.queue.mark_failed(jobs['de'][0], 'bad file')
+        # The run fails as a whole afterwards: every job it held is reported again
+        for job_id, _ in jobs.values():
+            self.queue.mark_failed(job_id, 'worker crashed')
+        self.assertEqual(self.states(), {'es': DONE, 'de': QUEUED})
+        self.assertEqual(self.retries(), {'es': 0, 'de': 1})
+
+    def test_release_does_not_charge_a_retry(self):
+        self.queue.enqueue('a.srt', LANGUAGES)
+        _, jobs = self.queue.claim_next()
+        self.queue.mark_done(jobs['es'][0])
+        self.queue.release(job_id for job_id, _ in jobs.values())
+        self.assertEqual(self.states(), {'es': DONE, 'de': QUEUED})
+        self.assertEqual(self.retries(), {'es': 0, 'de': 0})
+
+    def test_recover_charges_interrupted_jobs(self):
+        self.queue.enqueue('a.srt', LANGUAGES)
+        self.queue.claim_next()
+        self.assertEqual(self.queue.recover(), 2)
+        self.assertEqual(self.states(), {'es': QUEUED, 'de': QUEUED})
+        self.queue.claim_next()
+        # Out of retries: a file that keeps crashing the app ends up failed
+        self.assertEqual(self.queue.recover(), 0)
+        self.assertEqual(self.states(), {'es': FAILED, 'de': FAILED})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import sqlite3
+import threading
+import time
+
+import metrics
+from app_paths import get_app_dir
+
+# (resolution in seconds, how long rows at that resolution are kept before rolling up)
+RESOLUTIONS = (
+    (60, 7 * 86400),
+    (3600, 90 * 86400),
+    (86400, None),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    series TEXT NOT NULL,
+    label TEXT NOT NULL,
+    resolution INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (series, label, resolution, ts)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_samples_rollup ON samples (resolution, ts);
+"""
+
+
+class TimeSeriesStore:
+    """Run metrics bucketed by minute, rolled up to hours and days as they age.
+
+    Values are additive (cue counts, seconds, cache lookups), so rolling up is
+    a plain sum and history stays a few rows per series per day.
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = str(db_path or get_app_dir() / 'metrics_history.db')
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+        self.downsample()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def record(self, samples, ts=None):
+        # samples: iterable of (series, label, value)
+        resolution = RESOLUTIONS[0][0]
+        bucket = int(ts if ts is not None else time.time()) // resolution * resolution
+        rows = [(series, str(label), resolution, bucket, value) for series, label, value in samples if value]
+        if not rows:
+            return
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO samples (series, label, resolution, ts, value) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (series, label, resolution, ts) DO UPDATE SET value = value + excluded.value",
+                rows
+            )
+
+    def downsample(self, now=None):
+        now = now or time.time()
+        with self.lock, self.conn:
+            for (resolution, keep), (coarser, _) in zip(RESOLUTIONS, RESOLUTIONS[1:]):
+                cutoff = int(now - keep)
+                self.conn.execute(
+                    "INSERT INTO samples (series, label, resolution, ts, value) "
+                    "SELECT series, label, ?, ts / ? * ?, SUM(value) FROM samples "
+                    "WHERE resolution = ? AND ts < ? GROUP BY series, label, ts / ? "
+                    "ON CONFLICT (series, label, resolution, ts) DO UPDATE SET value = value + excluded.value",
+                    (coarser, coarser, coarser, resolution, cutoff, coarser)
+                )
+                self.conn.execute(
+                    "DELETE FROM samples WHERE resolution = ? AND ts < ?", (resolution, cutoff)
+                )
+
+    def totals(self, series, since=None):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT label, SUM(value) FROM samples WHERE series = ? AND ts >= ? GROUP BY label",
+                (series, int(since or 0))
+            ).fetchall()
+        return dict(rows)
+
+    def timeline(self, series, bucket=86400, since=None):
+        # {bucket start: {label: value}}, regrouped to the requested bucket size
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT ts / ? * ?, label, SUM(value) FROM samples WHERE series = ? AND ts >= ? "
+                "GROUP BY 1, label ORDER BY 1",
+                (bucket, bucket, series, int(since or 0))
+            ).fetchall()
+        result = {}
+        for ts, label, value in rows:
+            result.setdefault(ts, {})[label] = value
+        return result
+
+
+class RunRecorder:
+    """Turns registry deltas over one translation run into time-series samples."""
+
+    SOURCES = {
+        'cues': metrics.CUES_TRANSLATED,
+        'translate_seconds': metrics.TRANSLATE_SECONDS,
+        'files': metrics.FILES_PROCESSED,
+        'cache': metrics.CACHE_LOOKUPS,
+    }
+
+    def __init__(self):
+        self.baseline = None
+
+    def _snapshot(self):
+        snapshot = {}
+        for series, metric in self.SOURCES.items():
+            for values, child in metric.children():
+                # Cache lookups are keyed by result only; languages are tracked under 'cues'
+                label = values[-1] if values else ''
+                key = (series, label)
+                snapshot[key] = snapshot.get(key, 0) + child.get()
+        return snapshot
+
+    def start(self):
+        self.baseline = self._snapshot()
+
+    def finish(self, store):
+        if self.baseline is None:
+            return
+        current = self._snapshot()
+        samples = [(series, label, value - self.baseline.get((series, label), 0))
+                   for (series, label), value in current.items()]
+        self.baseline = None
+        store.record(samples)
@@ -0,0 +1,793 @@
+"""Translation core shared by the GUI, the command line and the benchmark.
+
+Nothing in here imports PyQt5 or matplotlib, so it can run headless.
+"""
+import importlib.util
+import os
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import pysrt
+import ass
+
+import metrics
+import replay_backend
+from cache_server import CacheClient
+from cache_store import LanguageCache, cache_key, default_store
+from events import EVENTS
+from profiling import PROFILER
+from translation_memory import TranslationMemory, DEFAULT_THRESHOLD, normalize
+
+# torch and transformers take seconds to import; only check they are installed here
+TRANSFORMERS_AVAILABLE = importlib.util.find_spec('transformers') is not None
+_gpu_available = None
+
+
+def torch_installed():
+    return importlib.util.find_spec('torch') is not None
+
+
+def gpu_available():
+    """Import torch on first call and report whether CUDA can be used."""
+    global _gpu_available
+    if _gpu_available is None:
+        try:
+            import torch
+            _gpu_available = torch.cuda.is_available()
+            EVENTS.info('startup', "PyTorch is available. GPU support: %s", _gpu_available)
+        except ImportError:
+            EVENTS.info('startup', "PyTorch is not installed or not available")
+            _gpu_available = False
+    return _gpu_available
+
+
+def google_translator(source='auto', target='en'):
+    # deep_translator pulls in requests and BeautifulSoup; defer until a request is made
+    from deep_translator import GoogleTranslator
+    return GoogleTranslator(source=source, target=target)
+
+
+# Offline Translation Models
+class OfflineTranslator:
+    def __init__(self, model_name='marian'):
+        self.model_name = model_name
+        self.models = {}
+        self.tokenizers = {}
+        
+    def get_model_key(self, source_lang, target_lang):
+        if source_lang == 'auto':
+            source_lang = 'en'
+        return f"{source_lang}-{target_lang}"
+    
+    def load_model(self, source_lang, target_lang):
+        if not TRANSFORMERS_AVAILABLE:
+            raise Exception("Transformers library not available")
+            
+        model_key = self.get_model_key(source_lang, target_lang)
+        
+        if model_key in self.models:
+            return self.models[model_key], self.tokenizers[model_key]
+        
+        try:
+            from transformers import MarianMTModel, MarianTokenizer, pipeline
+            start_time = time.perf_counter()
+            if self.model_name == 'marian':
+                model_name = f"Helsinki-NLP/opus-mt-{source_lang}-{target_lang}"
+                tokenizer = MarianTokenizer.from_pretrained(model_name)
+                model = MarianMTModel.from_pretrained(model_name)
+            else:
+                model = pipeline("translation", model=f"Helsinki-NLP/opus-mt-{source_lang}-{target_lang}")
+                tokenizer = None
+            metrics.MODEL_LOAD_SECONDS.labels(self.model_name).observe(time.perf_counter() - start_time)
+                
+            self.models[model_key] = model
+            self.tokenizers[model_key] = tokenizer
+            metrics.OFFLINE_MODELS_LOADED.inc()
+            return model, tokenizer
+            
+        except Exception as e:
+            raise Exception(f"Model not available for {source_lang}->{target_lang}: {e}")
+    
+    def translate(self, text, target_lang, source_lang='en'):
+        try:
+            model, tokenizer = self.load_model(source_lang, target_lang)
+            
+            if tokenizer:
+                inputs = tokenizer(text, return_tensors="pt", padding=True, truncation=True, max_length=512)
+                translated = model.generate(**inputs)
+                result = tokenizer.decode(translated[0], skip_special_tokens=True)
+            else:
+                result = model(text)[0]['translation_text']
+                
+            return result
+        except Exception as e:
+            return f"[Translation Error: {e}]"
+
+# Translation Services
+class TranslationService:
+    def __init__(self, name, translator_class, is_offline=False, max_chars=None):
+        self.name = name
+        self.translator_class = translator_class
+        self.is_offline = is_offline
+        self.max_chars = max_chars  # largest request the service accepts, None for no limit
+    
+    def translate(self, text, target_lang, source_lang='auto'):
+        if self.is_offline:
+            translator = self.translator_class()
+            return translator.translate(text, target_lang, source_lang)
+        else:
+            translator = self.translator_class(source=source_lang, target=target_lang)
+            return translator.translate(text)
+
+TRANSLATION_SERVICES = {
+    'google': TranslationService('Google Translate (Recommended)', google_translator, False, max_chars=5000),
+    'marian': TranslationService('Marian MT (Offline)', OfflineTranslator, True) if TRANSFORMERS_AVAILABLE else None,
+    'opus': TranslationService('Opus-MT (Offline)', lambda: OfflineTranslator('opus'), True) if TRANSFORMERS_AVAILABLE else None
+}
+
+# Remove None services
+TRANSLATION_SERVICES = {k: v for k, v in TRANSLATION_SERVICES.items() if v is not None}
+
+# Load testing: SRT_MAKER_REPLAY=<recording.jsonl> serves a recording made with SRT_MAKER_RECORD offline
+if os.environ.get('SRT_MAKER_REPLAY'):
+    TRANSLATION_SERVICES['replay'] = TranslationService(
+        'Replay (load testing)', replay_backend.ReplayBackend.from_env().translator_class, False)
+
+# Default languages that are enabled
+DEFAULT_LANGUAGES = {
+    "Spanish": "es", "Dutch": "nl", "Russian": "ru", "German": "de",
+    "Turkish": "tr", "Chinese": "zh-CN", "Japanese": "ja", "Persian": "fa",
+    "Portuguese": "pt", "Arabic": "ar", "Tamil": "ta", "Telugu": "te",
+    "Malayalam": "ml", "Bengali": "bn", "Indonesian": "id", "Filipino": "tl"
+}
+
+class _Languages(Mapping):
+    """All languages deep-translator knows, built on first use."""
+    
+    def __init__(self):
+        self._languages = None
+    
+    def _load(self):
+        if self._languages is None:
+            from deep_translator.constants import GOOGLE_LANGUAGES_TO_CODES
+            self._languages = {name.title(): code for name, code in GOOGLE_LANGUAGES_TO_CODES.items()}
+        return self._languages
+    
+    def __getitem__(self, name):
+        return self._load()[name]
+    
+    def __iter__(self):
+        return iter(self._load())
+    
+    def __len__(self):
+        return len(self._load())
+
+# Get all available languages from deep-translator
+LANGUAGES = _Languages()
+
+SUPPORTED_FORMATS = ('.srt', '.ass', '.txt')
+
+def is_output(path):
+    # Outputs live in translated_subtitles/ or in a folder named after their source file
+    folder = Path(path).parent
+    if folder.name == 'translated_subtitles':
+        return True
+    return any((folder.parent / (folder.name + ext)).is_file() for ext in SUPPORTED_FORMATS)
+
+def collect_files(inputs, recursive=False):
+    """Subtitle files among the given files and folders, without translated outputs."""
+    files = []
+    seen = set()
+    for value in inputs:
+        path = Path(value)
+        if path.is_dir():
+            candidates = sorted(path.rglob('*') if recursive else path.iterdir())
+        elif path.is_file():
+            candidates = [path]
+        else:
+            raise FileNotFoundError(f"No such file or folder: {value}")
+        for candidate in candidates:
+            if candidate.suffix.lower() not in SUPPORTED_FORMATS or not candidate.is_file():
+                continue
+            if recursive and is_output(candidate):
+                continue
+            key = str(candidate.resolve())
+            if key not in seen:
+                seen.add(key)
+                files.append(str(candidate))
+    return files
+
+def resolve_languages(values):
+    """Map language names or codes to the {name: code} dict the processors expect."""
+    names = {code: name for name, code in LANGUAGES.items()}
+    by_name = {name.lower(): name for name in LANGUAGES}
+    languages = {}
+    for value in values:
+        value = value.strip()
+        if value in names:
+            languages[names[value]] = value
+        elif value.lower() in by_name:
+            name = by_name[value.lower()]
+            languages[name] = LANGUAGES[name]
+        else:
+            raise ValueError(f"Unknown language: {value}")
+    return languages
+
+REQUEST_SEPARATOR = "\n\n\n"
+
+def pack_bounds(texts, max_chars):
+    """End index of each run of texts whose joined request fits in max_chars.
+    
+    A text longer than max_chars gets a request of its own; no max_chars means
+    one request for everything.
+    """
+    if not max_chars:
+        return [len(texts)] if texts else []
+    bounds = []
+    start = 0
+    size = 0
+    for i, text in enumerate(texts):
+        if i > start and size + len(REQUEST_SEPARATOR) + len(text) > max_chars:
+            bounds.append(i)
+            start = i
+            size = len(text)
+        else:
+            size += len(text) + (len(REQUEST_SEPARATOR) if i > start else 0)
+    if texts:
+        bounds.append(len(texts))
+    return bounds
+
+def strip_speaker(text):
+    # "NAME: line" is looked up and translated as "line"
+    return text.split(":")[1].strip() if ":" in text else text
+
+class SubtitleTranslator:
+    def __init__(self, dest_lang, stats=None, service='google', share_cache_with=None, memory=None,
+                 shared_cache=None):
+        self.dest_lang = dest_lang
+        self.service = service
+        self.memory = memory  # TranslationMemory consulted on exact cache misses
+        self.shared_cache = shared_cache  # CacheClient of other workstations, asked before the memory
+        if share_cache_with is not None:
+            # Backends are not thread-safe, so concurrent runs use one translator per
+            # thread that all read and write the same cache
+            self.cache = share_cache_with.cache
+        else:
+            self.cache = self._load_cache()
+        self.batch_size = 50
+        self.max_chars = None
+        self.stats = stats
+        
+        # Initialize translator based on service
+        if service in TRANSLATION_SERVICES:
+            service_obj = TRANSLATION_SERVICES[service]
+            self.max_chars = service_obj.max_chars
+            if service_obj.is_offline:
+                self.translator = service_obj.translator_class()
+                self.is_offline = True
+            else:
+                self.translator = service_obj.translator_class(source='auto', target=dest_lang)
+                self.is_offline = False
+        else:
+            self.translator = google_translator(source='auto', target=dest_lang)
+            self.max_chars = TRANSLATION_SERVICES['google'].max_chars
+            self.is_offline = False
+        
+        if replay_backend.RECORDER and not self.is_offline:
+            self.translator = replay_backend.RECORDER.wrap(self.translator, dest_lang)
+        
+        # Bind metric children once; translate_batch runs for every batch of every file
+        self._cache_hit_metric = metrics.CACHE_LOOKUPS.labels(dest_lang, 'hit')
+        self._cache_miss_metric = metrics.CACHE_LOOKUPS.labels(dest_lang, 'miss')
+        self._shared_hit_metric = metrics.CACHE_LOOKUPS.labels(dest_lang, 'shared')
+        self._memory_hit_metric = metrics.CACHE_LOOKUPS.labels(dest_lang, 'memory')
+        self._latency_metric = metrics.REQUEST_LATENCY.labels(service, dest_lang)
+        self._chars_metric = metrics.REQUEST_CHARS.labels(service)
+        self._ok_metric = metrics.TRANSLATION_REQUESTS.labels(service, dest_lang, 'ok')
+        self._error_metric = metrics.TRANSLATION_REQUESTS.labels(service, dest_lang, 'error')
+    
+    def _request(self, text):
+        # Single round trip to the translation backend, timed for the metrics registry
+        start_time = time.perf_counter()
+        with PROFILER.stage('inference' if self.is_offline else 'request'):
+            try:
+                if self.is_offline:
+                    result = self.translator.translate(text, self.dest_lang, 'en')
+                else:
+                    result = self.translator.translate(text)
+            except Exception:
+                self._error_metric.inc()
+                raise
+        self._latency_metric.observe(time.perf_counter() - start_time)
+        self._chars_metric.observe(len(text))
+        self._ok_metric.inc()
+        return result
+    
+    def _load_cache(self):
+        return LanguageCache(self.dest_lang, default_store())
+    
+    def _save_cache(self):
+        with PROFILER.stage('cache_save'):
+            try:
+                self.cache.flush()
+                if self.shared_cache is not None:
+                    self.shared_cache.flush()
+            except Exception as e:
+                # Cache errors are less critical, just log them
+                EVENTS.error('cache', "Error saving cache: %s", e)
+    
+    def _get_cache_key(self, text):
+        return cache_key(text)
+    
+    def translate_batch(self, texts):
+        results = [None] * len(texts)
+        to_translate = []
+        indices = []
+        batch_start = time.perf_counter()
+        
+        EVENTS.debug('batch', "Batch of %d entries -> %s", len(texts), self.dest_lang)
+        
+        # Phase 1: cache lookups, then the shared cache and the translation memory for near-identical lines
+        cache_hits = 0
+        shared_hits = 0
+        memory_hits = 0
+        misses = []
+        with PROFILER.stage('cache'):
+            for i, text in enumerate(texts):
+                if not text.strip():
+                    EVENTS.debug('batch', "Empty subtitle at position %d skipped", i)
+                    results[i] = text
+                    continue
+                
+                clean_text = strip_speaker(text)
+                cache_key = self._get_cache_key(clean_text)
+                
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    cache_hits += 1
+                    results[i] = cached
+                    EVENTS.debug('cache', "[%4d] Cache hit: %.30r", i, clean_text)
+                    continue
+                misses.append((i, clean_text, cache_key))
+        
+        # One request for all the misses; what the other workstations know becomes part of the local cache
+        shared = {}
+        if self.shared_cache is not None and misses:
+            with PROFILER.stage('shared_cache'):
+                shared = self.shared_cache.lookup(self.dest_lang, [key for _, _, key in misses])
+            if shared:
+                self.cache.update(shared)
+        
+        with PROFILER.stage('memory'):
+            for i, clean_text, cache_key in misses:
+                translation = shared.get(cache_key)
+                if translation is not None:
+                    shared_hits += 1
+                    results[i] = translation
+                    EVENTS.debug('cache', "[%4d] Shared cache hit: %.30r", i, clean_text)
+                    continue
+                
+                match = self.memory.lookup(clean_text, self.dest_lang) if self.memory is not None else None
+                if match:
+                    memory_hits += 1
+                    results[i] = match.translation
+                    EVENTS.debug('cache', "[%4d] Memory hit (%.2f): %.30r ~ %.30r", i, match.score, clean_text,
+                                 match.source)
+                else:
+                    to_translate.append(clean_text)
+                    indices.append(i)
+        
+        if cache_hits:
+            self._cache_hit_metric.inc(cache_hits)
+        if shared_hits:
+            self._shared_hit_metric.inc(shared_hits)
+        if memory_hits:
+            self._memory_hit_metric.inc(memory_hits)
+        if to_translate:
+            self._cache_miss_metric.inc(len(to_translate))
+        
+        if texts:
+            EVENTS.debug('cache', "Cache efficiency: %d/%d entries (%.1f%%)", cache_hits, len(texts),
+                         cache_hits / len(texts) * 100)
+        
+        # Phase 2: translate the misses in requests no larger than the service accepts
+        start = 0
+        for end in pack_bounds(to_translate, self.max_chars):
+            self._translate_pack(to_translate[start:end], indices[start:end], results)
+            start = end
+        
+        EVENTS.info('batch', "%d entries -> %s: %d cached, %d shared, %d from memory, %d translated in %.2fs",
+                    len(texts), self.dest_lang, cache_hits, shared_hits, memory_hits, len(to_translate),
+                    time.perf_counter() - batch_start)
+        return results
+    
+    def _translate_pack(self, to_translate, indices, results):
+        new_entries = None
+        for retry in range(3):
+            try:
+                batch_text = REQUEST_SEPARATOR.join(to_translate)
+                EVENTS.debug('request', "Sending %d entries (%d chars), attempt %d", len(to_translate),
+                             len(batch_text), retry + 1)
+                
+                start_time = time.time()
+                translated_batch = self._request(batch_text)
+                EVENTS.debug('request', "Response received in %.2fs", time.time() - start_time)
+                translations = translated_batch.split(REQUEST_SEPARATOR)
+                
+                if len(translations) != len(to_translate):
+                    EVENTS.warning('batch', "Split mismatch: expected %d segments, received %d; translating individually",
+                                   len(to_translate), len(translations))
+                    translations = [self._request(text) for text in to_translate]
+                
+                # Phase 3: store results
+                entries = {}
+                for i, (idx, translation) in enumerate(zip(indices, translations)):
+                    clean_translation = translation.strip()
+                    # Fix escaped newlines and other common issues
+                    clean_translation = clean_translation.replace('\\n', '\n').replace('\\r', '\r')
+                    clean_translation = clean_translation.replace('\\t', '\t')
+                    results[idx] = clean_translation
+                    entries[self._get_cache_key(to_translate[i])] = clean_translation
+                    EVENTS.debug('translation', "%.30r -> %.30r", to_translate[i], clean_translation)
+                new_entries = entries
+                break
+            
+            except Exception as e:
+                if retry < 2:
+                    wait_time = 2 ** retry
+                    EVENTS.warning('retry', "Translation failed (attempt %d): %s; retrying in %ds", retry + 1, e, wait_time)
+                    time.sleep(wait_time)
+                else:
+                    EVENTS.error('retry', "All attempts failed, using original text: %s", e)
+                    for i, idx in enumerate(indices):
+                        results[idx] = to_translate[i]
+        if new_entries is None:
+            return
+        
+        # Outside the retries: a failure here must neither send the request again nor discard its results
+        self.cache.update(new_entries)
+        if self.shared_cache is not None:
+            try:
+                self.shared_cache.store(self.dest_lang, new_entries)
+            except Exception as e:
+                EVENTS.warning('cache', "Could not queue translations for the shared cache: %s", e)
+        if self.memory is not None:
+            try:
+                with PROFILER.stage('memory'):
+                    self.memory.add_many(self.dest_lang, zip(to_translate, (results[idx] for idx in indices)))
+            except Exception as e:
+                EVENTS.warning('cache', "Could not add translations to the translation memory: %s", e)
+    
+    def translate(self, text):
+        for retry in range(3):
+            try:
+                start_time = time.time()
+                
+                result = self._request(text)
+                
+                # Fix escaped newlines and other common issues
+                result = result.replace('\\n', '\n').replace('\\r', '\r').replace('\\t', '\t')
+                
+                EVENTS.debug('translation', "%.50r -> %.50r in %.2fs", text, result, time.time() - start_time)
+                return result
+                
+            except Exception as e:
+                if retry < 2:
+                    wait_time = 2 ** retry
+                    EVENTS.warning('retry', "Translation failed (attempt %d): %s; retrying in %ds", retry + 1, e, wait_time)
+                    time.sleep(wait_time)
+                else:
+                    EVENTS.error('retry', "All attempts failed, returning original text: %s", e)
+        
+        return text
+
+class FileProcessor:
+    """Translates subtitle files into one SRT per language.
+    
+    Progress is reported through optional callbacks, so the same code drives
+    the Qt worker thread, the command line and the benchmark. should_stop is
+    polled between batches.
+    """
+    
+    def __init__(self, languages, settings, stats=None, job_queue=None, jobs=None, on_progress=None,
+                 on_language_progress=None, on_subtitle_progress=None, on_language_done=None, should_stop=None):
+        self.languages = languages
+        self.settings = settings
+        self.stats = stats
+        self.job_queue = job_queue
+        self.jobs = jobs or {}  # lang_code -> job id in job_queue
+        self.on_progress = on_progress or (lambda message: None)
+        self.on_language_progress = on_language_progress or (lambda current, total: None)
+        self.on_subtitle_progress = on_subtitle_progress or (lambda current, total: None)
+        self.on_language_done = on_language_done or (lambda file_path, language, status, error: None)
+        self.should_stop = should_stop or (lambda: False)
+        self.memory = None
+        if settings.get('translation_memory', True):
+            self.memory = TranslationMemory(threshold=settings.get('memory_threshold', DEFAULT_THRESHOLD))
+        self.shared_cache = None
+        if settings.get('cache_server'):
+            self.shared_cache = CacheClient(settings['cache_server'], settings.get('cache_server_token') or None)
+    
+    @property
+    def is_stopped(self):
+        return self.should_stop()
+    
+    def create_translators(self, share_cache_with=None):
+        service = self.settings.get('translation_service', 'google')
+        share_cache_with = share_cache_with or {}
+        translators = {lang_code: SubtitleTranslator(lang_code, self.stats, service, share_cache_with.get(lang_code),
+                                                     self.memory, self.shared_cache)
+                       for lang_code in self.languages.values()}
+        if self.settings.get('max_request_chars'):
+            for translator in translators.values():
+                translator.max_chars = self.settings['max_request_chars']
+        return translators
+    
+    def output_file(self, file_path, language):
+        path = Path(file_path)
+        if self.settings.get('organize_by_file', True):
+            output_folder = path.parent / path.stem
+        else:
+            output_folder = path.parent / "translated_subtitles"
+        
+        # Generate custom filename
+        naming_template = self.settings.get('output_naming', '{filename}_{language}')
+        filename = naming_template.format(
+            filename=path.stem,
+            language=language,
+            date=datetime.now().strftime('%Y%m%d'),
+            time=datetime.now().strftime('%H%M%S')
+        )
+        return output_folder / f"{filename}.srt"
+    
+    def read_texts(self, file_path):
+        # The cue texts translate_srt / translate_ass_to_srt pass to translate_batch
+        ext = Path(file_path).suffix.lower()
+        if ext == '.srt' or (ext == '.txt' and self.is_srt_format(file_path)):
+            return [sub.text for sub in pysrt.open(file_path)]
+        if ext == '.ass':
+            with open(file_path, "r", encoding="utf-8-sig") as f:
+                return [event.text for event in ass.parse(f).events]
+        return []
+    
+    def prepare_series(self, files, translators, max_workers=1):
+        """Translate the distinct lines of all files once per language before any file is processed.
+        
+        Recaps, openings and catchphrases that recur across episodes are sent
+        once, in full batches, instead of again with every file; process_file
+        then assembles each episode from the cache and translation memory.
+        Lines only count for languages whose output the file still needs.
+        With max_workers > 1 languages are pre-translated in parallel.
+        """
+        overwrite = self.settings.get('overwrite_existing', False)
+        lines = {lang_code: {} for lang_code in self.languages.values()}
+        for file_path in files:
+            if self.is_stopped:
+                return
+            try:
+                with PROFILER.stage('parse'):
+                    texts = self.read_texts(file_path)
+            except Exception as e:
+                EVENTS.warning('series', "Skipping %s in the series pre-pass: %s", file_path, e)
+                continue
+            for language, lang_code in self.languages.items():
+                if not overwrite and self.output_file(file_path, language).exists():
+                    continue
+                unique = lines[lang_code]
+                for text in texts:
+                    clean_text = strip_speaker(text)
+                    # Variants that only differ in case or punctuation are served by the translation memory
+                    key = normalize(clean_text) if self.memory is not None else clean_text
+                    if key and key not in unique:
+                        unique[key] = text
+        
+        def translate_language(i, language, lang_code):
+            texts = list(lines[lang_code].values())
+            if not texts:
+                return
+            translator = translators[lang_code]
+            self.on_language_progress(i + 1, len(self.languages))
+            self.on_progress(f"📚 Pre-translating {len(texts)} distinct lines from {len(files)} files into {language}")
+            # Lines from all files share requests filled up to the service's size limit,
+            # so small files no longer cost a mostly empty request each
+            if translator.max_chars:
+                bounds = pack_bounds(texts, translator.max_chars)
+            else:
+                bounds = list(range(translator.batch_size, len(texts), translator.batch_size)) + [len(texts)]
+            start = 0
+            for end in bounds:
+                if self.is_stopped:
+                    return
+                translator.translate_batch(texts[start:end])
+                self.on_subtitle_progress(end, len(texts))
+                start = end
+            translator._save_cache()
+        
+        languages = [(i, language, lang_code) for i, (language, lang_code) in enumerate(self.languages.items())]
+        if max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                for future in [pool.submit(translate_language, *item) for item in languages]:
+                    future.result()
+        else:
+            for item in languages:
+                translate_language(*item)
+    
+    def process_file(self, file_path, total_files, current_index, translators=None):
+        path = Path(file_path)
+        
+        # Create output folder based on settings
+        if self.settings.get('organize_by_file', True):
+            output_folder = path.parent / path.stem
+        else:
+            output_folder = path.parent / "translated_subtitles"
+        
+        output_folder.mkdir(exist_ok=True)
+        
+        self.on_progress(f"📁 Processing: {path.name} ({current_index + 1}/{total_files})")
+        
+        # Callers translating many files pass shared translators to keep each cache loaded once
+        translators = translators or self.create_translators()
+        
+        metrics.FILES_PROCESSED.labels(path.suffix.lower().lstrip('.') or 'other').inc()
+        
+        for i, (language, lang_code) in enumerate(self.languages.items()):
+            if self.is_stopped:
+                return
+            
+            self.on_language_progress(i + 1, len(self.languages))
+            output_file = self.output_file(file_path, language)
+            
+            job_id = self.jobs.get(lang_code)
+            
+            if output_file.exists() and not self.settings.get('overwrite_existing', False):
+                self.on_progress(f"⏭️ {language} already exists, skipping...")
+                if job_id and self.job_queue:
+                    self.job_queue.mark_done(job_id)
+                self.on_language_done(file_path, language, 'skipped', None)
+                continue
+            
+            try:
+                self.translate_file(file_path, output_file, translators[lang_code])
+                
+                if not self.is_stopped:
+                    metrics.LANGUAGES_PROCESSED.inc()
+                    if job_id and self.job_queue:
+                        self.job_queue.mark_done(job_id)
+                    self.on_progress(f"✅ {language} completed!")
+                    self.on_language_done(file_path, language, 'done', None)
+                
+            except Exception as e:
+                if not self.is_stopped:
+                    metrics.TRANSLATION_ERRORS.inc()
+                    if job_id and self.job_queue:
+                        self.job_queue.mark_failed(job_id, e)
+                    EVENTS.error('file', "Error processing %s: %s", language, e)
+                    self.on_progress(f"❌ {language} failed: {str(e)}")
+                    self.on_language_done(file_path, language, 'failed', str(e))
+        
+        if not self.is_stopped:
+            # Create copy with colons removed and move copy instead of original
+            try:
+                if self.settings.get('organize_by_file', True):
+                    # Read original file
+                    with open(path, 'r', encoding='utf-8') as f:
+                        content = f.read()
+                    
+                    # Remove colons from content
+                    modified_content = '\n'.join(
+                        line.split(':', 1)[1].strip() if ':' in line else line 
+                        for line in content.split('\n')
+                    )
+                    
+                    # Create modified copy
+                    modified_file = output_folder / path.name
+                    with PROFILER.stage('write'), open(modified_file, 'w', encoding='utf-8') as f:
+                        f.write(modified_content)
+                    
+                    EVENTS.debug('file', "Created modified copy (no colons) at: %s", modified_file)
+            except Exception as e:
+                EVENTS.warning('file', "Could not create modified copy: %s", e)
+            
+            self.on_progress(f"🎉 Completed: {path.name} (original preserved)")
+    
+    def record_throughput(self, lang_code, cues, start_time):
+        elapsed = time.perf_counter() - start_time
+        metrics.TRANSLATE_SECONDS.labels(lang_code).inc(elapsed)
+        if elapsed > 0:
+            metrics.CUES_PER_SECOND.labels(lang_code).set(cues / elapsed)
+    
+    def translate_file(self, input_file, output_file, translator):
+        ext = Path(input_file).suffix.lower()
+        if ext == '.srt' or (ext == '.txt' and self.is_srt_format(input_file)):
+            self.translate_srt(input_file, output_file, translator)
+        elif ext == '.ass':
+            self.translate_ass_to_srt(input_file, output_file, translator)
+        elif ext == '.txt':
+            self.translate_plain_txt(input_file, output_file, translator)
+    
+    def translate_srt(self, input_file, output_file, translator):
+        start_time = time.perf_counter()
+        cues_metric = metrics.CUES_TRANSLATED.labels(translator.dest_lang)
+        with PROFILER.stage('parse'):
+            subs = pysrt.open(input_file)
+        texts = [sub.text for sub in subs]
+        
+        for i in range(0, len(texts), translator.batch_size):
+            if self.is_stopped:
+                return
+                
+            batch = texts[i:i+translator.batch_size]
+            translations = translator.translate_batch(batch)
+            
+            for j, translation in enumerate(translations):
+                subs[i+j].text = translation
+            cues_metric.inc(len(translations))
+            
+            progress = min(i+translator.batch_size, len(subs))
+            self.on_subtitle_progress(progress, len(subs))
+            EVENTS.debug('progress', "Processed %d/%d subtitles", progress, len(subs))
+        
+        if not self.is_stopped:
+            translator._save_cache()
+            encoding = self.settings.get('output_encoding', 'utf-8')
+            with PROFILER.stage('write'):
+                subs.save(output_file, encoding=encoding)
+            self.record_throughput(translator.dest_lang, len(subs), start_time)
+    
+    def translate_ass_to_srt(self, input_file, output_file, translator):
+        start_time = time.perf_counter()
+        cues_metric = metrics.CUES_TRANSLATED.labels(translator.dest_lang)
+        with PROFILER.stage('parse'), open(input_file, "r", encoding="utf-8-sig") as f:
+            doc = ass.parse(f)
+        
+        texts = [event.text for event in doc.events]
+        subs = pysrt.SubRipFile()
+        
+        for i in range(0, len(texts), translator.batch_size):
+            if self.is_stopped:
+                return
+                
+            batch = texts[i:i+translator.batch_size]
+            translations = translator.translate_batch(batch)
+            
+            for j, translation in enumerate(translations):
+                event = doc.events[i+j]
+                start = pysrt.SubRipTime.from_ordinal(event.start.total_seconds() * 1000)
+                end = pysrt.SubRipTime.from_ordinal(event.end.total_seconds() * 1000)
+                subs.append(pysrt.SubRipItem(i+j+1, start, end, translation))
+            cues_metric.inc(len(translations))
+            
+            progress = min(i+translator.batch_size, len(doc.events))
+            self.on_subtitle_progress(progress, len(doc.events))
+            EVENTS.debug('progress', "Processed %d/%d events", progress, len(doc.events))
+        
+        if not self.is_stopped:
+            translator._save_cache()
+            encoding = self.settings.get('output_encoding', 'utf-8')
+            with PROFILER.stage('write'):
+                subs.save(output_file, encoding=encoding)
+            self.record_throughput(translator.dest_lang, len(subs), start_time)
+    
+    def translate_plain_txt(self, input_file, output_file, translator):
+        with PROFILER.stage('parse'), open(input_file, "r", encoding="utf-8") as f:
+            text = f.read()
+        
+        translated = translator.translate(text)
+        metrics.CUES_TRANSLATED.labels(translator.dest_lang).inc()
+        translator._save_cache()
+        subs = pysrt.SubRipFile([pysrt.SubRipItem(1, 
+            pysrt.SubRipTime(0,0,0,0), pysrt.SubRipTime(0,0,10,0), translated)])
+        encoding = self.settings.get('output_encoding', 'utf-8')
+        with PROFILER.stage('write'):
+            subs.save(output_file, encoding=encoding)
+    
+    def is_srt_format(self, file_path):
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                lines = [f.readline().strip() for _ in range(3)]
+            return lines[0].isdigit() and '-->' in lines[1]
+        except:
+            return False
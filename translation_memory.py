@@ -0,0 +1,244 @@
+"""Translation memory: reuse translations of lines that are nearly identical.
+
+Lines are normalized (case, punctuation and spacing dropped) and matched
+exactly on that form first. Otherwise candidates come from MinHash LSH
+buckets over character trigrams, and the best one is returned if its
+trigram Jaccard similarity reaches the threshold. Each lookup is a couple of
+indexed SQLite queries plus a few dozen set comparisons, so the cost does
+not grow with the number of stored lines.
+"""
+import hashlib
+import re
+import sqlite3
+import threading
+import zlib
+
+from app_paths import get_app_dir
+
+DEFAULT_THRESHOLD = 0.9
+
+# 4 bands of 4 rows: lines at 0.9 similarity share a bucket ~99% of the time, at 0.5 ~23%
+BANDS = 4
+ROWS = 4
+MAX_CANDIDATES = 64
+# Names the hashing scheme; stored buckets are only reusable by a build with the same value
+INDEX_VERSION = f"minhash2-{BANDS}x{ROWS}"
+_EMPTY = 1 << 28
+_EMPTY_BAND = [_EMPTY] * ROWS
+
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+_TAIL = re.compile(r"[^\w\s]*\s*$")
+_NUMBERS = re.compile(r"\d+")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    lang TEXT NOT NULL,
+    norm TEXT NOT NULL,
+    source TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    shingles INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_entries_norm ON entries (lang, norm);
+CREATE TABLE IF NOT EXISTS buckets (
+    bucket INTEGER NOT NULL,
+    entry_id INTEGER NOT NULL,
+    PRIMARY KEY (bucket, entry_id)
+) WITHOUT ROWID;
+"""
+
+
+def normalize(text):
+    return ' '.join(_PUNCTUATION.sub(' ', text.lower()).split())
+
+
+def shingles(norm):
+    padded = f" {norm} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(a, b):
+    # Jaccard similarity of two shingle sets
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def minhash(grams):
+    # One-permutation MinHash: a single hash per trigram, its top 4 bits pick one of 16 slots
+    slots = [_EMPTY] * (BANDS * ROWS)
+    for gram in grams:
+        h = (zlib.crc32(gram.encode()) * 0x9E3779B1) & 0xFFFFFFFF
+        slot, value = h >> 28, h & 0xFFFFFFF
+        if value < slots[slot]:
+            slots[slot] = value
+    return slots
+
+
+def buckets(lang, grams):
+    signature = minhash(grams)
+    keys = []
+    for band in range(BANDS):
+        values = signature[band * ROWS:(band + 1) * ROWS]
+        if values == _EMPTY_BAND:
+            # Short lines leave whole bands empty; that bucket would hold every short line
+            continue
+        digest = hashlib.blake2b(f"{lang}:{band}:{values}".encode(), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, 'big') >> 1)  # fits a signed SQLite integer
+    return keys
+
+
+def adapt(translation, matched_source, text):
+    """Carry over what normalization ignored: the closing punctuation and all-caps lines."""
+    old_tail = _TAIL.search(matched_source).group().strip()
+    new_tail = _TAIL.search(text).group().strip()
+    if old_tail != new_tail:
+        body = translation.rstrip()
+        if old_tail and body.endswith(old_tail):
+            body = body[:-len(old_tail)]
+        translation = body + new_tail
+    if text.isupper() and not matched_source.isupper():
+        translation = translation.upper()
+    return translation
+
+
+class Match:
+    __slots__ = ('translation', 'source', 'score')
+
+    def __init__(self, translation, source, score):
+        self.translation = translation
+        self.source = source
+        self.score = score
+
+
+class TranslationMemory:
+    def __init__(self, db_path=None, threshold=DEFAULT_THRESHOLD):
+        self.db_path = str(db_path or get_app_dir() / 'translation_memory.db')
+        self.threshold = threshold
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def add_many(self, lang, pairs, replace=True):
+        """Store (source, translation) pairs; a line already stored gets the newer translation."""
+        rows = []
+        for source, translation in pairs:
+            norm = normalize(source)
+            if norm and translation:
+                grams = shingles(norm)
+                rows.append((source, translation, len(grams), buckets(lang, grams)))
+        return self.add_indexed(lang, rows, replace)
+
+    def add_indexed(self, lang, rows, replace=True):
+        """Store (source, translation, shingle count, bucket keys) rows hashed elsewhere.
+
+        Used by bulk imports, which carry the index with each line instead of
+        hashing millions of lines again. Returns (added, replaced).
+        """
+        by_norm = {}
+        for source, translation, count, keys in rows:
+            norm = normalize(source)
+            if norm and translation:
+                by_norm[norm] = (source, translation, count, keys)
+        if not by_norm:
+            return 0, 0
+        with self.lock, self.conn:
+            # The GUI, cli.py and local workers can write to the same file; holding the write lock from
+            # the start keeps another process from adding these lines between the check and the inserts
+            self.conn.execute("BEGIN IMMEDIATE")
+            existing = set()
+            norms = list(by_norm)
+            for start in range(0, len(norms), 500):
+                chunk = norms[start:start + 500]
+                existing.update(norm for norm, in self.conn.execute(
+                    f"SELECT norm FROM entries WHERE lang = ? AND norm IN ({','.join('?' * len(chunk))})",
+                    (lang, *chunk)))
+            new = [norm for norm in norms if norm not in existing]
+            self.conn.executemany(
+                "INSERT INTO entries (lang, norm, source, translation, shingles) VALUES (?, ?, ?, ?, ?)",
+                [(lang, norm, *by_norm[norm][:3]) for norm in new])
+            # SQLite picks the ids; read them back so the bucket rows can be written in one pass as well
+            bucket_rows = []
+            for start in range(0, len(new), 500):
+                chunk = new[start:start + 500]
+                for entry_id, norm in self.conn.execute(
+                        f"SELECT id, norm FROM entries WHERE lang = ? AND norm IN ({','.join('?' * len(chunk))})",
+                        (lang, *chunk)):
+                    bucket_rows.extend((key, entry_id) for key in by_norm[norm][3])
+            self.conn.executemany("INSERT OR IGNORE INTO buckets (bucket, entry_id) VALUES (?, ?)",
+                                  sorted(bucket_rows))
+            if replace and existing:
+                self.conn.executemany(
+                    "UPDATE entries SET source = ?, translation = ? WHERE lang = ? AND norm = ?",
+                    [(by_norm[norm][0], by_norm[norm][1], lang, norm) for norm in existing])
+        return len(new), len(existing) if replace else 0
+
+    def export(self, languages=None):
+        """Yield (lang, source, translation, shingle count, bucket keys) for every stored line.
+
+        Reads through its own connection, so translations can go on meanwhile.
+        """
+        conn = sqlite3.connect(self.db_path)
+        try:
+            entries = conn.execute("SELECT id, lang, source, translation, shingles FROM entries ORDER BY id")
+            # Both cursors walk in entry order; merging them avoids holding the bucket table in memory
+            bucket_rows = conn.execute("SELECT entry_id, bucket FROM buckets ORDER BY entry_id")
+            pending = next(bucket_rows, None)
+            for entry_id, lang, source, translation, count in entries:
+                keys = []
+                while pending is not None and pending[0] <= entry_id:
+                    if pending[0] == entry_id:
+                        keys.append(pending[1])
+                    pending = next(bucket_rows, None)
+                if languages is None or lang in languages:
+                    yield lang, source, translation, count, keys
+        finally:
+            conn.close()
+
+    def lookup(self, text, lang):
+        """Best stored translation for text at or above the threshold, adapted to text, or None."""
+        norm = normalize(text)
+        if not norm:
+            return None
+        with self.lock:
+            row = self.conn.execute("SELECT source, translation FROM entries WHERE lang = ? AND norm = ?",
+                                    (lang, norm)).fetchone()
+        if row:
+            # At 100% the punctuation has to agree too: "Yes?" is not "Yes." in every language
+            if self.threshold < 1 or _PUNCTUATION.findall(row[0]) == _PUNCTUATION.findall(text):
+                return Match(adapt(row[1], row[0], text), row[0], 1.0)
+        if self.threshold >= 1:
+            return None
+
+        grams = shingles(norm)
+        keys = buckets(lang, grams)
+        # Jaccard >= t needs the smaller set to be at least t times the larger one
+        low, high = int(len(grams) * self.threshold), int(len(grams) / self.threshold) + 1
+        with self.lock:
+            # Lines sharing more bands are likelier matches, so they come first when the limit cuts in
+            candidates = self.conn.execute(
+                f"SELECT e.norm, e.source, e.translation FROM buckets b JOIN entries e ON e.id = b.entry_id "
+                f"WHERE b.bucket IN ({','.join('?' * len(keys))}) AND e.shingles BETWEEN ? AND ? "
+                f"GROUP BY e.id ORDER BY COUNT(*) DESC, ABS(e.shingles - ?) LIMIT ?",
+                (*keys, low, high, len(grams), MAX_CANDIDATES)).fetchall()
+        # Numbers carry over verbatim into the translation, so a line with other numbers never matches
+        numbers = _NUMBERS.findall(norm)
+        best = None
+        for candidate_norm, source, translation in candidates:
+            if _NUMBERS.findall(candidate_norm) != numbers:
+                continue
+            score = similarity(grams, shingles(candidate_norm))
+            if score >= self.threshold and (best is None or score > best.score):
+                best = Match(translation, source, score)
+        if best:
+            best.translation = adapt(best.translation, best.source, text)
+        return best